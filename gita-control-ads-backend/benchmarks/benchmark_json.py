@@ -0,0 +1,101 @@
+"""Compara a serialização de uma listagem de 10 mil conteúdos com o provedor JSON padrão do Flask e com o ProvedorJSON
+
+Uso: python benchmarks/benchmark_json.py [quantidade] [repeticoes]
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_KEY', 'benchmark')
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from src.models.conteudo import Conteudo
+from src.provedor_json import ProvedorJSON
+
+
+def linhas_conteudo(quantidade: int):
+    """Linhas no formato devolvido pelo PostgREST"""
+    inicio = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(quantidade):
+        criacao = inicio + timedelta(minutes=i)
+        yield {
+            'id': str(uuid.uuid4()),
+            'projeto_id': '6f1c2a4e-8a53-4f1e-9d0b-3c2f5e7a9b10',
+            'identificador': f'Criativo {i:05d} - Reels São Paulo',
+            'tipo_conteudo': ('C1', 'C2', 'C3', 'C4')[i % 4],
+            'alcance': 10000 + i,
+            'engajamento': 500 + i % 300,
+            'valor_gasto': round(150.75 + i * 0.37, 2),
+            'cpm': 12.34,
+            'seguidores_antes': 1000,
+            'seguidores_depois': 1000 + i % 50,
+            'custo_por_seguidor': 3.21,
+            'custo_por_engajamento': 0.29,
+            'thruplay': 2000 + i,
+            'frequencia': 1.37,
+            'reproducao_25_pct': 8000,
+            'reproducao_50_pct': 6000,
+            'reproducao_75_pct': 4000,
+            'reproducao_95_pct': 2500,
+            'reproducao_100_pct': 2000,
+            'data_inicio_impulsionamento': (date(2025, 1, 1) + timedelta(days=i % 90)).isoformat(),
+            'data_fim_impulsionamento': (date(2025, 1, 8) + timedelta(days=i % 90)).isoformat(),
+            'data_criacao': criacao.isoformat(),
+            'data_atualizacao': criacao.isoformat(),
+            'ativo': True
+        }
+
+
+def medir(descricao: str, funcao, repeticoes: int) -> float:
+    funcao()  # aquecimento
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    melhor = min(tempos)
+    print(f'{descricao:<55} {melhor * 1000:9.1f} ms')
+    return melhor
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    linhas = list(linhas_conteudo(quantidade))
+    conteudos = [Conteudo._from_dict(linha) for linha in linhas]
+
+    app_padrao = Flask('padrao')
+    app_rapido = Flask('rapido')
+    app_rapido.json = ProvedorJSON(app_rapido)
+
+    def serializar_padrao():
+        # Provedor padrão do Flask: datas pré-convertidas em texto, como os modelos faziam
+        with app_padrao.app_context():
+            dados = [{**c.to_dict(), 'data_criacao': c.data_criacao.isoformat(),
+                      'data_atualizacao': c.data_atualizacao.isoformat(),
+                      'data_inicio_impulsionamento': c.data_inicio_impulsionamento.isoformat(),
+                      'data_fim_impulsionamento': c.data_fim_impulsionamento.isoformat()} for c in conteudos]
+            return app_padrao.json.response({'success': True, 'data': dados}).get_data()
+
+    def serializar_rapido():
+        with app_rapido.app_context():
+            return app_rapido.json.response({'success': True, 'data': [c.to_dict() for c in conteudos]}).get_data()
+
+    print(f'{quantidade} conteúdos, melhor de {repeticoes} execuções '
+          f'(orjson {"disponível" if app_rapido.json.rapido else "ausente: usando a biblioteca padrão"})')
+    medir('Hidratação (_from_dict)', lambda: [Conteudo._from_dict(linha) for linha in linhas], repeticoes)
+    padrao = medir('DefaultJSONProvider (json da biblioteca padrão)', serializar_padrao, repeticoes)
+    rapido = medir('ProvedorJSON', serializar_rapido, repeticoes)
+    print(f'{"Ganho":<55} {padrao / rapido:9.1f} x')
+    print(f'{"Tamanho da resposta":<55} {len(serializar_rapido()) / 1024:9.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Mede o tempo de importação de src.main (boot de um worker) e verifica um orçamento
+
+Roda "python -X importtime -c 'import src.main'" num processo novo, agrupa o tempo
+acumulado por pacote de primeiro nível e por módulo do projeto, e sai com código 1
+se o total passar do orçamento.
+
+Uso: python benchmarks/tempo_importacao.py [--orcamento-ms 600] [--top 15]
+(o orçamento também pode vir de ORCAMENTO_IMPORTACAO_MS)
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINHA = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$')
+
+
+def medir_importacao(modulo: str = 'src.main'):
+    """Retorna [(módulo, próprio_us, acumulado_us, profundidade)] na ordem do -X importtime"""
+    ambiente = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    ambiente.setdefault('SUPABASE_URL', 'http://localhost')
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True
+    )
+    if processo.returncode != 0:
+        sys.stderr.write(processo.stderr)
+        raise SystemExit(f'Falha ao importar {modulo}')
+
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        encontrado = LINHA.match(linha)
+        if encontrado:
+            proprio, acumulado, recuo, nome = encontrado.groups()
+            modulos.append((nome, int(proprio), int(acumulado), (len(recuo) - 1) // 2))
+    return modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orcamento-ms', type=float, default=float(os.getenv('ORCAMENTO_IMPORTACAO_MS', '600')))
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--modulo', default='src.main')
+    argumentos = parser.parse_args()
+
+    modulos = medir_importacao(argumentos.modulo)
+    principal = next((m for m in modulos if m[0] == argumentos.modulo), None)
+    total_ms = principal[2] / 1000 if principal else sum(m[1] for m in modulos) / 1000
+
+    # Tempo próprio somado por pacote de primeiro nível (src.* separado por módulo)
+    por_pacote = defaultdict(int)
+    for nome, proprio, _, _ in modulos:
+        chave = nome if nome.startswith('src.') else nome.split('.')[0]
+        por_pacote[chave] += proprio
+
+    print(f'Importação de {argumentos.modulo}: {total_ms:.0f} ms (orçamento {argumentos.orcamento_ms:.0f} ms)\n')
+    print(f'{"Pacote / módulo":<45} {"próprio (ms)":>12}')
+    for nome, proprio in sorted(por_pacote.items(), key=lambda item: item[1], reverse=True)[:argumentos.top]:
+        print(f'{nome:<45} {proprio / 1000:>12.1f}')
+
+    print(f'\n{"Módulos do projeto":<45} {"acumulado (ms)":>14}')
+    for nome, _, acumulado, _ in sorted((m for m in modulos if m[0].startswith('src.')), key=lambda m: m[2], reverse=True)[:argumentos.top]:
+        print(f'{nome:<45} {acumulado / 1000:>14.1f}')
+
+    if total_ms > argumentos.orcamento_ms:
+        print(f'\nOrçamento excedido em {total_ms - argumentos.orcamento_ms:.0f} ms')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -96,6 +96,17 @@ CREATE INDEX IF NOT EXISTS idx_campanhas_projeto_id ON campanhas(projeto_id);
 CREATE INDEX IF NOT EXISTS idx_campanhas_tipo ON campanhas(tipo_campanha);
 CREATE INDEX IF NOT EXISTS idx_campanhas_data_inicio ON campanhas(data_inicio);
 
+-- Chave natural dos conteúdos usada na importação de relatórios, única só entre os registros ativos
+-- (um conteúdo excluído não impede criar outro com o mesmo identificador). Se o índice não puder ser
+-- criado por haver identificadores repetidos entre conteúdos ativos, liste-os com a consulta abaixo,
+-- renomeie ou exclua as duplicatas manualmente e execute o comando de novo:
+--   SELECT projeto_id, identificador, COUNT(*) FROM conteudos WHERE ativo
+--   GROUP BY projeto_id, identificador HAVING COUNT(*) > 1;
+DROP INDEX IF EXISTS idx_campanhas_projeto_nome;
+DROP INDEX IF EXISTS idx_conteudos_projeto_identificador;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_conteudos_projeto_identificador_ativo
+    ON conteudos(projeto_id, identificador) WHERE ativo;
+
 -- Triggers para atualizar data_atualizacao automaticamente
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -148,3 +159,434 @@ $$ language 'plpgsql';
 CREATE TRIGGER calculate_custo_por_engajamento_trigger BEFORE INSERT OR UPDATE ON conteudos
     FOR EACH ROW EXECUTE FUNCTION calculate_custo_por_engajamento();
 
+
+-- Totais das campanhas derivados dos conteúdos associados
+-- Recalculados na escrita (associações e alterações de conteúdos), só para as campanhas afetadas
+CREATE INDEX IF NOT EXISTS idx_campanha_conteudos_conteudo_id ON campanha_conteudos(conteudo_id);
+
+CREATE OR REPLACE FUNCTION recalcular_totais_campanhas(p_campanha_ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    UPDATE campanhas c SET
+        engajamento_total = t.engajamento_total,
+        alcance_total = t.alcance_total,
+        thruplay_total = t.thruplay_total,
+        valor_gasto_total = t.valor_gasto_total,
+        reproducao_25_pct_total = t.reproducao_25_pct_total,
+        reproducao_50_pct_total = t.reproducao_50_pct_total,
+        reproducao_75_pct_total = t.reproducao_75_pct_total,
+        reproducao_95_pct_total = t.reproducao_95_pct_total,
+        reproducao_100_pct_total = t.reproducao_100_pct_total,
+        custo_por_engajamento = t.custo_por_engajamento,
+        frequencia_media = t.frequencia_media
+    FROM (
+        SELECT
+            ids.campanha_id,
+            SUM(ct.engajamento) AS engajamento_total,
+            SUM(ct.alcance) AS alcance_total,
+            SUM(ct.thruplay) AS thruplay_total,
+            SUM(ct.valor_gasto) AS valor_gasto_total,
+            SUM(ct.reproducao_25_pct) AS reproducao_25_pct_total,
+            SUM(ct.reproducao_50_pct) AS reproducao_50_pct_total,
+            SUM(ct.reproducao_75_pct) AS reproducao_75_pct_total,
+            SUM(ct.reproducao_95_pct) AS reproducao_95_pct_total,
+            SUM(ct.reproducao_100_pct) AS reproducao_100_pct_total,
+            -- Custo por engajamento ponderado pelo engajamento (gasto total / engajamento total)
+            SUM(ct.valor_gasto) FILTER (WHERE ct.engajamento > 0)
+                / NULLIF(SUM(ct.engajamento) FILTER (WHERE ct.engajamento > 0 AND ct.valor_gasto IS NOT NULL), 0)
+                AS custo_por_engajamento,
+            -- Frequência média ponderada pelo alcance
+            SUM(ct.frequencia * ct.alcance) / NULLIF(SUM(ct.alcance) FILTER (WHERE ct.frequencia IS NOT NULL), 0)
+                AS frequencia_media
+        FROM unnest(p_campanha_ids) AS ids(campanha_id)
+        LEFT JOIN campanha_conteudos cc ON cc.campanha_id = ids.campanha_id
+        LEFT JOIN conteudos ct ON ct.id = cc.conteudo_id AND ct.ativo
+        GROUP BY ids.campanha_id
+    ) t
+    WHERE c.id = t.campanha_id;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION atualizar_totais_por_associacao_inserida()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM recalcular_totais_campanhas(ARRAY(SELECT DISTINCT campanha_id FROM novas));
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION atualizar_totais_por_associacao_removida()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM recalcular_totais_campanhas(ARRAY(SELECT DISTINCT campanha_id FROM antigas));
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION atualizar_totais_por_conteudo()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM recalcular_totais_campanhas(ARRAY(
+        SELECT DISTINCT cc.campanha_id
+        FROM novas n
+        JOIN antigas a ON a.id = n.id
+        JOIN campanha_conteudos cc ON cc.conteudo_id = n.id
+        WHERE (n.engajamento, n.alcance, n.thruplay, n.valor_gasto, n.frequencia,
+               n.reproducao_25_pct, n.reproducao_50_pct, n.reproducao_75_pct,
+               n.reproducao_95_pct, n.reproducao_100_pct, n.ativo)
+          IS DISTINCT FROM
+              (a.engajamento, a.alcance, a.thruplay, a.valor_gasto, a.frequencia,
+               a.reproducao_25_pct, a.reproducao_50_pct, a.reproducao_75_pct,
+               a.reproducao_95_pct, a.reproducao_100_pct, a.ativo)
+    ));
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Triggers por comando: um lote de associações recalcula cada campanha uma única vez
+CREATE TRIGGER totais_campanha_associacao_insert_trigger AFTER INSERT ON campanha_conteudos
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_totais_por_associacao_inserida();
+
+CREATE TRIGGER totais_campanha_associacao_delete_trigger AFTER DELETE ON campanha_conteudos
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_totais_por_associacao_removida();
+
+CREATE TRIGGER totais_campanha_conteudo_update_trigger AFTER UPDATE ON conteudos
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_totais_por_conteudo();
+
+-- Preenche os totais das campanhas que já têm conteúdos associados
+SELECT recalcular_totais_campanhas(ARRAY(SELECT DISTINCT campanha_id FROM campanha_conteudos));
+
+-- Histórico diário das métricas dos conteúdos
+-- Só recebe inserções: cada (conteudo_id, dia) é gravado uma vez, com os valores acumulados até o dia.
+-- Sem id próprio e com as colunas de tamanho fixo antes das DECIMAL, para manter as linhas compactas
+CREATE TABLE IF NOT EXISTS conteudo_metricas_diarias (
+    conteudo_id UUID NOT NULL REFERENCES conteudos(id) ON DELETE CASCADE,
+    dia DATE NOT NULL,
+    alcance INTEGER,
+    engajamento INTEGER,
+    seguidores_depois INTEGER,
+    thruplay INTEGER,
+    reproducao_25_pct INTEGER,
+    reproducao_50_pct INTEGER,
+    reproducao_75_pct INTEGER,
+    reproducao_95_pct INTEGER,
+    reproducao_100_pct INTEGER,
+    frequencia DECIMAL(5,2),
+    valor_gasto DECIMAL(10,2),
+    PRIMARY KEY (conteudo_id, dia)
+);
+
+CREATE OR REPLACE FUNCTION impedir_alteracao_metricas_diarias()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'conteudo_metricas_diarias só aceita inserções';
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER metricas_diarias_somente_insercao_trigger BEFORE UPDATE ON conteudo_metricas_diarias
+    FOR EACH STATEMENT EXECUTE FUNCTION impedir_alteracao_metricas_diarias();
+
+-- Mantém as métricas de conteudos iguais ao ponto mais recente do histórico
+-- (pontos de dias anteriores ao último já gravado não alteram o conteúdo)
+CREATE OR REPLACE FUNCTION atualizar_conteudos_pelo_ultimo_ponto()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE conteudos c SET
+        alcance = COALESCE(p.alcance, c.alcance),
+        engajamento = COALESCE(p.engajamento, c.engajamento),
+        seguidores_depois = COALESCE(p.seguidores_depois, c.seguidores_depois),
+        thruplay = COALESCE(p.thruplay, c.thruplay),
+        reproducao_25_pct = COALESCE(p.reproducao_25_pct, c.reproducao_25_pct),
+        reproducao_50_pct = COALESCE(p.reproducao_50_pct, c.reproducao_50_pct),
+        reproducao_75_pct = COALESCE(p.reproducao_75_pct, c.reproducao_75_pct),
+        reproducao_95_pct = COALESCE(p.reproducao_95_pct, c.reproducao_95_pct),
+        reproducao_100_pct = COALESCE(p.reproducao_100_pct, c.reproducao_100_pct),
+        frequencia = COALESCE(p.frequencia, c.frequencia),
+        valor_gasto = COALESCE(p.valor_gasto, c.valor_gasto)
+    FROM (
+        SELECT DISTINCT ON (conteudo_id) * FROM novas ORDER BY conteudo_id, dia DESC
+    ) p
+    WHERE c.id = p.conteudo_id
+      AND NOT EXISTS (
+          SELECT 1 FROM conteudo_metricas_diarias h
+          WHERE h.conteudo_id = p.conteudo_id AND h.dia > p.dia
+      );
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER metricas_diarias_ultimo_ponto_trigger AFTER INSERT ON conteudo_metricas_diarias
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_conteudos_pelo_ultimo_ponto();
+
+-- Série das métricas de um conteúdo ou de todos os conteúdos ativos de um projeto, por dia, semana ou mês.
+-- Em cada período vale o último ponto de cada conteúdo até o fim do período (buscado pela chave primária),
+-- somado entre os conteúdos; a agregação roda no banco e só os períodos voltam para a API
+CREATE OR REPLACE FUNCTION serie_metricas_diarias(
+    p_inicio DATE,
+    p_fim DATE,
+    p_granularidade TEXT DEFAULT 'day',
+    p_conteudo_id UUID DEFAULT NULL,
+    p_projeto_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    periodo DATE,
+    fim DATE,
+    conteudos_com_dados INTEGER,
+    alcance BIGINT,
+    engajamento BIGINT,
+    seguidores_depois BIGINT,
+    thruplay BIGINT,
+    reproducao_25_pct BIGINT,
+    reproducao_50_pct BIGINT,
+    reproducao_75_pct BIGINT,
+    reproducao_95_pct BIGINT,
+    reproducao_100_pct BIGINT,
+    frequencia NUMERIC,
+    valor_gasto NUMERIC
+) AS $$
+    WITH periodos AS (
+        SELECT p::DATE AS periodo,
+               LEAST((p + ('1 ' || p_granularidade)::INTERVAL)::DATE - 1, p_fim) AS fim
+        FROM generate_series(date_trunc(p_granularidade, p_inicio::TIMESTAMP), p_fim::TIMESTAMP,
+                             ('1 ' || p_granularidade)::INTERVAL) AS p
+    ),
+    alvo AS (
+        SELECT id FROM conteudos
+        WHERE ativo AND (id = p_conteudo_id OR (p_conteudo_id IS NULL AND projeto_id = p_projeto_id))
+    )
+    SELECT
+        pr.periodo,
+        pr.fim,
+        COUNT(u.dia)::INTEGER,
+        SUM(u.alcance),
+        SUM(u.engajamento),
+        SUM(u.seguidores_depois),
+        SUM(u.thruplay),
+        SUM(u.reproducao_25_pct),
+        SUM(u.reproducao_50_pct),
+        SUM(u.reproducao_75_pct),
+        SUM(u.reproducao_95_pct),
+        SUM(u.reproducao_100_pct),
+        -- Frequência média ponderada pelo alcance
+        SUM(u.frequencia * u.alcance) / NULLIF(SUM(u.alcance) FILTER (WHERE u.frequencia IS NOT NULL), 0),
+        SUM(u.valor_gasto)
+    FROM periodos pr
+    CROSS JOIN alvo a
+    LEFT JOIN LATERAL (
+        SELECT * FROM conteudo_metricas_diarias h
+        WHERE h.conteudo_id = a.id AND h.dia <= pr.fim
+        ORDER BY h.dia DESC
+        LIMIT 1
+    ) u ON TRUE
+    GROUP BY pr.periodo, pr.fim
+    ORDER BY pr.periodo;
+$$ LANGUAGE sql STABLE;
+
+-- Agregados diários por projeto e tipo de conteúdo, para as métricas por janela de datas
+-- Cada conteúdo ativo conta no dia de data_inicio_impulsionamento (ou da criação, se não houver);
+-- um trigger aplica a diferença a cada escrita em conteudos, sem reprocessar o projeto
+CREATE TABLE IF NOT EXISTS metricas_projeto_diarias (
+    projeto_id UUID NOT NULL REFERENCES projetos(id) ON DELETE CASCADE,
+    dia DATE NOT NULL,
+    tipo_conteudo VARCHAR(2) NOT NULL,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    engajamento BIGINT NOT NULL DEFAULT 0,
+    alcance BIGINT NOT NULL DEFAULT 0,
+    seguidores_ganhos BIGINT NOT NULL DEFAULT 0,
+    -- Soma e quantidade dos custos informados (diferentes de zero), para as médias
+    custo_por_seguidor_qtd INTEGER NOT NULL DEFAULT 0,
+    custo_por_engajamento_qtd INTEGER NOT NULL DEFAULT 0,
+    valor_gasto DECIMAL(14,2) NOT NULL DEFAULT 0,
+    custo_por_seguidor_soma DECIMAL(14,2) NOT NULL DEFAULT 0,
+    custo_por_engajamento_soma DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (projeto_id, dia, tipo_conteudo)
+);
+
+-- Soma (p_sinal = 1) ou subtrai (p_sinal = -1) as linhas de conteúdos ativos dos agregados diários
+CREATE OR REPLACE FUNCTION aplicar_delta_metricas_projeto(p_linhas conteudos[], p_sinal INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO metricas_projeto_diarias AS m (
+        projeto_id, dia, tipo_conteudo, quantidade, engajamento, alcance, seguidores_ganhos,
+        custo_por_seguidor_qtd, custo_por_engajamento_qtd, valor_gasto,
+        custo_por_seguidor_soma, custo_por_engajamento_soma
+    )
+    SELECT
+        c.projeto_id,
+        COALESCE(c.data_inicio_impulsionamento, c.data_criacao::DATE),
+        c.tipo_conteudo,
+        p_sinal * COUNT(*),
+        p_sinal * COALESCE(SUM(c.engajamento), 0),
+        p_sinal * COALESCE(SUM(c.alcance), 0),
+        p_sinal * COALESCE(SUM(c.seguidores_depois - c.seguidores_antes)
+            FILTER (WHERE c.seguidores_antes <> 0 AND c.seguidores_depois <> 0), 0),
+        p_sinal * COUNT(*) FILTER (WHERE c.custo_por_seguidor <> 0),
+        p_sinal * COUNT(*) FILTER (WHERE c.custo_por_engajamento <> 0),
+        p_sinal * COALESCE(SUM(c.valor_gasto), 0),
+        p_sinal * COALESCE(SUM(c.custo_por_seguidor) FILTER (WHERE c.custo_por_seguidor <> 0), 0),
+        p_sinal * COALESCE(SUM(c.custo_por_engajamento) FILTER (WHERE c.custo_por_engajamento <> 0), 0)
+    FROM unnest(p_linhas) c
+    WHERE c.ativo AND c.projeto_id IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (projeto_id, dia, tipo_conteudo) DO UPDATE SET
+        quantidade = m.quantidade + EXCLUDED.quantidade,
+        engajamento = m.engajamento + EXCLUDED.engajamento,
+        alcance = m.alcance + EXCLUDED.alcance,
+        seguidores_ganhos = m.seguidores_ganhos + EXCLUDED.seguidores_ganhos,
+        custo_por_seguidor_qtd = m.custo_por_seguidor_qtd + EXCLUDED.custo_por_seguidor_qtd,
+        custo_por_engajamento_qtd = m.custo_por_engajamento_qtd + EXCLUDED.custo_por_engajamento_qtd,
+        valor_gasto = m.valor_gasto + EXCLUDED.valor_gasto,
+        custo_por_seguidor_soma = m.custo_por_seguidor_soma + EXCLUDED.custo_por_seguidor_soma,
+        custo_por_engajamento_soma = m.custo_por_engajamento_soma + EXCLUDED.custo_por_engajamento_soma;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION atualizar_metricas_projeto_diarias()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- As versões antigas das linhas saem do agregado e as novas entram
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM aplicar_delta_metricas_projeto(ARRAY(SELECT ROW(a.*)::conteudos FROM antigas a), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM aplicar_delta_metricas_projeto(ARRAY(SELECT ROW(n.*)::conteudos FROM novas n), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Triggers por comando: uma inserção em lote (ou importação) atualiza cada agregado uma única vez
+CREATE TRIGGER metricas_projeto_insert_trigger AFTER INSERT ON conteudos
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_metricas_projeto_diarias();
+
+CREATE TRIGGER metricas_projeto_update_trigger AFTER UPDATE ON conteudos
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_metricas_projeto_diarias();
+
+CREATE TRIGGER metricas_projeto_delete_trigger AFTER DELETE ON conteudos
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_metricas_projeto_diarias();
+
+-- Preenche os agregados com os conteúdos já existentes (só se a tabela ainda estiver vazia)
+SELECT aplicar_delta_metricas_projeto(ARRAY(SELECT c FROM conteudos c), 1)
+WHERE NOT EXISTS (SELECT 1 FROM metricas_projeto_diarias);
+
+-- Esboços de quantis (DDSketch, erro relativo de 1%) das métricas de custo por projeto e tipo de conteúdo
+-- Cada valor positivo conta no balde CEIL(LN(valor) / LN(γ)), γ = 1.01 / 0.99 (a mesma regra de
+-- src/analytics/quantis.py). Como os baldes são contagens, o trigger soma e subtrai valores sem reler
+-- o projeto, e o esboço de vários projetos é a soma das contagens por balde
+CREATE TABLE IF NOT EXISTS quantis_metricas (
+    projeto_id UUID NOT NULL REFERENCES projetos(id) ON DELETE CASCADE,
+    tipo_conteudo VARCHAR(2) NOT NULL,
+    metrica VARCHAR(32) NOT NULL,
+    indice SMALLINT NOT NULL,
+    contagem INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (projeto_id, tipo_conteudo, metrica, indice)
+);
+
+CREATE OR REPLACE FUNCTION aplicar_delta_quantis(p_linhas conteudos[], p_sinal INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO quantis_metricas AS q (projeto_id, tipo_conteudo, metrica, indice, contagem)
+    SELECT c.projeto_id, c.tipo_conteudo, v.metrica, CEIL(LN(v.valor) / LN(1.01 / 0.99))::SMALLINT, p_sinal * COUNT(*)
+    FROM unnest(p_linhas) c
+    CROSS JOIN LATERAL (VALUES
+        ('custo_por_seguidor', c.custo_por_seguidor),
+        ('custo_por_engajamento', c.custo_por_engajamento),
+        ('cpm', c.cpm)
+    ) AS v(metrica, valor)
+    WHERE c.ativo AND c.projeto_id IS NOT NULL AND v.valor > 0
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (projeto_id, tipo_conteudo, metrica, indice) DO UPDATE SET
+        contagem = q.contagem + EXCLUDED.contagem;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION atualizar_quantis_metricas()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM aplicar_delta_quantis(ARRAY(SELECT ROW(a.*)::conteudos FROM antigas a), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM aplicar_delta_quantis(ARRAY(SELECT ROW(n.*)::conteudos FROM novas n), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER quantis_metricas_insert_trigger AFTER INSERT ON conteudos
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_quantis_metricas();
+
+CREATE TRIGGER quantis_metricas_update_trigger AFTER UPDATE ON conteudos
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_quantis_metricas();
+
+CREATE TRIGGER quantis_metricas_delete_trigger AFTER DELETE ON conteudos
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION atualizar_quantis_metricas();
+
+-- Esboço de uma métrica somando os baldes dos projetos ativos (todos, ou só os de p_projeto_ids)
+CREATE OR REPLACE FUNCTION esboco_quantis(
+    p_metrica TEXT,
+    p_tipos TEXT[] DEFAULT NULL,
+    p_projeto_ids UUID[] DEFAULT NULL
+)
+RETURNS TABLE (indice SMALLINT, contagem BIGINT) AS $$
+    SELECT q.indice, SUM(q.contagem)
+    FROM quantis_metricas q
+    JOIN projetos p ON p.id = q.projeto_id AND p.ativo
+    WHERE q.metrica = p_metrica
+      AND (p_tipos IS NULL OR q.tipo_conteudo = ANY(p_tipos))
+      AND (p_projeto_ids IS NULL OR q.projeto_id = ANY(p_projeto_ids))
+    GROUP BY q.indice
+    HAVING SUM(q.contagem) > 0
+    ORDER BY q.indice;
+$$ LANGUAGE sql STABLE;
+
+-- Preenche os esboços com os conteúdos já existentes (só se a tabela ainda estiver vazia)
+SELECT aplicar_delta_quantis(ARRAY(SELECT c FROM conteudos c), 1)
+WHERE NOT EXISTS (SELECT 1 FROM quantis_metricas);
+
+-- Progresso das importações de relatórios, gravado pelo worker que executa cada uma (a cada lote)
+-- para que qualquer worker responda GET /api/importacoes/{id}
+CREATE TABLE IF NOT EXISTS importacoes (
+    id UUID PRIMARY KEY,
+    projeto_id UUID REFERENCES projetos(id) ON DELETE CASCADE,
+    destino VARCHAR(16) NOT NULL,
+    nome_arquivo VARCHAR(255),
+    campos JSONB,
+    estado VARCHAR(16) NOT NULL DEFAULT 'pendente',
+    linhas_lidas INTEGER NOT NULL DEFAULT 0,
+    importadas INTEGER NOT NULL DEFAULT 0,
+    com_erro INTEGER NOT NULL DEFAULT 0,
+    lotes INTEGER NOT NULL DEFAULT 0,
+    erros JSONB NOT NULL DEFAULT '[]',
+    mensagem TEXT,
+    iniciada_em TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    concluida_em TIMESTAMP WITH TIME ZONE,
+    data_atualizacao TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TRIGGER update_importacoes_updated_at BEFORE UPDATE ON importacoes
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Parâmetros das regras de sugestão ajustados por projeto ({parametro: valor} de cada regra);
+-- as regras sem linha usam os padrões, e POST /api/analytics/sugestoes ainda pode sobrescrevê-los
+CREATE TABLE IF NOT EXISTS regras_projeto (
+    projeto_id UUID NOT NULL REFERENCES projetos(id) ON DELETE CASCADE,
+    regra_id VARCHAR(64) NOT NULL,
+    parametros JSONB NOT NULL DEFAULT '{}',
+    data_criacao TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    data_atualizacao TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (projeto_id, regra_id)
+);
+
+CREATE TRIGGER update_regras_projeto_updated_at BEFORE UPDATE ON regras_projeto
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,58 @@
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+# Representação colunar de registros para os cálculos de métricas
+
+
+def _numero(valor: Any) -> float:
+    return np.nan if valor is None else valor
+
+
+class Colunas:
+    """Colunas numéricas (float64, NaN para nulos) e tipo de uma lista de registros
+
+    Os registros são lidos uma única vez; depois disso todos os cálculos são
+    feitos com operações vetorizadas sobre os arrays.
+    """
+
+    def __init__(self, registros: Sequence[Any], campos: Sequence[str], campo_tipo: str):
+        self.tamanho = len(registros)
+        self._indice = {campo: i for i, campo in enumerate(campos)}
+        self.tipos = np.array([getattr(r, campo_tipo) or '' for r in registros], dtype='U2')
+        self.matriz = np.array(
+            [[_numero(getattr(r, campo)) for campo in campos] for r in registros],
+            dtype=np.float64
+        ).reshape(self.tamanho, len(campos))
+        self.nulos = np.isnan(self.matriz)
+
+    def coluna(self, campo: str, mascara: np.ndarray = None) -> np.ndarray:
+        """Retorna a coluna de um campo, opcionalmente filtrada por uma máscara de linhas"""
+        valores = self.matriz[:, self._indice[campo]]
+        return valores if mascara is None else valores[mascara]
+
+    def mascara_tipo(self, *tipos: str) -> np.ndarray:
+        """Máscara das linhas cujo tipo está entre os informados"""
+        return np.isin(self.tipos, tipos)
+
+    def contagem_por_tipo(self, tipos: Iterable[str]) -> Dict[str, int]:
+        """Conta as linhas de cada tipo"""
+        return {tipo: int(np.count_nonzero(self.tipos == tipo)) for tipo in tipos}
+
+
+def preenchidos(valores: np.ndarray) -> np.ndarray:
+    """Máscara dos valores informados e diferentes de zero"""
+    return ~np.isnan(valores) & (valores != 0)
+
+
+def soma(valores: np.ndarray) -> float:
+    """Soma ignorando nulos"""
+    return float(np.nansum(valores))
+
+
+def media_min_max(valores: np.ndarray) -> List[float]:
+    """Média, mínimo e máximo dos valores preenchidos (zeros quando não há nenhum)"""
+    valores = valores[preenchidos(valores)]
+    if not valores.size:
+        return [0, 0, 0]
+    return [float(valores.mean()), float(valores.min()), float(valores.max())]
@@ -0,0 +1,127 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.analytics.colunar import Colunas
+
+# Funil de retenção de vídeo (25% → 50% → 75% → 95% → 100% e ThruPlay/alcance)
+#
+# Todos os itens de um projeto são calculados de uma vez: as etapas formam uma
+# matriz (itens × etapas) e as retenções entre etapas saem de uma única divisão
+# entre colunas vizinhas. Itens sem reproduções a 25% (sem vídeo) ficam de fora.
+
+ETAPAS = ('25', '50', '75', '95', '100')
+TRANSICOES = tuple(f'{de}_{para}' for de, para in zip(ETAPAS, ETAPAS[1:]))
+QUANTIS_DISTRIBUICAO = {'p25': 0.25, 'mediana': 0.5, 'p75': 0.75, 'p90': 0.9}
+
+CAMPOS_CONTEUDO = {
+    'etapas': tuple(f'reproducao_{etapa}_pct' for etapa in ETAPAS),
+    'thruplay': 'thruplay',
+    'alcance': 'alcance',
+    'tipo': 'tipo_conteudo',
+    'rotulo': 'identificador'
+}
+CAMPOS_CAMPANHA = {
+    'etapas': tuple(f'reproducao_{etapa}_pct_total' for etapa in ETAPAS),
+    'thruplay': 'thruplay_total',
+    'alcance': 'alcance_total',
+    'tipo': 'tipo_campanha',
+    'rotulo': 'nome'
+}
+
+
+def colunas_lidas(campos: Dict[str, Any]) -> List[str]:
+    """Colunas que precisam ser buscadas para o funil (além de id)"""
+    return [campos['rotulo'], campos['tipo'], *campos['etapas'], campos['thruplay'], campos['alcance']]
+
+
+def _razao(numerador: np.ndarray, denominador: np.ndarray) -> np.ndarray:
+    """Divisão elemento a elemento; NaN onde o denominador é nulo ou zero"""
+    resultado = np.full(np.broadcast(numerador, denominador).shape, np.nan)
+    validos = ~np.isnan(numerador) & (denominador > 0)
+    np.divide(numerador, denominador, out=resultado, where=validos)
+    return resultado
+
+
+def _valor(valor: float) -> Optional[float]:
+    return None if np.isnan(valor) else float(valor)
+
+
+def _distribuicao(valores: np.ndarray) -> Dict[str, Any]:
+    """Contagem, média e quantis dos valores calculados (ignora NaN)"""
+    valores = valores[~np.isnan(valores)]
+    if not valores.size:
+        return {'contagem': 0, 'media': None, **dict.fromkeys(QUANTIS_DISTRIBUICAO)}
+    quantis = np.quantile(valores, list(QUANTIS_DISTRIBUICAO.values()))
+    return {
+        'contagem': int(valores.size),
+        'media': float(valores.mean()),
+        **{nome: float(valor) for nome, valor in zip(QUANTIS_DISTRIBUICAO, quantis)}
+    }
+
+
+def calcular_funil(registros: Sequence[Any], campos: Dict[str, Any]) -> Dict[str, Any]:
+    """Funil de cada item com vídeo, o funil agregado (somando as etapas dos itens) e a distribuição do projeto
+
+    Os itens saem em ordem crescente de retenção total (100% / 25%), os piores
+    primeiro; maior_queda é a transição em que o item perde mais espectadores.
+    """
+    nomes = [*campos['etapas'], campos['thruplay'], campos['alcance']]
+    colunas = Colunas(registros, nomes, campos['tipo'])
+    etapas = np.column_stack([colunas.coluna(campo) for campo in campos['etapas']])
+
+    com_video = etapas[:, 0] > 0
+    indices = np.flatnonzero(com_video)
+    etapas = etapas[com_video]
+    thruplay = colunas.coluna(campos['thruplay'], com_video)
+    alcance = colunas.coluna(campos['alcance'], com_video)
+
+    retencao = _razao(etapas[:, 1:], etapas[:, :-1])
+    queda = 1 - retencao
+    retencao_total = _razao(etapas[:, -1], etapas[:, 0])
+    thruplay_alcance = _razao(thruplay, alcance)
+
+    # Transição de maior queda (NaN não conta; -1 quando nenhuma pôde ser calculada)
+    sem_queda = np.isnan(queda).all(axis=1)
+    maior_queda = np.where(sem_queda, -1, np.argmax(np.nan_to_num(queda, nan=-np.inf), axis=1))
+
+    itens = []
+    for posicao in np.argsort(np.nan_to_num(retencao_total, nan=np.inf), kind='stable'):
+        registro = registros[indices[posicao]]
+        itens.append({
+            'id': registro.id,
+            'rotulo': getattr(registro, campos['rotulo']),
+            'tipo': str(colunas.tipos[indices[posicao]]) or None,
+            'etapas': {etapa: _valor(valor) for etapa, valor in zip(ETAPAS, etapas[posicao])},
+            'retencao': {transicao: _valor(valor) for transicao, valor in zip(TRANSICOES, retencao[posicao])},
+            'queda': {transicao: _valor(valor) for transicao, valor in zip(TRANSICOES, queda[posicao])},
+            'retencao_total': _valor(retencao_total[posicao]),
+            'thruplay_alcance': _valor(thruplay_alcance[posicao]),
+            'maior_queda': TRANSICOES[maior_queda[posicao]] if maior_queda[posicao] >= 0 else None
+        })
+
+    # Agregado só com os itens que têm todas as etapas (e thruplay com alcance), para não distorcer as razões
+    totais = etapas[~np.isnan(etapas).any(axis=1)].sum(axis=0)
+    com_alcance = ~np.isnan(thruplay) & (alcance > 0)
+    retencao_agregada = _razao(totais[1:], totais[:-1])
+    transicoes_maior_queda = maior_queda[maior_queda >= 0]
+
+    return {
+        'total_itens': colunas.tamanho,
+        'itens_com_video': int(indices.size),
+        'agregado': {
+            'etapas': {etapa: float(valor) for etapa, valor in zip(ETAPAS, totais)},
+            'retencao': {transicao: _valor(valor) for transicao, valor in zip(TRANSICOES, retencao_agregada)},
+            'retencao_total': _valor(_razao(totais[-1], totais[0])),
+            'thruplay_alcance': _valor(_razao(thruplay[com_alcance].sum(), alcance[com_alcance].sum()))
+        },
+        'distribuicao': {
+            'retencao': {transicao: _distribuicao(retencao[:, i]) for i, transicao in enumerate(TRANSICOES)},
+            'retencao_total': _distribuicao(retencao_total),
+            'thruplay_alcance': _distribuicao(thruplay_alcance),
+            'maior_queda': dict(zip(
+                TRANSICOES, np.bincount(transicoes_maior_queda, minlength=len(TRANSICOES)).tolist()
+            ))
+        },
+        'itens': itens
+    }
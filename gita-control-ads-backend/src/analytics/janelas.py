@@ -0,0 +1,100 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from src.config.supabase_config import tabela
+from src.models.cache import cache_janelas
+from src.models.coalescencia import executar_consulta
+
+# Métricas de um projeto numa janela de datas, lidas dos agregados diários por tipo
+# (metricas_projeto_diarias, mantidos por trigger a cada escrita em conteudos):
+# o custo de uma consulta cresce com os dias da janela, não com a quantidade de conteúdos
+
+TABELA = 'metricas_projeto_diarias'
+TAMANHO_PAGINA = 1000
+COLUNAS_SOMA = (
+    'quantidade', 'engajamento', 'alcance', 'seguidores_ganhos', 'valor_gasto',
+    'custo_por_seguidor_qtd', 'custo_por_seguidor_soma',
+    'custo_por_engajamento_qtd', 'custo_por_engajamento_soma'
+)
+
+
+def buscar_agregados(projeto_id: str, inicio: date, fim: date) -> List[Dict[str, Any]]:
+    """Linhas (dia, tipo) do projeto entre inicio e fim, em páginas na ordem da chave primária"""
+    linhas = []
+    while True:
+        response = executar_consulta(
+            tabela(TABELA).select(','.join(('dia', 'tipo_conteudo', *COLUNAS_SOMA)))
+            .eq('projeto_id', projeto_id).gte('dia', inicio.isoformat()).lte('dia', fim.isoformat())
+            .gt('quantidade', 0)
+            .order('dia').order('tipo_conteudo')
+            .range(len(linhas), len(linhas) + TAMANHO_PAGINA - 1)
+        )
+        linhas.extend(response.data)
+        if len(response.data) < TAMANHO_PAGINA:
+            return linhas
+
+
+def _media(soma: float, quantidade: int) -> float:
+    return soma / quantidade if quantidade else 0
+
+
+def calcular_metricas_janela(linhas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Consolida os agregados diários da janela nos mesmos blocos de metricas-projeto, mais a série por dia"""
+    por_tipo = defaultdict(lambda: dict.fromkeys(COLUNAS_SOMA, 0))
+    por_dia = {}
+
+    for linha in linhas:
+        total = por_tipo[linha['tipo_conteudo']]
+        for coluna in COLUNAS_SOMA:
+            total[coluna] += linha[coluna] or 0
+        dia = por_dia.setdefault(linha['dia'], {
+            'dia': linha['dia'], 'total_conteudos': 0, 'total_gasto': 0, 'total_engajamento': 0, 'total_alcance': 0
+        })
+        dia['total_conteudos'] += linha['quantidade']
+        dia['total_gasto'] += linha['valor_gasto'] or 0
+        dia['total_engajamento'] += linha['engajamento'] or 0
+        dia['total_alcance'] += linha['alcance'] or 0
+
+    c1 = por_tipo.get('C1')
+    c2_c4 = [por_tipo[tipo] for tipo in ('C2', 'C3', 'C4') if tipo in por_tipo]
+
+    def somar(coluna):
+        return sum(total[coluna] for total in c2_c4)
+
+    return {
+        'resumo': {
+            'total_conteudos': sum(total['quantidade'] for total in por_tipo.values()),
+            'conteudos_por_tipo': {tipo: por_tipo[tipo]['quantidade'] if tipo in por_tipo else 0
+                                   for tipo in ('C1', 'C2', 'C3', 'C4')}
+        },
+        'metricas_c1': {
+            'total_gasto': float(c1['valor_gasto']),
+            'total_seguidores_ganhos': int(c1['seguidores_ganhos']),
+            'custo_por_seguidor_medio': _media(float(c1['custo_por_seguidor_soma']), c1['custo_por_seguidor_qtd'])
+        } if c1 else None,
+        'metricas_c2_c4': {
+            'total_gasto': float(somar('valor_gasto')),
+            'total_engajamento': int(somar('engajamento')),
+            'custo_por_engajamento_medio': _media(float(somar('custo_por_engajamento_soma')),
+                                                  somar('custo_por_engajamento_qtd'))
+        } if c2_c4 else None,
+        'por_dia': list(por_dia.values())
+    }
+
+
+def metricas_janela(projeto_id: str, inicio: date, fim: date, usar_cache: bool = True) -> Dict[str, Any]:
+    """Métricas do projeto entre inicio e fim, com cache por (projeto, janela)
+
+    O cache (cache_janelas, separado do cache de entidades) é descartado a cada
+    escrita em conteudos neste worker e expira pelo TTL para as escritas feitas em outros.
+    """
+    chave = f'{projeto_id}:{inicio.isoformat()}:{fim.isoformat()}'
+    if usar_cache:
+        metricas = cache_janelas.obter(TABELA, chave)
+        if metricas is not None:
+            return metricas
+
+    metricas = calcular_metricas_janela(buscar_agregados(projeto_id, inicio, fim))
+    cache_janelas.definir(TABELA, chave, metricas)
+    return metricas
@@ -0,0 +1,143 @@
+import math
+import uuid
+from typing import Any, Dict, Optional, Sequence
+
+from src.config.supabase_config import funcao
+from src.models.coalescencia import executar_consulta
+
+# Esboço de quantis mesclável (DDSketch)
+#
+# Cada valor positivo cai no balde ceil(log(valor) / log(γ)), com γ = (1 + α) / (1 - α),
+# e o esboço guarda só a contagem de cada balde. Os quantis saem com erro relativo de
+# no máximo α sem ordenar os valores, e esboços de vários projetos se juntam somando
+# as contagens. A mesma regra de baldes é usada pela tabela quantis_metricas
+# (database_schema.sql), mantida por trigger a cada escrita em conteudos.
+
+PRECISAO_RELATIVA = 0.01
+GAMMA = (1 + PRECISAO_RELATIVA) / (1 - PRECISAO_RELATIVA)
+_LOG_GAMMA = math.log(GAMMA)
+
+# Métricas com esboço por projeto e tipo de conteúdo no banco
+METRICAS_ESBOCO = ('custo_por_seguidor', 'custo_por_engajamento', 'cpm')
+FUNCAO_ESBOCO = 'esboco_quantis'
+
+
+class EsbocoQuantis:
+    """Contagens por balde logarítmico de uma métrica; valores nulos, zero ou negativos são ignorados"""
+
+    __slots__ = ('baldes', 'contagem', 'minimo', 'maximo', '_ordenados')
+
+    def __init__(self, baldes: Dict[int, int] = None):
+        self.baldes: Dict[int, int] = {}
+        self.contagem = 0
+        # Extremos exatos, conhecidos só quando os valores passaram por este esboço
+        self.minimo: Optional[float] = None
+        self.maximo: Optional[float] = None
+        self._ordenados = None
+        for indice, contagem in (baldes or {}).items():
+            self._somar(int(indice), int(contagem))
+
+    def _somar(self, indice: int, contagem: int):
+        if contagem:
+            self.baldes[indice] = self.baldes.get(indice, 0) + contagem
+            self.contagem += contagem
+            self._ordenados = None
+
+    def _extremos(self, minimo: float, maximo: float):
+        self.minimo = minimo if self.minimo is None else min(self.minimo, minimo)
+        self.maximo = maximo if self.maximo is None else max(self.maximo, maximo)
+
+    def adicionar(self, valor: Optional[float]):
+        if valor is None or valor <= 0:
+            return
+        self._somar(math.ceil(math.log(valor) / _LOG_GAMMA), 1)
+        self._extremos(valor, valor)
+
+    def mesclar(self, outro: 'EsbocoQuantis') -> 'EsbocoQuantis':
+        """Soma as contagens de outro esboço a este (retorna o próprio esboço)"""
+        for indice, contagem in outro.baldes.items():
+            self._somar(indice, contagem)
+        if outro.minimo is not None:
+            self._extremos(outro.minimo, outro.maximo)
+        return self
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Valor do quantil q (0 a 1), com erro relativo de até PRECISAO_RELATIVA; None se vazio"""
+        if not self.contagem:
+            return None
+        if self._ordenados is None:
+            self._ordenados = sorted(self.baldes.items())
+
+        posicao = q * (self.contagem - 1)
+        acumulado = 0
+        for indice, contagem in self._ordenados:
+            acumulado += contagem
+            if acumulado > posicao:
+                break
+        valor = 2 * GAMMA ** indice / (GAMMA + 1)
+        if self.minimo is not None:
+            valor = min(max(valor, self.minimo), self.maximo)
+        return valor
+
+    @property
+    def mediana(self) -> Optional[float]:
+        return self.quantil(0.5)
+
+    def limite_outlier(self, k: float = 1.5) -> Optional[float]:
+        """Limite superior de Tukey: Q3 + k × IQR"""
+        if not self.contagem:
+            return None
+        q1, q3 = self.quantil(0.25), self.quantil(0.75)
+        return q3 + k * (q3 - q1)
+
+    def resumo(self) -> Dict[str, Any]:
+        """Contagem, mediana, p90, quartis, IQR e limite de outlier (k = 1.5)"""
+        if not self.contagem:
+            return {'contagem': 0, 'mediana': None, 'p90': None, 'q1': None, 'q3': None,
+                    'iqr': None, 'limite_outlier': None}
+        q1, q3 = self.quantil(0.25), self.quantil(0.75)
+        return {
+            'contagem': self.contagem,
+            'mediana': self.mediana,
+            'p90': self.quantil(0.9),
+            'q1': q1,
+            'q3': q3,
+            'iqr': q3 - q1,
+            'limite_outlier': self.limite_outlier()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'precisao_relativa': PRECISAO_RELATIVA,
+            'contagem': self.contagem,
+            'baldes': {str(indice): contagem for indice, contagem in sorted(self.baldes.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EsbocoQuantis':
+        return cls(data.get('baldes') or {})
+
+
+def esboco_agregado(metrica: str, tipos: Sequence[str] = None,
+                    projeto_ids: Sequence[str] = None) -> EsbocoQuantis:
+    """Esboço da métrica somando os baldes dos projetos ativos (todos, ou só os informados) no banco
+
+    Nenhuma linha de conteúdo é lida: a função esboco_quantis soma as contagens
+    por balde de quantis_metricas. Levanta ValueError para parâmetros inválidos.
+    """
+    if metrica not in METRICAS_ESBOCO:
+        raise ValueError(f"metrica deve ser uma de: {', '.join(METRICAS_ESBOCO)}")
+    parametros = {'p_metrica': metrica}
+    if tipos:
+        invalidos = [tipo for tipo in tipos if tipo not in ('C1', 'C2', 'C3', 'C4')]
+        if invalidos:
+            raise ValueError('tipo deve ser um de: C1, C2, C3, C4')
+        parametros['p_tipos'] = '{' + ','.join(tipos) + '}'
+    if projeto_ids:
+        try:
+            parametros['p_projeto_ids'] = '{' + ','.join(str(uuid.UUID(i)) for i in projeto_ids) + '}'
+        except ValueError:
+            raise ValueError('projeto_id deve ser uma lista de UUIDs separados por vírgula')
+
+    response = executar_consulta(funcao(FUNCAO_ESBOCO, parametros))
+    return EsbocoQuantis({linha['indice']: linha['contagem'] for linha in response.data})
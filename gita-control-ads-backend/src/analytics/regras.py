@@ -0,0 +1,449 @@
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.analytics.quantis import EsbocoQuantis
+
+# Motor de regras declarativas para as sugestões de otimização
+#
+# A avaliação faz duas passagens lineares sobre os registros: a primeira acumula
+# as estatísticas de que as regras precisam (contagem, soma e mínimo por métrica,
+# mais um esboço de quantis quando alguma regra usa mediana, percentil ou IQR),
+# a segunda testa cada registro contra todas as regras. Novas regras não
+# adicionam passagens, e os quantis não exigem ordenar os valores.
+
+# Campo que identifica o tipo de cada alvo de análise
+CAMPO_TIPO = {
+    'conteudo': 'tipo_conteudo',
+    'campanha': 'tipo_campanha'
+}
+
+
+class Estatistica:
+    """Acumulador de contagem, soma e mínimo dos valores de uma métrica (e, opcionalmente, dos quantis)"""
+
+    __slots__ = ('contagem', 'soma', 'minimo', 'esboco', '_quantis')
+
+    def __init__(self, quantis: bool = False):
+        self.contagem = 0
+        self.soma = 0
+        self.minimo = None
+        self.esboco = EsbocoQuantis() if quantis else None
+        self._quantis: Dict[float, Optional[float]] = {}
+
+    def adicionar(self, valor: float):
+        self.contagem += 1
+        self.soma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.esboco is not None:
+            self.esboco.adicionar(valor)
+            self._quantis.clear()
+
+    @property
+    def media(self) -> float:
+        return self.soma / self.contagem if self.contagem else 0
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Quantil q (0 a 1) pelo esboço, calculado uma vez por avaliação"""
+        if q not in self._quantis:
+            self._quantis[q] = self.esboco.quantil(q)
+        return self._quantis[q]
+
+    def limite_outlier(self, k: float) -> Optional[float]:
+        """Limite superior de Tukey: Q3 + k × IQR"""
+        q1, q3 = self.quantil(0.25), self.quantil(0.75)
+        return q3 + k * (q3 - q1)
+
+    def contexto(self) -> Dict[str, Any]:
+        """Valores das estatísticas disponíveis para montar o texto das sugestões"""
+        contexto = {'media': self.media, 'minimo': self.minimo}
+        if self.esboco is not None and self.contagem:
+            q1, q3 = self.quantil(0.25), self.quantil(0.75)
+            contexto.update(mediana=self.quantil(0.5), p90=self.quantil(0.9), q1=q1, q3=q3, iqr=q3 - q1)
+        return contexto
+
+
+def campo(nome: str) -> Callable[[Any], Any]:
+    """Métrica lida diretamente de um atributo do registro"""
+    return lambda registro: getattr(registro, nome, None)
+
+
+def percentual(numerador: str, denominador: str) -> Callable[[Any], Optional[float]]:
+    """Métrica numerador / denominador * 100 (None se algum dos dois não estiver preenchido)"""
+    def valor(registro):
+        n = getattr(registro, numerador, None)
+        d = getattr(registro, denominador, None)
+        if not n or not d or d <= 0:
+            return None
+        return (n / d) * 100
+    return valor
+
+
+# Condições disponíveis: (usa estatísticas, usa quantis, teste)
+CONDICOES = {
+    'acima_da_media': (True, False, lambda valor, est, p: valor > est.media * p['fator']),
+    'acima_da_mediana': (True, True, lambda valor, est, p: valor > est.quantil(0.5) * p['fator']),
+    'acima_do_percentil': (True, True, lambda valor, est, p: valor > est.quantil(p['percentil'] / 100)),
+    'outlier_iqr': (True, True, lambda valor, est, p: valor > est.limite_outlier(p['k'])),
+    'igual_ao_minimo': (True, False, lambda valor, est, p: valor == est.minimo),
+    'acima_de': (False, False, lambda valor, est, p: valor > p['limite']),
+    'abaixo_de': (False, False, lambda valor, est, p: valor < p['limite'])
+}
+
+
+class Regra:
+    """Regra de sugestão: métrica + condição + parâmetros + montagem da sugestão
+
+    Registros cuja métrica não está preenchida (None ou zero) são ignorados.
+    Regras agrupadas geram uma sugestão com todos os afetados; as demais geram
+    uma sugestão por registro afetado.
+    """
+
+    def __init__(self, id: str, alvo: str, metrica: str, condicao: str,
+                 sugestao: Callable[[List[Any], Dict[str, Any]], Dict[str, Any]],
+                 tipos: Sequence[str] = None, parametros: Dict[str, Any] = None,
+                 valor: Callable[[Any], Any] = None, agrupar: bool = True, descricao: str = None):
+        if alvo not in CAMPO_TIPO:
+            raise ValueError(f'Alvo de regra inválido: {alvo}')
+        if condicao not in CONDICOES:
+            raise ValueError(f'Condição de regra inválida: {condicao}')
+
+        self.id = id
+        self.alvo = alvo
+        self.metrica = metrica
+        self.condicao = condicao
+        self.sugestao = sugestao
+        self.tipos = frozenset(tipos) if tipos else None
+        self.parametros = dict(parametros or {})
+        self.valor = valor or campo(metrica)
+        self.agrupar = agrupar
+        self.descricao = descricao
+        self.usa_estatisticas, self.usa_quantis, self._teste = CONDICOES[condicao]
+
+    @property
+    def chave_estatistica(self):
+        return (self.metrica, self.tipos)
+
+    def aplica_ao_tipo(self, tipo: Optional[str]) -> bool:
+        return self.tipos is None or tipo in self.tipos
+
+    def verificar(self, valor: float, estatistica: Optional[Estatistica], parametros: Dict[str, Any]) -> bool:
+        return self._teste(valor, estatistica, parametros)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'alvo': self.alvo,
+            'metrica': self.metrica,
+            'condicao': self.condicao,
+            'tipos': sorted(self.tipos) if self.tipos else None,
+            'parametros': self.parametros,
+            'agrupar': self.agrupar,
+            'descricao': self.descricao
+        }
+
+
+class MotorRegras:
+    """Avalia um conjunto de regras sobre os registros em duas passagens"""
+
+    def __init__(self, regras: Sequence[Regra], parametros: Dict[str, Dict[str, Any]] = None):
+        self.regras = list(regras)
+        self.parametros = parametros or {}
+
+    def parametros_efetivos(self, regra: Regra) -> Dict[str, Any]:
+        return {**regra.parametros, **self.parametros.get(regra.id, {})}
+
+    def avaliar(self, alvo: str, registros: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Gera as sugestões das regras do alvo para os registros informados"""
+        regras = []
+        for regra in self.regras:
+            if regra.alvo == alvo:
+                parametros = self.parametros_efetivos(regra)
+                if parametros.get('ativa', True):
+                    regras.append((regra, parametros))
+
+        if not regras or not registros:
+            return []
+
+        campo_tipo = CAMPO_TIPO[alvo]
+
+        # Passagem 1: acumula as estatísticas usadas pelas regras
+        com_quantis = {regra.chave_estatistica for regra, _ in regras if regra.usa_quantis}
+        estatisticas: Dict[Any, Estatistica] = {}
+        acumuladores = []
+        for regra, _ in regras:
+            if regra.usa_estatisticas and regra.chave_estatistica not in estatisticas:
+                estatisticas[regra.chave_estatistica] = Estatistica(regra.chave_estatistica in com_quantis)
+                acumuladores.append((regra, estatisticas[regra.chave_estatistica]))
+
+        if acumuladores:
+            for registro in registros:
+                tipo = getattr(registro, campo_tipo, None)
+                for regra, estatistica in acumuladores:
+                    if regra.aplica_ao_tipo(tipo):
+                        valor = regra.valor(registro)
+                        if valor:
+                            estatistica.adicionar(valor)
+
+        # Passagem 2: testa cada registro contra todas as regras
+        afetados = {regra.id: [] for regra, _ in regras}
+        for registro in registros:
+            tipo = getattr(registro, campo_tipo, None)
+            for regra, parametros in regras:
+                if not regra.aplica_ao_tipo(tipo):
+                    continue
+
+                valor = regra.valor(registro)
+                if not valor:
+                    continue
+
+                estatistica = estatisticas.get(regra.chave_estatistica)
+                if regra.usa_estatisticas and not estatistica.contagem:
+                    continue
+
+                if regra.verificar(valor, estatistica, parametros):
+                    afetados[regra.id].append((registro, valor))
+
+        # Montagem das sugestões, na ordem de registro das regras
+        sugestoes = []
+        for regra, parametros in regras:
+            itens = afetados[regra.id]
+            if not itens:
+                continue
+
+            contexto = dict(parametros)
+            estatistica = estatisticas.get(regra.chave_estatistica)
+            if estatistica is not None:
+                contexto.update(estatistica.contexto())
+
+            if regra.agrupar:
+                sugestoes.append(regra.sugestao([registro for registro, _ in itens], contexto))
+            else:
+                for registro, valor in itens:
+                    sugestoes.append(regra.sugestao([registro], {**contexto, 'valor': valor}))
+
+        return sugestoes
+
+
+# Regras padrão
+
+REGRAS_PADRAO = [
+    Regra(
+        id='c1_custo_seguidor_alto',
+        alvo='conteudo',
+        tipos=['C1'],
+        metrica='custo_por_seguidor',
+        condicao='acima_da_mediana',
+        parametros={'fator': 1.5},
+        descricao='Conteúdos C1 com custo por seguidor acima de fator × a mediana',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'otimizacao',
+            'categoria': 'C1 - Custo por Seguidor',
+            'prioridade': 'alta',
+            'titulo': 'Conteúdos C1 com custo por seguidor elevado',
+            'descricao': f'Identificamos {len(afetados)} conteúdo(s) C1 com custo por seguidor acima de {ctx["fator"]}× a mediana (R$ {ctx["mediana"]:.2f}). Considere revisar o targeting, criativo ou orçamento.',
+            'conteudos_afetados': [c.identificador for c in afetados],
+            'acao_recomendada': 'Revisar targeting, testar novos criativos ou ajustar orçamento diário'
+        }
+    ),
+    Regra(
+        id='c1_melhores_praticas',
+        alvo='conteudo',
+        tipos=['C1'],
+        metrica='custo_por_seguidor',
+        condicao='igual_ao_minimo',
+        descricao='Conteúdos C1 com o menor custo por seguidor do projeto',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'oportunidade',
+            'categoria': 'C1 - Melhores Práticas',
+            'prioridade': 'media',
+            'titulo': 'Replicar estratégia dos melhores conteúdos C1',
+            'descricao': f'O conteúdo "{afetados[0].identificador}" tem o melhor custo por seguidor (R$ {ctx["minimo"]:.2f}). Considere replicar elementos deste criativo.',
+            'conteudos_afetados': [c.identificador for c in afetados],
+            'acao_recomendada': 'Analisar elementos visuais, copy e targeting dos melhores performers'
+        }
+    ),
+    Regra(
+        id='c2_c4_custo_engajamento_alto',
+        alvo='conteudo',
+        tipos=['C2', 'C3', 'C4'],
+        metrica='custo_por_engajamento',
+        condicao='acima_da_mediana',
+        parametros={'fator': 1.3},
+        descricao='Conteúdos C2-C4 com custo por engajamento acima de fator × a mediana',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'otimizacao',
+            'categoria': 'C2-C4 - Custo por Engajamento',
+            'prioridade': 'alta',
+            'titulo': 'Conteúdos de nutrição com custo por engajamento elevado',
+            'descricao': f'Identificamos {len(afetados)} conteúdo(s) de nutrição com custo por engajamento acima de {ctx["fator"]}× a mediana (R$ {ctx["mediana"]:.2f}).',
+            'conteudos_afetados': [c.identificador for c in afetados],
+            'acao_recomendada': 'Revisar relevância do conteúdo para a audiência e testar novos formatos'
+        }
+    ),
+    Regra(
+        id='cpm_outlier',
+        alvo='conteudo',
+        metrica='cpm',
+        condicao='outlier_iqr',
+        parametros={'k': 1.5},
+        descricao='Conteúdos com CPM acima de Q3 + k × IQR do projeto (outliers)',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'alerta',
+            'categoria': 'CPM',
+            'prioridade': 'media',
+            'titulo': 'Conteúdos com CPM fora do padrão do projeto',
+            'descricao': f'{len(afetados)} conteúdo(s) com CPM acima de R$ {ctx["q3"] + ctx["k"] * ctx["iqr"]:.2f} (mediana do projeto: R$ {ctx["mediana"]:.2f}). O leilão pode estar saturado para esse público.',
+            'conteudos_afetados': [c.identificador for c in afetados],
+            'acao_recomendada': 'Ampliar ou trocar o público, revisar posicionamentos e testar outros horários'
+        }
+    ),
+    Regra(
+        id='retencao_video_baixa',
+        alvo='conteudo',
+        tipos=['C2', 'C3', 'C4'],
+        metrica='taxa_retencao',
+        valor=percentual('reproducao_100_pct', 'reproducao_25_pct'),
+        condicao='abaixo_de',
+        parametros={'limite': 30},
+        agrupar=False,
+        descricao='Vídeos com reprodução 100% / 25% abaixo do limite (%)',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'otimizacao',
+            'categoria': 'Retenção de Vídeo',
+            'prioridade': 'media',
+            'titulo': f'Baixa retenção no vídeo "{afetados[0].identificador}"',
+            'descricao': f'Taxa de retenção de apenas {ctx["valor"]:.1f}%. Muitos usuários não assistem até o final.',
+            'conteudos_afetados': [afetados[0].identificador],
+            'acao_recomendada': 'Revisar hook inicial, ritmo do vídeo e call-to-action'
+        }
+    ),
+    Regra(
+        id='campanha_frequencia_alta',
+        alvo='campanha',
+        metrica='frequencia_media',
+        condicao='acima_de',
+        parametros={'limite': 3.0},
+        descricao='Campanhas com frequência média acima do limite',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'alerta',
+            'categoria': 'Frequência de Exibição',
+            'prioridade': 'alta',
+            'titulo': 'Campanhas com frequência muito alta',
+            'descricao': f'{len(afetados)} campanha(s) com frequência acima de {ctx["limite"]}. Risco de fadiga da audiência.',
+            'conteudos_afetados': [c.nome for c in afetados],
+            'acao_recomendada': 'Expandir audiência ou pausar temporariamente para evitar saturação'
+        }
+    ),
+    Regra(
+        id='campanha_custo_engajamento_alto',
+        alvo='campanha',
+        metrica='custo_por_engajamento',
+        condicao='acima_da_mediana',
+        parametros={'fator': 1.5},
+        descricao='Campanhas com custo por engajamento acima de fator × a mediana',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'otimizacao',
+            'categoria': 'Eficiência de Campanha',
+            'prioridade': 'media',
+            'titulo': 'Campanhas com baixa eficiência de engajamento',
+            'descricao': f'{len(afetados)} campanha(s) com custo por engajamento acima de {ctx["fator"]}× a mediana (R$ {ctx["mediana"]:.2f}).',
+            'conteudos_afetados': [c.nome for c in afetados],
+            'acao_recomendada': 'Revisar segmentação de audiência e otimizar criativos'
+        }
+    ),
+    Regra(
+        id='campanha_thruplay_baixo',
+        alvo='campanha',
+        metrica='taxa_thruplay',
+        valor=percentual('thruplay_total', 'alcance_total'),
+        condicao='abaixo_de',
+        parametros={'limite': 15},
+        agrupar=False,
+        descricao='Campanhas com ThruPlay / alcance abaixo do limite (%)',
+        sugestao=lambda afetados, ctx: {
+            'tipo': 'otimizacao',
+            'categoria': 'Engajamento de Vídeo',
+            'prioridade': 'media',
+            'titulo': f'Baixa taxa de ThruPlay na campanha "{afetados[0].nome}"',
+            'descricao': f'Taxa de ThruPlay de apenas {ctx["valor"]:.1f}%. O conteúdo pode não estar capturando atenção.',
+            'conteudos_afetados': [afetados[0].nome],
+            'acao_recomendada': 'Testar novos hooks, formatos de vídeo ou ajustar duração'
+        }
+    )
+]
+
+
+# Regras disponíveis: as padrão mais as registradas por registrar_regra. O registro
+# acontece no carregamento do módulo que define a regra, igual em todos os workers;
+# o que muda por projeto são os parâmetros, gravados em regras_projeto
+_regras: List[Regra] = list(REGRAS_PADRAO)
+_REGRAS_POR_ID: Dict[str, Regra] = {regra.id: regra for regra in REGRAS_PADRAO}
+
+
+def registrar_regra(regra: Regra):
+    """Registra uma regra de sugestão (substitui a de mesmo id)
+
+    Uma regra que só deve valer para alguns projetos é registrada com
+    parametros={'ativa': False, ...} e ativada nos parâmetros desses projetos.
+    """
+    if regra.id in _REGRAS_POR_ID:
+        _regras[_regras.index(_REGRAS_POR_ID[regra.id])] = regra
+    else:
+        _regras.append(regra)
+    _REGRAS_POR_ID[regra.id] = regra
+
+
+def listar_regras() -> List[Regra]:
+    """Regras de sugestão disponíveis, na ordem de avaliação"""
+    return list(_regras)
+
+
+def validar_parametros(regra_id: str, valores: Dict[str, Any]) -> Dict[str, Any]:
+    """Confere nomes e tipos dos parâmetros informados contra os padrões declarados na regra
+
+    Levanta ValueError se a regra ou algum parâmetro não existir ou tiver tipo inválido.
+    """
+    regra = _REGRAS_POR_ID.get(regra_id)
+    if regra is None:
+        raise ValueError(f'Regra desconhecida: {regra_id}')
+    if not isinstance(valores, dict):
+        raise ValueError(f'Os parâmetros de {regra_id} devem ser um objeto {{parametro: valor}}')
+
+    for nome, valor in valores.items():
+        if nome == 'ativa':
+            if not isinstance(valor, bool):
+                raise ValueError(f'{regra_id}.ativa deve ser true ou false')
+        elif nome not in regra.parametros:
+            aceitos = ', '.join(['ativa', *regra.parametros])
+            raise ValueError(f'Parâmetro desconhecido {regra_id}.{nome} (aceitos: {aceitos})')
+        elif isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+            raise ValueError(f'{regra_id}.{nome} deve ser numérico')
+        elif nome == 'percentil' and not 0 < valor <= 100:
+            raise ValueError(f'{regra_id}.percentil deve estar entre 0 e 100')
+    return valores
+
+
+def _parametros_gravados(projeto_id: str) -> Dict[str, Dict[str, Any]]:
+    """Parâmetros do projeto ainda válidos (os de regras ou parâmetros que deixaram de existir são ignorados)"""
+    from src.models.regras_projeto import buscar_parametros
+
+    validos = {}
+    for regra_id, valores in buscar_parametros(projeto_id).items():
+        try:
+            validos[regra_id] = validar_parametros(regra_id, valores)
+        except ValueError as e:
+            print(f"Parâmetros de regra ignorados no projeto {projeto_id}: {e}")
+    return validos
+
+
+def montar_motor(projeto_id: str = None, parametros: Dict[str, Dict[str, Any]] = None) -> MotorRegras:
+    """Monta o motor com as regras registradas, os parâmetros gravados do projeto e, por cima, os da chamada
+
+    Levanta ValueError se algum parâmetro da chamada não existir ou tiver tipo
+    inválido, ou se projeto_id não for um UUID.
+    """
+    efetivos = _parametros_gravados(projeto_id) if projeto_id else {}
+    for regra_id, valores in (parametros or {}).items():
+        efetivos[regra_id] = {**efetivos.get(regra_id, {}), **validar_parametros(regra_id, valores)}
+    return MotorRegras(listar_regras(), efetivos)
@@ -0,0 +1,153 @@
+import gzip
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compressão dinâmica das respostas da API (JSON e NDJSON)
+COMPRESSAO_PREFIXO = '/api'
+COMPRESSAO_MIN_BYTES = int(os.getenv('COMPRESSAO_MIN_BYTES', '1024'))
+MIMETYPES_COMPRESSIVEIS = ('application/json', 'application/x-ndjson', 'text/plain', 'text/csv')
+
+# Níveis padrão baratos em CPU; valores acima do teto configurado são reduzidos
+NIVEIS_MAXIMOS = {'br': 11, 'zstd': 19, 'gzip': 9}
+COMPRESSAO_NIVEL_MAXIMO = {
+    'br': int(os.getenv('COMPRESSAO_NIVEL_MAXIMO_BROTLI', '5')),
+    'zstd': int(os.getenv('COMPRESSAO_NIVEL_MAXIMO_ZSTD', '6')),
+    'gzip': int(os.getenv('COMPRESSAO_NIVEL_MAXIMO_GZIP', '6')),
+}
+NIVEIS_PADRAO = {'br': 4, 'zstd': 3, 'gzip': 6}
+
+
+def nivel_compressao(codificacao: str, nivel: Optional[int] = None) -> int:
+    """Nível efetivo da codificação: o padrão (ou o informado), limitado ao teto configurado"""
+    nivel = NIVEIS_PADRAO[codificacao] if nivel is None else nivel
+    teto = min(COMPRESSAO_NIVEL_MAXIMO[codificacao], NIVEIS_MAXIMOS[codificacao])
+    return max(1, min(nivel, teto))
+
+
+class Compressor:
+    """Compressor incremental: cada bloco comprimido é liberado imediatamente (compatível com streaming)"""
+
+    def __init__(self, codificacao: str, nivel: Optional[int] = None):
+        self.codificacao = codificacao
+        nivel = nivel_compressao(codificacao, nivel)
+        if codificacao == 'br':
+            self._objeto = brotli.Compressor(quality=nivel)
+        elif codificacao == 'zstd':
+            self._objeto = zstandard.ZstdCompressor(level=nivel).compressobj()
+        else:
+            # wbits=31: cabeçalho e rodapé gzip
+            self._objeto = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+
+    def comprimir(self, bloco: bytes) -> bytes:
+        if self.codificacao == 'br':
+            return self._objeto.process(bloco) + self._objeto.flush()
+        if self.codificacao == 'zstd':
+            return self._objeto.compress(bloco) + self._objeto.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._objeto.compress(bloco) + self._objeto.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self) -> bytes:
+        if self.codificacao == 'br':
+            return self._objeto.finish()
+        return self._objeto.flush()
+
+
+def comprimir(dados: bytes, codificacao: str, nivel: Optional[int] = None) -> bytes:
+    """Comprime um corpo completo de uma vez"""
+    nivel = nivel_compressao(codificacao, nivel)
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=nivel)
+    if codificacao == 'zstd':
+        return zstandard.ZstdCompressor(level=nivel).compress(dados)
+    return gzip.compress(dados, compresslevel=nivel, mtime=0)
+
+
+def codificacoes_disponiveis() -> tuple:
+    """Codificações suportadas neste ambiente, em ordem de preferência do servidor"""
+    disponiveis = []
+    if brotli is not None:
+        disponiveis.append('br')
+    if zstandard is not None:
+        disponiveis.append('zstd')
+    disponiveis.append('gzip')
+    return tuple(disponiveis)
+
+
+CODIFICACOES = codificacoes_disponiveis()
+
+
+def escolher_codificacao() -> Optional[str]:
+    """Codificação com maior qualidade no Accept-Encoding; empates seguem a preferência do servidor"""
+    melhor, melhor_qualidade = None, 0
+    for codificacao in CODIFICACOES:
+        qualidade = request.accept_encodings[codificacao]
+        if qualidade > melhor_qualidade:
+            melhor, melhor_qualidade = codificacao, qualidade
+    return melhor
+
+
+def _comprimir_stream(blocos: Iterable[bytes], compressor: Compressor) -> Iterator[bytes]:
+    try:
+        for bloco in blocos:
+            if bloco:
+                yield compressor.comprimir(bloco)
+        yield compressor.finalizar()
+    finally:
+        if hasattr(blocos, 'close'):
+            blocos.close()
+
+
+def comprimir_resposta(resposta: Response) -> Response:
+    """Comprime a resposta da API conforme o Accept-Encoding do cliente
+
+    Respostas em streaming (NDJSON) são comprimidas bloco a bloco, sem
+    esperar o fim; as demais só a partir de COMPRESSAO_MIN_BYTES. O ETag
+    passa a ser fraco, já que o corpo comprimido não é idêntico byte a byte.
+    """
+    if not request.path.startswith(COMPRESSAO_PREFIXO):
+        return resposta
+    if resposta.mimetype not in MIMETYPES_COMPRESSIVEIS or resposta.direct_passthrough:
+        return resposta
+    if resposta.status_code < 200 or resposta.status_code in (204, 206, 304):
+        return resposta
+    if 'Content-Encoding' in resposta.headers:
+        return resposta
+
+    # A representação varia com o Accept-Encoding mesmo quando não é comprimida
+    resposta.vary.add('Accept-Encoding')
+
+    codificacao = escolher_codificacao()
+    if codificacao is None:
+        return resposta
+
+    if resposta.is_streamed:
+        resposta.response = _comprimir_stream(resposta.iter_encoded(), Compressor(codificacao))
+        resposta.headers.pop('Content-Length', None)
+    else:
+        dados = resposta.get_data()
+        if len(dados) < COMPRESSAO_MIN_BYTES:
+            return resposta
+        resposta.set_data(comprimir(dados, codificacao))
+
+    resposta.headers['Content-Encoding'] = codificacao
+    etag, fraco = resposta.get_etag()
+    if etag and not fraco:
+        resposta.set_etag(etag, weak=True)
+    return resposta
+
+
+def configurar_compressao(app: Flask):
+    """Registra a compressão das respostas da API no app"""
+    app.after_request(comprimir_resposta)
@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import io
+import mimetypes
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from flask import Response, request, send_file
+
+# Arquivos estáticos do frontend (build do Vite em src/static), indexados na inicialização
+ESTATICOS_MAX_BYTES_MEMORIA = int(os.getenv('ESTATICOS_MAX_BYTES_MEMORIA', str(2 * 1024 * 1024)))
+ESTATICOS_MAX_AGE_INDEX = int(os.getenv('ESTATICOS_MAX_AGE_INDEX', '60'))
+ESTATICOS_MAX_AGE_PADRAO = int(os.getenv('ESTATICOS_MAX_AGE_PADRAO', '3600'))
+
+CACHE_IMUTAVEL = 'public, max-age=31536000, immutable'
+
+# Variantes pré-comprimidas, em ordem de preferência: (Content-Encoding, extensão)
+VARIANTES = (('br', '.br'), ('gzip', '.gz'))
+
+# Arquivos com hash no nome: a pasta assets/ do Vite ou um hash hexadecimal no nome
+PADRAO_HASH = re.compile(r'(^|/)assets/|[.-][0-9a-fA-F]{8,}\.[^/]+$')
+
+
+class ArquivoEstatico:
+    """Um arquivo do índice: metadados, ETag e conteúdo em memória (quando pequeno) de cada codificação"""
+
+    def __init__(self, nome: str, caminho: str):
+        self.nome = nome
+        self.mimetype = mimetypes.guess_type(nome)[0] or 'application/octet-stream'
+        self.imutavel = bool(PADRAO_HASH.search(nome))
+        self.mtime = os.stat(caminho).st_mtime
+        # codificação ('identity', 'br', 'gzip') -> (caminho, conteúdo em memória ou None, ETag)
+        self.codificacoes: Dict[str, Tuple[str, Optional[bytes], str]] = {}
+        self._adicionar('identity', caminho)
+
+    def _adicionar(self, codificacao: str, caminho: str):
+        conteudo = None
+        digest = hashlib.sha1()
+        with open(caminho, 'rb') as arquivo:
+            if os.fstat(arquivo.fileno()).st_size <= ESTATICOS_MAX_BYTES_MEMORIA:
+                conteudo = arquivo.read()
+                digest.update(conteudo)
+            else:
+                for bloco in iter(lambda: arquivo.read(1024 * 1024), b''):
+                    digest.update(bloco)
+        etag = digest.hexdigest()[:20] + ('' if codificacao == 'identity' else f'-{codificacao}')
+        self.codificacoes[codificacao] = (caminho, conteudo, etag)
+
+    @property
+    def cache_control(self) -> str:
+        if self.imutavel:
+            return CACHE_IMUTAVEL
+        if self.nome == 'index.html':
+            return f'public, max-age={ESTATICOS_MAX_AGE_INDEX}, must-revalidate'
+        return f'public, max-age={ESTATICOS_MAX_AGE_PADRAO}'
+
+    def escolher_codificacao(self) -> str:
+        """Escolhe a variante pré-comprimida aceita pelo cliente (ou o arquivo original)"""
+        for codificacao, _ in VARIANTES:
+            if codificacao in self.codificacoes and request.accept_encodings[codificacao] > 0:
+                return codificacao
+        return 'identity'
+
+    def responder(self) -> Response:
+        """Envia o arquivo com suporte a Range e requisições condicionais (ETag/Last-Modified)"""
+        codificacao = self.escolher_codificacao()
+        caminho, conteudo, etag = self.codificacoes[codificacao]
+        resposta = send_file(
+            io.BytesIO(conteudo) if conteudo is not None else caminho,
+            mimetype=self.mimetype,
+            download_name=self.nome.rsplit('/', 1)[-1],
+            conditional=True,
+            etag=etag,
+            last_modified=self.mtime
+        )
+        if codificacao != 'identity':
+            resposta.headers['Content-Encoding'] = codificacao
+        if len(self.codificacoes) > 1:
+            resposta.vary.add('Accept-Encoding')
+        resposta.headers['Cache-Control'] = self.cache_control
+        return resposta
+
+
+class IndiceEstaticos:
+    """Mapa em memória dos arquivos da pasta estática, montado uma vez na inicialização
+
+    Evita consultar o sistema de arquivos a cada requisição; mudanças na pasta
+    exigem reiniciar o worker (ou chamar indexar novamente).
+    """
+
+    def __init__(self, pasta: Optional[str]):
+        self.pasta = pasta
+        self.arquivos: Dict[str, ArquivoEstatico] = {}
+        self.indexar()
+
+    def indexar(self):
+        arquivos = {}
+        if self.pasta and os.path.isdir(self.pasta):
+            caminhos = {}
+            for raiz, _, nomes in os.walk(self.pasta):
+                for nome in nomes:
+                    caminho = os.path.join(raiz, nome)
+                    caminhos[os.path.relpath(caminho, self.pasta).replace(os.sep, '/')] = caminho
+
+            for relativo, caminho in caminhos.items():
+                # Variantes .br/.gz de um arquivo existente não são servidas diretamente
+                if any(relativo.endswith(extensao) and relativo[:-len(extensao)] in caminhos for _, extensao in VARIANTES):
+                    continue
+                arquivo = ArquivoEstatico(relativo, caminho)
+                for codificacao, extensao in VARIANTES:
+                    if relativo + extensao in caminhos:
+                        arquivo._adicionar(codificacao, caminhos[relativo + extensao])
+                arquivos[relativo] = arquivo
+        self.arquivos = arquivos
+
+    def obter(self, nome: str) -> Optional[ArquivoEstatico]:
+        return self.arquivos.get(nome)
+
+
+def comprimir_pasta(pasta: str, nivel_gzip: int = 9, nivel_brotli: int = 11) -> int:
+    """Gera as variantes .gz (e .br, se o pacote brotli estiver instalado) dos arquivos de texto da pasta
+
+    Retorna a quantidade de variantes escritas. Usado após o build do frontend.
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    escritas = 0
+    for raiz, _, nomes in os.walk(pasta):
+        for nome in nomes:
+            if any(nome.endswith(extensao) for _, extensao in VARIANTES):
+                continue
+            mimetype = mimetypes.guess_type(nome)[0] or ''
+            if not (mimetype.startswith('text/') or mimetype in ('application/javascript', 'application/json', 'image/svg+xml')):
+                continue
+
+            caminho = os.path.join(raiz, nome)
+            with open(caminho, 'rb') as arquivo:
+                conteudo = arquivo.read()
+
+            variantes = [('.gz', gzip.compress(conteudo, compresslevel=nivel_gzip, mtime=0))]
+            if brotli is not None:
+                variantes.append(('.br', brotli.compress(conteudo, quality=nivel_brotli)))
+            for extensao, comprimido in variantes:
+                # Só vale a pena manter a variante se ela for menor que o original
+                if len(comprimido) < len(conteudo):
+                    with open(caminho + extensao, 'wb') as arquivo:
+                        arquivo.write(comprimido)
+                    escritas += 1
+    return escritas
@@ -0,0 +1 @@
+# Módulo de importação de relatórios de anúncios
@@ -0,0 +1,54 @@
+import csv
+import importlib.util
+import io
+from typing import Any, Iterator, Sequence
+
+# Leitura linha a linha dos relatórios exportados (CSV ou XLSX), sem carregar o arquivo inteiro
+
+FORMATOS = ('csv', 'xlsx')
+DELIMITADORES = (',', ';', '\t')
+
+
+def formato_do_arquivo(nome_arquivo: str) -> str:
+    """Deduz o formato pela extensão; levanta ValueError se não for suportado"""
+    extensao = nome_arquivo.rsplit('.', 1)[-1].lower() if '.' in nome_arquivo else ''
+    if extensao not in FORMATOS:
+        raise ValueError(f"Formato de arquivo não suportado. Use: {', '.join(FORMATOS)}")
+    if extensao == 'xlsx' and importlib.util.find_spec('openpyxl') is None:
+        raise ValueError('Importação de XLSX requer o pacote openpyxl')
+    return extensao
+
+
+def _detectar_delimitador(cabecalho: str) -> str:
+    """Escolhe o delimitador mais frequente na linha de cabeçalho"""
+    return max(DELIMITADORES, key=cabecalho.count)
+
+
+def ler_csv(caminho: str) -> Iterator[Sequence[Any]]:
+    """Percorre as linhas do CSV (a primeira é o cabeçalho)"""
+    with open(caminho, 'r', encoding='utf-8-sig', newline='') as arquivo:
+        primeira = arquivo.readline()
+        if not primeira:
+            return
+        delimitador = _detectar_delimitador(primeira)
+        yield next(csv.reader(io.StringIO(primeira), delimiter=delimitador))
+        yield from csv.reader(arquivo, delimiter=delimitador)
+
+
+def ler_xlsx(caminho: str) -> Iterator[Sequence[Any]]:
+    """Percorre as linhas da primeira planilha do XLSX (a primeira é o cabeçalho)"""
+    from openpyxl import load_workbook
+
+    # read_only lê a planilha sob demanda, sem montar o workbook em memória
+    workbook = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def ler_linhas(caminho: str, formato: str) -> Iterator[Sequence[Any]]:
+    """Percorre as linhas do arquivo no formato informado"""
+    if formato == 'xlsx':
+        return ler_xlsx(caminho)
+    return ler_csv(caminho)
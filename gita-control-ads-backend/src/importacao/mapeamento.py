@@ -0,0 +1,158 @@
+import re
+import unicodedata
+from datetime import datetime, date
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.models.lote import ValidadorLinhas
+
+# Métricas reconhecidas nas exportações do Gerenciador de Anúncios (pt-BR e inglês)
+ALIASES_METRICAS = {
+    'nome_anuncio': ('nome do anuncio', 'ad name'),
+    'nome_campanha': ('nome da campanha', 'campaign name'),
+    'objetivo': ('objetivo', 'objective'),
+    'alcance': ('alcance', 'reach'),
+    'engajamento': ('engajamento com a publicacao', 'post engagement'),
+    'valor_gasto': ('valor usado', 'valor gasto', 'amount spent'),
+    'cpm': ('cpm (custo por 1.000 impressoes)', 'cpm (cost per 1,000 impressions)', 'cpm'),
+    'frequencia': ('frequencia', 'frequency'),
+    'thruplay': ('thruplays', 'reproducoes de video com thruplay'),
+    'reproducao_25_pct': ('reproducoes de 25% do video', 'video plays at 25%'),
+    'reproducao_50_pct': ('reproducoes de 50% do video', 'video plays at 50%'),
+    'reproducao_75_pct': ('reproducoes de 75% do video', 'video plays at 75%'),
+    'reproducao_95_pct': ('reproducoes de 95% do video', 'video plays at 95%'),
+    'reproducao_100_pct': ('reproducoes de 100% do video', 'video plays at 100%'),
+    'data_inicio': ('inicio dos relatorios', 'reporting starts'),
+    'data_fim': ('termino dos relatorios', 'reporting ends'),
+}
+
+# Campo de destino de cada métrica, por tabela
+CAMPOS_POR_DESTINO = {
+    'conteudos': {
+        'nome_anuncio': 'identificador',
+        'alcance': 'alcance',
+        'engajamento': 'engajamento',
+        'valor_gasto': 'valor_gasto',
+        'cpm': 'cpm',
+        'frequencia': 'frequencia',
+        'thruplay': 'thruplay',
+        'reproducao_25_pct': 'reproducao_25_pct',
+        'reproducao_50_pct': 'reproducao_50_pct',
+        'reproducao_75_pct': 'reproducao_75_pct',
+        'reproducao_95_pct': 'reproducao_95_pct',
+        'reproducao_100_pct': 'reproducao_100_pct',
+        'data_inicio': 'data_inicio_impulsionamento',
+        'data_fim': 'data_fim_impulsionamento',
+    },
+    'campanhas': {
+        'nome_campanha': 'nome',
+        # As métricas da campanha são totais dos conteúdos associados, calculados no banco
+        'objetivo': 'objetivo',
+        'data_inicio': 'data_inicio',
+        'data_fim': 'data_fim',
+    },
+}
+
+FORMATOS_DATA = ('%Y-%m-%d', '%d/%m/%Y')
+
+
+def normalizar_cabecalho(cabecalho: Any) -> str:
+    """Minúsculas, sem acentos, sem o sufixo de moeda (ex.: "(BRL)") e com espaços simples"""
+    texto = unicodedata.normalize('NFKD', str(cabecalho or ''))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    texto = re.sub(r'\s*\([a-z]{3}\)\s*$', '', texto.strip())
+    return ' '.join(texto.split())
+
+
+def converter_numero(valor: Any, inteiro: bool = False) -> Optional[float]:
+    """Converte números exportados com separador decimal em ponto ou vírgula"""
+    if valor is None or isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return valor
+    if str(valor).strip() in ('', '-'):
+        return None
+    texto = re.sub(r'[^\d,.\-]', '', str(valor))
+
+    if inteiro and re.fullmatch(r'-?\d{1,3}([.,]\d{3})+', texto):
+        texto = texto.replace(',', '').replace('.', '')
+    elif ',' in texto and '.' in texto:
+        # O separador que aparece por último é o decimal
+        milhar = '.' if texto.rfind(',') > texto.rfind('.') else ','
+        texto = texto.replace(milhar, '').replace(',', '.')
+    elif texto.count(',') > 1 or texto.count('.') > 1:
+        texto = texto.replace(',', '').replace('.', '')
+    else:
+        texto = texto.replace(',', '.')
+
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f'valor numérico inválido: {valor}')
+
+
+def converter_data(valor: Any) -> Optional[date]:
+    """Converte datas YYYY-MM-DD, DD/MM/YYYY ou células de data do XLSX"""
+    if valor is None or valor == '':
+        return None
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(str(valor).strip(), formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f'data inválida: {valor}')
+
+
+class MapeamentoColunas:
+    """Associa as colunas do arquivo aos campos da tabela de destino e converte os valores
+
+    Reconhece os nomes das colunas exportadas pelo Gerenciador de Anúncios, os
+    próprios nomes dos campos e um mapeamento personalizado {coluna: campo}.
+    """
+
+    def __init__(self, cabecalhos: Sequence[Any], destino: str, validador: ValidadorLinhas,
+                 personalizado: Optional[Dict[str, str]] = None):
+        self.validador = validador
+        campos_validos = set(validador.colunas)
+
+        aliases = {campo: campo for campo in campos_validos}
+        for metrica, campo in CAMPOS_POR_DESTINO[destino].items():
+            for alias in ALIASES_METRICAS[metrica]:
+                aliases[alias] = campo
+        for coluna, campo in (personalizado or {}).items():
+            if campo not in campos_validos:
+                raise ValueError(f'Campo de destino inválido no mapeamento: {campo}')
+            aliases[normalizar_cabecalho(coluna)] = campo
+
+        # Índice da coluna de cada campo (a primeira ocorrência vence)
+        self.indices: Dict[str, int] = {}
+        for indice, cabecalho in enumerate(cabecalhos):
+            campo = aliases.get(normalizar_cabecalho(cabecalho))
+            if campo and campo not in self.indices:
+                self.indices[campo] = indice
+
+    @property
+    def campos(self) -> List[str]:
+        return list(self.indices)
+
+    def converter(self, valores: Sequence[Any]) -> Dict[str, Any]:
+        """Monta o dicionário de campos da linha; levanta ValueError com o campo problemático"""
+        dados = {}
+        for campo, indice in self.indices.items():
+            valor = valores[indice] if indice < len(valores) else None
+            if isinstance(valor, str):
+                valor = valor.strip()
+            try:
+                if campo in self.validador.inteiros:
+                    valor = converter_numero(valor, inteiro=True)
+                elif campo in self.validador.decimais:
+                    valor = converter_numero(valor)
+                elif campo in self.validador.datas:
+                    valor = converter_data(valor)
+                elif valor is not None:
+                    valor = str(valor) or None
+            except ValueError as e:
+                raise ValueError(f'{campo}: {e}')
+            dados[campo] = valor
+        return dados
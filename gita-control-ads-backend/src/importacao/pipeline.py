@@ -0,0 +1,327 @@
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.importacao.leitores import formato_do_arquivo, ler_linhas
+from src.importacao.mapeamento import MapeamentoColunas
+from src.config.supabase_config import tabela
+from src.models.cache import cache_entidades, cache_janelas
+from src.models.coalescencia import registrar_escrita
+from src.models.campanha import Campanha
+from src.models.conteudo import Conteudo
+from src.models.lote import gravar_por_chave, TAMANHO_LOTE_INSERCAO
+
+# Importações rodam em segundo plano, poucas por vez, fora do pool de consultas
+MAX_IMPORTACOES_SIMULTANEAS = int(os.getenv('MAX_IMPORTACOES_SIMULTANEAS', '2'))
+MAX_IMPORTACOES_REGISTRADAS = 100
+MAX_ERROS_REGISTRADOS = 100
+# Sem atualização do progresso há mais que isso, uma importação em andamento é dada como interrompida
+# (o worker que a executava foi reiniciado ou encerrado)
+PRAZO_IMPORTACAO_PARADA = float(os.getenv('PRAZO_IMPORTACAO_PARADA', '600'))
+TABELA = 'importacoes'
+
+# Tabela de destino: (validador das linhas, chave natural usada no upsert junto com projeto_id)
+DESTINOS = {
+    'conteudos': (Conteudo.VALIDADOR_LOTE, 'identificador'),
+    'campanhas': (Campanha.VALIDADOR_LOTE, 'nome'),
+}
+
+_executores: Dict[int, ThreadPoolExecutor] = {}
+_executores_lock = threading.Lock()
+
+
+def _apos_fork():
+    """No processo filho, recria o lock (pode ter sido copiado travado pelo fork)"""
+    global _executores_lock
+    _executores_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_apos_fork)
+
+
+def obter_executor_importacao() -> ThreadPoolExecutor:
+    """Retorna o pool de threads de importação do worker atual (criado sob demanda)"""
+    pid = os.getpid()
+    executor = _executores.get(pid)
+    if executor is None:
+        with _executores_lock:
+            executor = _executores.get(pid)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=MAX_IMPORTACOES_SIMULTANEAS,
+                    thread_name_prefix='importacao'
+                )
+                _executores[pid] = executor
+    return executor
+
+
+class ProgressoImportacao:
+    """Andamento de uma importação, atualizado a cada lote gravado
+
+    O progresso é gravado na tabela importacoes na criação, a cada lote e no
+    fim, para que qualquer worker responda pela importação.
+    """
+
+    def __init__(self, destino: str, nome_arquivo: str, campos: List[str], projeto_id: str = None):
+        self.id = str(uuid.uuid4())
+        self.projeto_id = projeto_id
+        self.destino = destino
+        self.nome_arquivo = nome_arquivo
+        self.campos = campos
+        self.estado = 'pendente'
+        self.linhas_lidas = 0
+        self.importadas = 0
+        self.com_erro = 0
+        self.lotes = 0
+        self.erros: List[Dict[str, Any]] = []
+        self.mensagem = None
+        self.iniciada_em = datetime.now(timezone.utc)
+        self.concluida_em = None
+        self._lock = threading.Lock()
+
+    def iniciar(self):
+        with self._lock:
+            self.estado = 'processando'
+        self.salvar()
+
+    def contar_linha(self):
+        with self._lock:
+            self.linhas_lidas += 1
+
+    def registrar_erro(self, linha: Any, mensagem: str, quantidade: int = 1):
+        """Conta linhas com erro, guardando só as primeiras mensagens"""
+        with self._lock:
+            self.com_erro += quantidade
+            if len(self.erros) < MAX_ERROS_REGISTRADOS:
+                self.erros.append({'linha': linha, 'error': mensagem})
+
+    def registrar_lote(self, quantidade: int):
+        with self._lock:
+            self.importadas += quantidade
+            self.lotes += 1
+        self.salvar()
+
+    def finalizar(self, estado: str, mensagem: str = None):
+        with self._lock:
+            self.estado = estado
+            self.mensagem = mensagem
+            self.concluida_em = datetime.now(timezone.utc)
+        self.salvar()
+
+    def salvar(self):
+        """Grava o progresso atual na tabela importacoes (falhas só são registradas no log)"""
+        from postgrest.types import ReturnMethod
+
+        try:
+            linha = {**self.to_dict(), 'projeto_id': self.projeto_id}
+            tabela(TABELA).upsert(linha, on_conflict='id', returning=ReturnMethod.minimal).execute()
+        except Exception as e:
+            print(f"Erro ao salvar progresso da importação: {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o progresso para dicionário"""
+        with self._lock:
+            return {
+                'id': self.id,
+                'destino': self.destino,
+                'nome_arquivo': self.nome_arquivo,
+                'campos': self.campos,
+                'estado': self.estado,
+                'linhas_lidas': self.linhas_lidas,
+                'importadas': self.importadas,
+                'com_erro': self.com_erro,
+                'lotes': self.lotes,
+                'erros': list(self.erros),
+                'mensagem': self.mensagem,
+                'iniciada_em': self.iniciada_em.isoformat(),
+                'concluida_em': self.concluida_em.isoformat() if self.concluida_em else None
+            }
+
+
+class RegistroImportacoes:
+    """Importações recentes do worker, para consulta do progresso (as mais antigas são descartadas)"""
+
+    def __init__(self, max_itens: int = MAX_IMPORTACOES_REGISTRADAS):
+        self.max_itens = max_itens
+        self._itens: 'OrderedDict[str, ProgressoImportacao]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def registrar(self, progresso: ProgressoImportacao):
+        with self._lock:
+            self._itens[progresso.id] = progresso
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def obter(self, importacao_id: str) -> Optional[ProgressoImportacao]:
+        with self._lock:
+            return self._itens.get(importacao_id)
+
+
+# Registro global do worker
+registro_importacoes = RegistroImportacoes()
+
+
+def buscar_progresso(importacao_id: str) -> Optional[Dict[str, Any]]:
+    """Progresso de uma importação: o do worker que a executa ou o gravado na tabela importacoes
+
+    Uma importação pendente ou em processamento cujo progresso não é atualizado
+    há mais de PRAZO_IMPORTACAO_PARADA segundos é retornada como interrompida.
+    Levanta ValueError se o id não for um UUID.
+    """
+    progresso = registro_importacoes.obter(str(uuid.UUID(importacao_id)))
+    if progresso:
+        return progresso.to_dict()
+
+    response = tabela(TABELA).select(
+        'id,destino,nome_arquivo,campos,estado,linhas_lidas,importadas,com_erro,lotes,erros,mensagem,'
+        'iniciada_em,concluida_em,data_atualizacao'
+    ).eq('id', importacao_id).execute()
+    if not response.data:
+        return None
+
+    dados = response.data[0]
+    atualizada_em = datetime.fromisoformat(dados.pop('data_atualizacao'))
+    parada = (datetime.now(timezone.utc) - atualizada_em).total_seconds() > PRAZO_IMPORTACAO_PARADA
+    if dados['estado'] in ('pendente', 'processando') and parada:
+        dados['estado'] = 'interrompida'
+        dados['mensagem'] = 'A importação foi interrompida (o worker que a executava foi encerrado); envie o arquivo novamente'
+    return dados
+
+
+class ImportacaoRelatorio:
+    """Importa um relatório exportado linha a linha, com upsert em lotes por (projeto_id, chave natural)
+
+    O cabeçalho é lido e mapeado na criação, para que erros de formato sejam
+    detectados antes de a importação ir para segundo plano.
+    """
+
+    def __init__(self, caminho: str, formato: str, destino: str, projeto_id: str, tipo: str = None,
+                 personalizado: Dict[str, str] = None, tamanho_lote: int = TAMANHO_LOTE_INSERCAO):
+        if destino not in DESTINOS:
+            raise ValueError(f"destino deve ser um de: {', '.join(DESTINOS)}")
+
+        self.destino = destino
+        self.projeto_id = projeto_id
+        self.tamanho_lote = tamanho_lote
+        self.validador, self.chave = DESTINOS[destino]
+        self.tipo = tipo
+
+        if tipo and tipo not in self.validador.tipos_validos:
+            raise ValueError(f"{self.validador.campo_tipo} deve ser um de: {', '.join(self.validador.tipos_validos)}")
+
+        self._linhas: Iterator[Sequence[Any]] = ler_linhas(caminho, formato)
+        try:
+            cabecalhos = next(self._linhas, None)
+            if not cabecalhos:
+                raise ValueError('Arquivo vazio')
+
+            self.mapeamento = MapeamentoColunas(cabecalhos, destino, self.validador, personalizado)
+            if self.chave not in self.mapeamento.indices:
+                raise ValueError(f'Nenhuma coluna do arquivo corresponde a {self.chave}')
+            if self.validador.campo_tipo not in self.mapeamento.indices and not tipo:
+                raise ValueError(f'Informe o tipo ou inclua a coluna {self.validador.campo_tipo}')
+        except Exception:
+            self._linhas.close()
+            raise
+
+    def executar(self, progresso: ProgressoImportacao):
+        """Lê, valida e grava as linhas, atualizando o progresso a cada lote"""
+        campo_tipo = self.validador.campo_tipo
+        # Linhas com a mesma chave no mesmo lote: a última vence (cada chave é gravada uma vez por lote)
+        lote: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        linhas_no_lote = 0
+
+        try:
+            for numero, valores in enumerate(self._linhas, start=2):
+                if not any(valor not in (None, '') for valor in valores):
+                    continue
+                progresso.contar_linha()
+
+                try:
+                    dados = self.mapeamento.converter(valores)
+                except ValueError as e:
+                    progresso.registrar_erro(numero, str(e))
+                    continue
+
+                dados['projeto_id'] = self.projeto_id
+                if not dados.get(campo_tipo):
+                    dados[campo_tipo] = self.tipo
+
+                linha, erros = self.validador.validar(dados, parcial=True)
+                if erros:
+                    progresso.registrar_erro(numero, '; '.join(erros))
+                    continue
+
+                lote[linha[self.chave]] = (numero, linha)
+                linhas_no_lote += 1
+                if len(lote) >= self.tamanho_lote:
+                    self._gravar(lote, linhas_no_lote, progresso)
+                    lote, linhas_no_lote = {}, 0
+        finally:
+            self._linhas.close()
+
+        if lote:
+            self._gravar(lote, linhas_no_lote, progresso)
+
+        # As linhas atualizadas não voltam do upsert, então o cache da tabela é descartado
+        cache_entidades.limpar(self.destino)
+        if self.destino == 'conteudos':
+            # Os totais das campanhas associadas e os agregados diários do projeto são recalculados no banco
+            cache_entidades.limpar('campanhas')
+            cache_janelas.limpar()
+            registrar_escrita('campanhas', 'metricas_projeto_diarias', 'esboco_quantis')
+
+    def _gravar(self, lote: Dict[str, Tuple[int, Dict[str, Any]]], linhas_no_lote: int,
+                progresso: ProgressoImportacao):
+        numeros = [numero for numero, _ in lote.values()]
+        try:
+            ambiguas = gravar_por_chave(self.destino, list(lote.values()), ('projeto_id', self.chave))
+            for numero, mensagem in ambiguas.items():
+                progresso.registrar_erro(numero, mensagem)
+            progresso.registrar_lote(linhas_no_lote - len(ambiguas))
+        except Exception as e:
+            print(f"Erro ao gravar lote da importação: {e}")
+            progresso.registrar_erro(f'{min(numeros)}-{max(numeros)}', str(e), linhas_no_lote)
+            progresso.salvar()
+
+
+def iniciar_importacao(arquivo, destino: str, projeto_id: str, tipo: str = None,
+                       personalizado: Dict[str, str] = None) -> ProgressoImportacao:
+    """Salva o arquivo enviado em disco e agenda a importação em segundo plano
+
+    arquivo deve ter filename e save(caminho), como o FileStorage do Flask.
+    Levanta ValueError se o formato, o cabeçalho ou os parâmetros forem inválidos.
+    """
+    formato = formato_do_arquivo(arquivo.filename or '')
+    descritor, caminho = tempfile.mkstemp(prefix='importacao-', suffix=f'.{formato}')
+    os.close(descritor)
+
+    try:
+        arquivo.save(caminho)
+        importacao = ImportacaoRelatorio(caminho, formato, destino, projeto_id, tipo, personalizado)
+    except Exception:
+        os.remove(caminho)
+        raise
+
+    progresso = ProgressoImportacao(destino, arquivo.filename, importacao.mapeamento.campos, projeto_id)
+    registro_importacoes.registrar(progresso)
+    progresso.salvar()
+    obter_executor_importacao().submit(_executar_importacao, importacao, caminho, progresso)
+    return progresso
+
+
+def _executar_importacao(importacao: ImportacaoRelatorio, caminho: str, progresso: ProgressoImportacao):
+    progresso.iniciar()
+    try:
+        importacao.executar(progresso)
+        progresso.finalizar('concluida')
+    except Exception as e:
+        print(f"Erro ao importar relatório: {e}")
+        progresso.finalizar('falhou', str(e))
+    finally:
+        os.remove(caminho)
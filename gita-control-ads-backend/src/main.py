@@ -3,51 +3,71 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
-from src.models.user import db
-from src.routes.user import user_bp
 from src.routes.projeto import projeto_bp
 from src.routes.conteudo import conteudo_bp
 from src.routes.campanha import campanha_bp
+from src.estaticos import IndiceEstaticos, comprimir_pasta
+from src.compressao import configurar_compressao
+from src.provedor_json import ProvedorJSON
+from src.usuarios import DespachoUsuarios, criar_tabelas
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
+# Serialização JSON com orjson (datas em ISO 8601, Decimal e UUID nativos)
+app.json = ProvedorJSON(app)
+
 # Enable CORS for all routes
 CORS(app)
 
 from src.routes.analytics import analytics_bp
+from src.routes.diagnostico import diagnostico_bp
+from src.routes.importacao import importacao_bp
 
-app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(projeto_bp, url_prefix='/api')
 app.register_blueprint(conteudo_bp, url_prefix='/api')
 app.register_blueprint(campanha_bp, url_prefix='/api')
 app.register_blueprint(analytics_bp, url_prefix='/api')
+app.register_blueprint(diagnostico_bp, url_prefix='/api')
+app.register_blueprint(importacao_bp, url_prefix='/api')
+
+# Compressão gzip/brotli/zstd das respostas da API
+configurar_compressao(app)
+
+# Rotas de usuários (SQLite) carregadas só na primeira requisição a /api/users
+app.wsgi_app = DespachoUsuarios(app.wsgi_app)
+
+@app.cli.command('criar-tabelas')
+def criar_tabelas_comando():
+    """Cria as tabelas do banco SQLite (rodar uma vez na implantação)"""
+    criar_tabelas()
+    print("Tabelas criadas")
+
+# Índice em memória dos arquivos estáticos (com variantes .br/.gz pré-geradas)
+estaticos = IndiceEstaticos(app.static_folder)
 
-# uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-with app.app_context():
-    db.create_all()
+@app.cli.command('comprimir-estaticos')
+def comprimir_estaticos():
+    """Gera as variantes .gz/.br dos arquivos estáticos (rodar após copiar o build do frontend)"""
+    print(f"{comprimir_pasta(app.static_folder)} variantes geradas")
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    if app.static_folder is None:
             return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
+    arquivo = estaticos.obter(path) if path != "" else None
+    if arquivo is None:
+        arquivo = estaticos.obter('index.html')
+        if arquivo is None:
             return "index.html not found", 404
+    return arquivo.responder()
 
 
 if __name__ == '__main__':
+    # Em desenvolvimento as tabelas são criadas na inicialização; em produção use "flask criar-tabelas"
+    criar_tabelas()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+# Configurações do cache de entidades
+CACHE_ENTIDADES_MAX_ITENS = int(os.getenv('CACHE_ENTIDADES_MAX_ITENS', '2000'))
+CACHE_ENTIDADES_TTL = float(os.getenv('CACHE_ENTIDADES_TTL', '30'))
+
+
+class CacheEntidades:
+    """Cache LRU com expiração (TTL) das linhas buscadas por ID, chaveado por (tabela, id)"""
+
+    def __init__(self, max_itens: int = CACHE_ENTIDADES_MAX_ITENS, ttl: float = CACHE_ENTIDADES_TTL):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self._itens: 'OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirados = 0
+        self.descartados = 0
+
+    def obter(self, tabela: str, entidade_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna uma cópia da linha em cache ou None se ausente/expirada"""
+        chave = (tabela, str(entidade_id))
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expira_em, dados = item
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                self.expirados += 1
+                self.misses += 1
+                return None
+
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return dict(dados)
+
+    def definir(self, tabela: str, entidade_id: str, dados: Dict[str, Any]):
+        """Armazena (ou atualiza) a linha de uma entidade"""
+        if self.max_itens <= 0 or self.ttl <= 0:
+            return
+
+        chave = (tabela, str(entidade_id))
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, dict(dados))
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self.descartados += 1
+
+    def invalidar(self, tabela: str, entidade_id: str):
+        """Remove a entidade do cache"""
+        with self._lock:
+            self._itens.pop((tabela, str(entidade_id)), None)
+
+    def limpar(self, tabela: Optional[str] = None):
+        """Remove todas as entradas do cache (ou só as da tabela informada)"""
+        with self._lock:
+            if tabela is None:
+                self._itens.clear()
+                return
+            for chave in [chave for chave in self._itens if chave[0] == tabela]:
+                del self._itens[chave]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna os contadores do cache"""
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                'itens': len(self._itens),
+                'max_itens': self.max_itens,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expirados': self.expirados,
+                'descartados': self.descartados,
+                'taxa_acerto': (self.hits / consultas) if consultas else 0
+            }
+
+
+# Cache global do worker
+cache_entidades = CacheEntidades()
+
+# Métricas por janela de datas (src/analytics/janelas), separadas das linhas por ID:
+# são descartadas inteiras a cada escrita em conteudos sem tirar as entidades do cache
+cache_janelas = CacheEntidades()
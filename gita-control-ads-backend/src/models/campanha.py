@@ -1,45 +1,70 @@
-from datetime import datetime, date
-from typing import Optional, List, Dict, Any
-from src.config.supabase_config import supabase
-
-class Campanha:
-    def __init__(self, id: str = None, projeto_id: str = None, nome: str = None,
-                 tipo_campanha: str = None, objetivo: str = None, engajamento_total: int = None,
-                 custo_por_engajamento: float = None, alcance_total: int = None,
-                 thruplay_total: int = None, frequencia_media: float = None,
-                 valor_gasto_total: float = None, reproducao_25_pct_total: int = None,
-                 reproducao_50_pct_total: int = None, reproducao_75_pct_total: int = None,
-                 reproducao_95_pct_total: int = None, reproducao_100_pct_total: int = None,
-                 data_inicio: date = None, data_fim: date = None,
-                 data_criacao: datetime = None, data_atualizacao: datetime = None,
-                 ativo: bool = True):
-        self.id = id
-        self.projeto_id = projeto_id
-        self.nome = nome
-        self.tipo_campanha = tipo_campanha
-        self.objetivo = objetivo
-        self.engajamento_total = engajamento_total
-        self.custo_por_engajamento = custo_por_engajamento
-        self.alcance_total = alcance_total
-        self.thruplay_total = thruplay_total
-        self.frequencia_media = frequencia_media
-        self.valor_gasto_total = valor_gasto_total
-        self.reproducao_25_pct_total = reproducao_25_pct_total
-        self.reproducao_50_pct_total = reproducao_50_pct_total
-        self.reproducao_75_pct_total = reproducao_75_pct_total
-        self.reproducao_95_pct_total = reproducao_95_pct_total
-        self.reproducao_100_pct_total = reproducao_100_pct_total
-        self.data_inicio = data_inicio
-        self.data_fim = data_fim
-        self.data_criacao = data_criacao
-        self.data_atualizacao = data_atualizacao
-        self.ativo = ativo
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from src.config.supabase_config import tabela
+from src.models.cache import cache_entidades
+from src.models.coalescencia import executar_consulta, registrar_escrita
+from src.models.campos import projecao
+from src.models.esquema import Esquema, Registro, TEXTO, INTEIRO, DECIMAL, DATA, DATA_HORA, BOOLEANO, converter_data_hora
+from src.models.lote import criar_em_lote, TAMANHO_LOTE_INSERCAO
+from src.models.paginacao import buscar_pagina, iterar_linhas, LIMITE_PADRAO, TAMANHO_PAGINA_ITERACAO
+
+# Situações que contam como sucesso nas operações em lote de associação
+SITUACOES_ASSOCIACAO_OK = ('associado', 'ja_associado', 'mantido', 'desassociado', 'nao_associado')
+
+
+def _separar_ids(conteudo_ids: List[str]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Remove ids duplicados e separa os que não são UUIDs (retorna ids válidos, resultados dos inválidos)"""
+    validos, invalidos = [], []
+    for conteudo_id in dict.fromkeys(conteudo_ids):
+        try:
+            validos.append(str(uuid.UUID(str(conteudo_id))))
+        except ValueError:
+            invalidos.append({'conteudo_id': conteudo_id, 'situacao': 'id_invalido'})
+    return validos, invalidos
+
+
+# Totais calculados por trigger a partir dos conteúdos associados: somente leitura,
+# uma requisição que os envia é recusada em vez de tê-los descartados
+TOTAIS_CALCULADOS = (
+    'engajamento_total', 'custo_por_engajamento', 'alcance_total', 'thruplay_total',
+    'frequencia_media', 'valor_gasto_total', 'reproducao_25_pct_total', 'reproducao_50_pct_total',
+    'reproducao_75_pct_total', 'reproducao_95_pct_total', 'reproducao_100_pct_total'
+)
+
+
+class Campanha(Registro):
+    ESQUEMA = Esquema(
+        ('id', TEXTO), ('projeto_id', TEXTO), ('nome', TEXTO), ('tipo_campanha', TEXTO), ('objetivo', TEXTO),
+        ('engajamento_total', INTEIRO), ('custo_por_engajamento', DECIMAL), ('alcance_total', INTEIRO),
+        ('thruplay_total', INTEIRO), ('frequencia_media', DECIMAL), ('valor_gasto_total', DECIMAL),
+        ('reproducao_25_pct_total', INTEIRO), ('reproducao_50_pct_total', INTEIRO),
+        ('reproducao_75_pct_total', INTEIRO), ('reproducao_95_pct_total', INTEIRO),
+        ('reproducao_100_pct_total', INTEIRO),
+        ('data_inicio', DATA), ('data_fim', DATA),
+        ('data_criacao', DATA_HORA), ('data_atualizacao', DATA_HORA), ('ativo', BOOLEANO),
+        somente_leitura=TOTAIS_CALCULADOS
+    )
+    __slots__ = ESQUEMA.nomes
+
+    # Colunas da tabela (usadas na projeção de campos)
+    CAMPOS = ESQUEMA.nomes
+    CAMPOS_ATUALIZAVEIS = tuple(campo for campo in ESQUEMA.editaveis if campo != 'projeto_id')
+
+    # Validação das linhas na criação em lote
+    VALIDADOR_LOTE = ESQUEMA.validador(
+        obrigatorios=('projeto_id', 'nome', 'tipo_campanha'),
+        campo_tipo='tipo_campanha',
+        tipos_validos=('C2', 'C3', 'C4'),
+        recusados=TOTAIS_CALCULADOS
+    )
 
     @classmethod
     def criar(cls, projeto_id: str, nome: str, tipo_campanha: str, objetivo: str = None, **kwargs) -> 'Campanha':
         """Cria uma nova campanha no Supabase"""
         try:
             data = {
+                **cls.ESQUEMA.dados_gravacao(kwargs),
                 'projeto_id': projeto_id,
                 'nome': nome,
                 'tipo_campanha': tipo_campanha,
@@ -47,23 +72,12 @@ class Campanha:
                 'ativo': True
             }
             
-            # Adiciona campos opcionais
-            campos_opcionais = [
-                'engajamento_total', 'custo_por_engajamento', 'alcance_total',
-                'thruplay_total', 'frequencia_media', 'valor_gasto_total',
-                'reproducao_25_pct_total', 'reproducao_50_pct_total',
-                'reproducao_75_pct_total', 'reproducao_95_pct_total',
-                'reproducao_100_pct_total', 'data_inicio', 'data_fim'
-            ]
-            
-            for campo in campos_opcionais:
-                if campo in kwargs and kwargs[campo] is not None:
-                    data[campo] = kwargs[campo]
-            
-            response = supabase.table('campanhas').insert(data).execute()
+            response = tabela('campanhas').insert(data).execute()
+            registrar_escrita('campanhas')
             
             if response.data:
                 campanha_data = response.data[0]
+                cache_entidades.definir('campanhas', campanha_data['id'], campanha_data)
                 return cls._from_dict(campanha_data)
             return None
         except Exception as e:
@@ -71,33 +85,114 @@ class Campanha:
             return None
 
     @classmethod
-    def buscar_por_id(cls, campanha_id: str) -> Optional['Campanha']:
-        """Busca uma campanha pelo ID"""
+    def criar_em_lote(cls, registros: List[Dict[str, Any]],
+                      tamanho_lote: int = TAMANHO_LOTE_INSERCAO) -> List[Dict[str, Any]]:
+        """Cria várias campanhas com inserções multi-linha; retorna um resultado por registro"""
+        resultados = criar_em_lote('campanhas', cls.VALIDADOR_LOTE, registros, tamanho_lote)
+        for resultado in resultados:
+            if resultado['success']:
+                resultado['data'] = cls._from_dict(resultado['data'])
+        return resultados
+
+    @classmethod
+    def buscar_por_id(cls, campanha_id: str, usar_cache: bool = True,
+                      campos: List[str] = None) -> Optional['Campanha']:
+        """Busca uma campanha pelo ID, consultando antes o cache de entidades"""
         try:
-            response = supabase.table('campanhas').select('*').eq('id', campanha_id).eq('ativo', True).execute()
+            if usar_cache:
+                campanha_data = cache_entidades.obter('campanhas', campanha_id)
+                if campanha_data is not None:
+                    return cls._from_dict(campanha_data, campos)
+            
+            response = executar_consulta(tabela('campanhas').select(projecao(campos)).eq('id', campanha_id).eq('ativo', True))
             
             if response.data:
-                return cls._from_dict(response.data[0])
+                if not campos:
+                    cache_entidades.definir('campanhas', campanha_id, response.data[0])
+                return cls._from_dict(response.data[0], campos)
             return None
         except Exception as e:
             print(f"Erro ao buscar campanha: {e}")
             return None
 
     @classmethod
-    def listar_por_projeto(cls, projeto_id: str, tipo_campanha: str = None) -> List['Campanha']:
-        """Lista campanhas por projeto, opcionalmente filtrado por tipo"""
+    def versao(cls, campanha_id: str, usar_cache: bool = True) -> Optional[datetime]:
+        """Retorna a data_atualizacao da campanha (usada na ETag), sem carregar a linha inteira"""
         try:
-            query = supabase.table('campanhas').select('*').eq('projeto_id', projeto_id).eq('ativo', True)
-            
-            if tipo_campanha:
-                query = query.eq('tipo_campanha', tipo_campanha)
+            if usar_cache:
+                campanha_data = cache_entidades.obter('campanhas', campanha_id)
+                if campanha_data is not None:
+                    return converter_data_hora(campanha_data.get('data_atualizacao'))
             
-            response = query.order('data_criacao', desc=True).execute()
+            response = executar_consulta(tabela('campanhas').select('id,data_atualizacao').eq('id', campanha_id).eq('ativo', True))
             
-            campanhas = []
-            for campanha_data in response.data:
-                campanhas.append(cls._from_dict(campanha_data))
-            return campanhas
+            if response.data:
+                return converter_data_hora(response.data[0]['data_atualizacao'])
+            return None
+        except Exception as e:
+            print(f"Erro ao buscar versão da campanha: {e}")
+            return None
+
+    @classmethod
+    def _query_por_projeto(cls, projeto_id: str, tipo_campanha: str = None, campos: List[str] = None):
+        """Monta a query das campanhas ativas do projeto"""
+        query = tabela('campanhas').select(projecao(campos, ('id', 'data_criacao', 'data_atualizacao'))).eq('projeto_id', projeto_id).eq('ativo', True)
+        
+        if tipo_campanha:
+            query = query.eq('tipo_campanha', tipo_campanha)
+        return query
+
+    @classmethod
+    def listar_pagina(cls, projeto_id: str, tipo_campanha: str = None, limite: int = LIMITE_PADRAO,
+                      cursor: str = None, campos: List[str] = None) -> Tuple[List['Campanha'], Optional[str]]:
+        """Lista uma página de campanhas do projeto e retorna o cursor da próxima página"""
+        try:
+            linhas, proximo_cursor = buscar_pagina(cls._query_por_projeto(projeto_id, tipo_campanha, campos), limite, cursor)
+            return [cls._from_dict(campanha_data, campos) for campanha_data in linhas], proximo_cursor
+        except Exception as e:
+            print(f"Erro ao listar página de campanhas: {e}")
+            return [], None
+
+    @classmethod
+    def versao_pagina(cls, projeto_id: str, tipo_campanha: str = None, limite: int = LIMITE_PADRAO,
+                      cursor: str = None) -> Optional[Tuple[List[Tuple[str, datetime]], Optional[str]]]:
+        """Retorna (id, data_atualizacao) das linhas da página e o próximo cursor, sem montar os modelos"""
+        try:
+            linhas, proximo_cursor = buscar_pagina(cls._query_por_projeto(projeto_id, tipo_campanha, ['data_atualizacao']), limite, cursor)
+            return [(linha['id'], converter_data_hora(linha['data_atualizacao'])) for linha in linhas], proximo_cursor
+        except Exception as e:
+            print(f"Erro ao buscar versão da página de campanhas: {e}")
+            return None
+
+    @classmethod
+    def versao_projeto(cls, projeto_id: str) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retorna (quantidade, maior data_atualizacao) das campanhas ativas do projeto numa consulta de uma linha"""
+        try:
+            from postgrest.types import CountMethod
+
+            response = (tabela('campanhas').select('data_atualizacao', count=CountMethod.exact)
+                        .eq('projeto_id', projeto_id).eq('ativo', True)
+                        .order('data_atualizacao', desc=True, nullsfirst=False).limit(1))
+            response = executar_consulta(response)
+            return response.count, (converter_data_hora(response.data[0]['data_atualizacao']) if response.data else None)
+        except Exception as e:
+            print(f"Erro ao buscar versão das campanhas do projeto: {e}")
+            return None
+
+    @classmethod
+    def iterar_por_projeto(cls, projeto_id: str, tipo_campanha: str = None,
+                           tamanho_pagina: int = TAMANHO_PAGINA_ITERACAO,
+                           campos: List[str] = None, cursor: str = None) -> Iterator['Campanha']:
+        """Percorre todas as campanhas do projeto (a partir do cursor, se informado), buscando uma página por vez"""
+        for campanha_data in iterar_linhas(lambda: cls._query_por_projeto(projeto_id, tipo_campanha, campos), tamanho_pagina, cursor):
+            yield cls._from_dict(campanha_data, campos)
+
+    @classmethod
+    def listar_por_projeto(cls, projeto_id: str, tipo_campanha: str = None,
+                           campos: List[str] = None) -> List['Campanha']:
+        """Lista campanhas por projeto, opcionalmente filtrado por tipo"""
+        try:
+            return list(cls.iterar_por_projeto(projeto_id, tipo_campanha, campos=campos))
         except Exception as e:
             print(f"Erro ao listar campanhas: {e}")
             return []
@@ -110,7 +205,10 @@ class Campanha:
                 'conteudo_id': conteudo_id
             }
             
-            response = supabase.table('campanha_conteudos').insert(data).execute()
+            response = tabela('campanha_conteudos').insert(data).execute()
+            registrar_escrita('campanha_conteudos', 'campanhas')
+            # Os totais da campanha são recalculados no banco a cada associação
+            cache_entidades.invalidar('campanhas', self.id)
             return len(response.data) > 0
         except Exception as e:
             print(f"Erro ao associar conteúdo à campanha: {e}")
@@ -119,16 +217,95 @@ class Campanha:
     def desassociar_conteudo(self, conteudo_id: str) -> bool:
         """Remove a associação de um conteúdo da campanha"""
         try:
-            response = supabase.table('campanha_conteudos').delete().eq('campanha_id', self.id).eq('conteudo_id', conteudo_id).execute()
+            response = tabela('campanha_conteudos').delete().eq('campanha_id', self.id).eq('conteudo_id', conteudo_id).execute()
+            registrar_escrita('campanha_conteudos', 'campanhas')
+            cache_entidades.invalidar('campanhas', self.id)
             return len(response.data) > 0
         except Exception as e:
             print(f"Erro ao desassociar conteúdo da campanha: {e}")
             return False
 
+    def _conteudos_do_projeto(self, conteudo_ids: List[str]) -> set:
+        """Filtra, numa única consulta, os conteúdos ativos que pertencem ao projeto da campanha"""
+        query = tabela('conteudos').select('id').in_('id', conteudo_ids).eq('ativo', True)
+        if self.projeto_id:
+            query = query.eq('projeto_id', self.projeto_id)
+        return {linha['id'] for linha in query.execute().data}
+
+    def associar_conteudos(self, conteudo_ids: List[str]) -> List[Dict[str, Any]]:
+        """Associa vários conteúdos com uma inserção multi-linha; retorna a situação de cada id"""
+        ids, resultados = _separar_ids(conteudo_ids)
+        if not ids:
+            return resultados
+        try:
+            existentes = self._conteudos_do_projeto(ids)
+            inseridos = set()
+            if existentes:
+                # Associações já existentes são ignoradas pelo índice único (campanha_id, conteudo_id)
+                response = tabela('campanha_conteudos').upsert(
+                    [{'campanha_id': self.id, 'conteudo_id': conteudo_id} for conteudo_id in ids if conteudo_id in existentes],
+                    on_conflict='campanha_id,conteudo_id',
+                    ignore_duplicates=True
+                ).execute()
+                registrar_escrita('campanha_conteudos', 'campanhas')
+                inseridos = {linha['conteudo_id'] for linha in response.data}
+                cache_entidades.invalidar('campanhas', self.id)
+
+            for conteudo_id in ids:
+                if conteudo_id in inseridos:
+                    situacao = 'associado'
+                elif conteudo_id in existentes:
+                    situacao = 'ja_associado'
+                else:
+                    situacao = 'nao_encontrado'
+                resultados.append({'conteudo_id': conteudo_id, 'situacao': situacao})
+            return resultados
+        except Exception as e:
+            print(f"Erro ao associar conteúdos à campanha: {e}")
+            return resultados + [{'conteudo_id': conteudo_id, 'situacao': 'erro', 'error': str(e)} for conteudo_id in ids]
+
+    def desassociar_conteudos(self, conteudo_ids: List[str]) -> List[Dict[str, Any]]:
+        """Remove várias associações com um único delete; retorna a situação de cada id"""
+        ids, resultados = _separar_ids(conteudo_ids)
+        if not ids:
+            return resultados
+        try:
+            response = tabela('campanha_conteudos').delete().eq('campanha_id', self.id).in_('conteudo_id', ids).execute()
+            registrar_escrita('campanha_conteudos', 'campanhas')
+            removidos = {linha['conteudo_id'] for linha in response.data}
+            cache_entidades.invalidar('campanhas', self.id)
+            return resultados + [
+                {'conteudo_id': conteudo_id, 'situacao': 'desassociado' if conteudo_id in removidos else 'nao_associado'}
+                for conteudo_id in ids
+            ]
+        except Exception as e:
+            print(f"Erro ao desassociar conteúdos da campanha: {e}")
+            return resultados + [{'conteudo_id': conteudo_id, 'situacao': 'erro', 'error': str(e)} for conteudo_id in ids]
+
+    def substituir_conteudos(self, conteudo_ids: List[str]) -> List[Dict[str, Any]]:
+        """Faz o conjunto de conteúdos da campanha ser exatamente o informado (aplica só a diferença)"""
+        ids, resultados = _separar_ids(conteudo_ids)
+        try:
+            response = tabela('campanha_conteudos').select('conteudo_id').eq('campanha_id', self.id).execute()
+            atuais = {linha['conteudo_id'] for linha in response.data}
+        except Exception as e:
+            print(f"Erro ao listar associações da campanha: {e}")
+            return resultados + [{'conteudo_id': conteudo_id, 'situacao': 'erro', 'error': str(e)} for conteudo_id in ids]
+
+        novos = set(ids)
+        resultados += [{'conteudo_id': conteudo_id, 'situacao': 'mantido'} for conteudo_id in ids if conteudo_id in atuais]
+        adicionar = [conteudo_id for conteudo_id in ids if conteudo_id not in atuais]
+        remover = [conteudo_id for conteudo_id in atuais if conteudo_id not in novos]
+        if adicionar:
+            resultados += self.associar_conteudos(adicionar)
+        if remover:
+            resultados += self.desassociar_conteudos(remover)
+        return resultados
+
     def listar_conteudos(self) -> List[Dict[str, Any]]:
         """Lista todos os conteúdos associados à campanha"""
         try:
-            response = supabase.table('campanha_conteudos').select('''
+            response = tabela('campanha_conteudos').select('''
                 conteudo_id,
                 conteudos (
                     id,
@@ -150,27 +327,41 @@ class Campanha:
             print(f"Erro ao listar conteúdos da campanha: {e}")
             return []
 
+    @classmethod
+    def atualizar_por_id(cls, campanha_id: str, **kwargs) -> Optional['Campanha']:
+        """Atualiza a campanha ativa numa única requisição e retorna a linha gravada
+
+        Retorna None se não houver campanha ativa com o ID. Erros do Supabase são
+        propagados, para a rota distinguir "não encontrada" (404) de falha (500).
+        """
+        data = cls.ESQUEMA.dados_gravacao(kwargs, cls.CAMPOS_ATUALIZAVEIS)
+        if not data:
+            return cls.buscar_por_id(campanha_id)
+
+        response = tabela('campanhas').update(data).eq('id', campanha_id).eq('ativo', True).execute()
+        registrar_escrita('campanhas')
+        if not response.data:
+            cache_entidades.invalidar('campanhas', campanha_id)
+            return None
+        cache_entidades.definir('campanhas', campanha_id, response.data[0])
+        return cls._from_dict(response.data[0])
+
+    @classmethod
+    def deletar_por_id(cls, campanha_id: str) -> bool:
+        """Marca a campanha ativa como inativa numa única requisição (False se não houver campanha ativa)"""
+        response = tabela('campanhas').update({'ativo': False}).eq('id', campanha_id).eq('ativo', True).execute()
+        registrar_escrita('campanhas')
+        cache_entidades.invalidar('campanhas', campanha_id)
+        return len(response.data) > 0
+
     def atualizar(self, **kwargs) -> bool:
         """Atualiza os dados da campanha"""
         try:
-            data = {}
-            campos_atualizaveis = [
-                'nome', 'tipo_campanha', 'objetivo', 'engajamento_total',
-                'custo_por_engajamento', 'alcance_total', 'thruplay_total',
-                'frequencia_media', 'valor_gasto_total', 'reproducao_25_pct_total',
-                'reproducao_50_pct_total', 'reproducao_75_pct_total',
-                'reproducao_95_pct_total', 'reproducao_100_pct_total',
-                'data_inicio', 'data_fim'
-            ]
-            
-            for campo in campos_atualizaveis:
-                if campo in kwargs and kwargs[campo] is not None:
-                    data[campo] = kwargs[campo]
-                    setattr(self, campo, kwargs[campo])
-            
-            if data:
-                response = supabase.table('campanhas').update(data).eq('id', self.id).execute()
-                return len(response.data) > 0
+            atualizada = self.atualizar_por_id(self.id, **kwargs)
+            if atualizada is None:
+                return False
+            for campo in self.CAMPOS:
+                setattr(self, campo, getattr(atualizada, campo))
             return True
         except Exception as e:
             print(f"Erro ao atualizar campanha: {e}")
@@ -179,65 +370,10 @@ class Campanha:
     def deletar(self) -> bool:
         """Marca a campanha como inativa (soft delete)"""
         try:
-            response = supabase.table('campanhas').update({'ativo': False}).eq('id', self.id).execute()
-            if len(response.data) > 0:
+            if self.deletar_por_id(self.id):
                 self.ativo = False
                 return True
             return False
         except Exception as e:
             print(f"Erro ao deletar campanha: {e}")
             return False
-
-    @classmethod
-    def _from_dict(cls, data: Dict[str, Any]) -> 'Campanha':
-        """Cria uma instância de Campanha a partir de um dicionário"""
-        return cls(
-            id=data.get('id'),
-            projeto_id=data.get('projeto_id'),
-            nome=data.get('nome'),
-            tipo_campanha=data.get('tipo_campanha'),
-            objetivo=data.get('objetivo'),
-            engajamento_total=data.get('engajamento_total'),
-            custo_por_engajamento=data.get('custo_por_engajamento'),
-            alcance_total=data.get('alcance_total'),
-            thruplay_total=data.get('thruplay_total'),
-            frequencia_media=data.get('frequencia_media'),
-            valor_gasto_total=data.get('valor_gasto_total'),
-            reproducao_25_pct_total=data.get('reproducao_25_pct_total'),
-            reproducao_50_pct_total=data.get('reproducao_50_pct_total'),
-            reproducao_75_pct_total=data.get('reproducao_75_pct_total'),
-            reproducao_95_pct_total=data.get('reproducao_95_pct_total'),
-            reproducao_100_pct_total=data.get('reproducao_100_pct_total'),
-            data_inicio=data.get('data_inicio'),
-            data_fim=data.get('data_fim'),
-            data_criacao=data.get('data_criacao'),
-            data_atualizacao=data.get('data_atualizacao'),
-            ativo=data.get('ativo', True)
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Converte a campanha para dicionário"""
-        return {
-            'id': self.id,
-            'projeto_id': self.projeto_id,
-            'nome': self.nome,
-            'tipo_campanha': self.tipo_campanha,
-            'objetivo': self.objetivo,
-            'engajamento_total': self.engajamento_total,
-            'custo_por_engajamento': self.custo_por_engajamento,
-            'alcance_total': self.alcance_total,
-            'thruplay_total': self.thruplay_total,
-            'frequencia_media': self.frequencia_media,
-            'valor_gasto_total': self.valor_gasto_total,
-            'reproducao_25_pct_total': self.reproducao_25_pct_total,
-            'reproducao_50_pct_total': self.reproducao_50_pct_total,
-            'reproducao_75_pct_total': self.reproducao_75_pct_total,
-            'reproducao_95_pct_total': self.reproducao_95_pct_total,
-            'reproducao_100_pct_total': self.reproducao_100_pct_total,
-            'data_inicio': self.data_inicio.isoformat() if self.data_inicio else None,
-            'data_fim': self.data_fim.isoformat() if self.data_fim else None,
-            'data_criacao': self.data_criacao.isoformat() if self.data_criacao else None,
-            'data_atualizacao': self.data_atualizacao.isoformat() if self.data_atualizacao else None,
-            'ativo': self.ativo
-        }
-
@@ -0,0 +1,22 @@
+from typing import Iterable, List, Optional, Sequence
+
+# Projeção de colunas (sparse fieldsets) para as queries do PostgREST
+
+
+def validar_campos(campos: Iterable[str], permitidos: Sequence[str]) -> List[str]:
+    """Remove duplicados e valida os campos pedidos; levanta ValueError para campos desconhecidos"""
+    campos = list(dict.fromkeys(c.strip() for c in campos if c and c.strip()))
+    invalidos = [c for c in campos if c not in permitidos]
+    if invalidos:
+        raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+    return campos
+
+
+def projecao(campos: Optional[Iterable[str]], obrigatorios: Sequence[str] = ('id', 'data_atualizacao')) -> str:
+    """Monta a lista de colunas do select; sem campos, seleciona todas
+
+    data_atualizacao vai junto por padrão porque compõe a ETag das respostas.
+    """
+    if not campos:
+        return '*'
+    return ','.join(dict.fromkeys([*obrigatorios, *campos]))
@@ -0,0 +1,120 @@
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from src.config.supabase_config import timeout_atual
+
+# Coalescência (single-flight) de leituras idênticas em andamento no worker
+COALESCENCIA_ATIVA = os.getenv('COALESCENCIA_ATIVA', '1') == '1'
+
+
+class _Consulta:
+    """Uma leitura em andamento e o resultado (ou erro) compartilhado com quem esperou por ela"""
+
+    __slots__ = ('concluida', 'resposta', 'erro', 'seguidores')
+
+    def __init__(self):
+        self.concluida = threading.Event()
+        self.resposta = None
+        self.erro: Optional[BaseException] = None
+        self.seguidores = 0
+
+
+class ConsultasEmAndamento:
+    """Chamadas concorrentes com a mesma chave (tabela, filtros, projeção) compartilham uma única ida ao banco
+
+    Nada é guardado depois que a consulta termina: quem chega depois dispara
+    uma nova leitura, então não há dados mais velhos que a própria consulta.
+    Escritas descartam as consultas em andamento da tabela (esquecer), para
+    que leituras posteriores não recebam o resultado de antes da escrita.
+    """
+
+    def __init__(self):
+        self._consultas: Dict[Hashable, _Consulta] = {}
+        self._lock = threading.Lock()
+        self.executadas = 0
+        self.compartilhadas = 0
+        self.timeouts = 0
+
+    def executar(self, chave: Hashable, funcao, prazo: Optional[float] = None) -> Any:
+        """Executa funcao ou aguarda a execução em andamento com a mesma chave
+
+        Quem aguarda espera no máximo prazo segundos (padrão: o timeout da
+        chamada atual ao Supabase) e recebe TimeoutError ao estourar. O
+        resultado é o mesmo objeto para todos e deve ser tratado como somente leitura.
+        """
+        with self._lock:
+            consulta = self._consultas.get(chave)
+            if consulta is None:
+                consulta = self._consultas[chave] = _Consulta()
+                lider = True
+                self.executadas += 1
+            else:
+                consulta.seguidores += 1
+                lider = False
+                self.compartilhadas += 1
+
+        if lider:
+            try:
+                consulta.resposta = funcao()
+                return consulta.resposta
+            except BaseException as e:
+                consulta.erro = e
+                raise
+            finally:
+                with self._lock:
+                    if self._consultas.get(chave) is consulta:
+                        del self._consultas[chave]
+                consulta.concluida.set()
+
+        if not consulta.concluida.wait(timeout_atual() if prazo is None else prazo):
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f'prazo esgotado aguardando consulta em andamento em {chave[0]}')
+        if consulta.erro is not None:
+            raise consulta.erro
+        return consulta.resposta
+
+    def esquecer(self, tabela: str):
+        """Desvincula as consultas em andamento da tabela: novas chamadas disparam outra leitura"""
+        with self._lock:
+            for chave in [chave for chave in self._consultas if chave[0] == tabela]:
+                del self._consultas[chave]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna os contadores de coalescência"""
+        with self._lock:
+            return {
+                'ativa': COALESCENCIA_ATIVA,
+                'em_andamento': len(self._consultas),
+                'executadas': self.executadas,
+                'compartilhadas': self.compartilhadas,
+                'timeouts': self.timeouts
+            }
+
+
+# Registro global do worker
+consultas_em_andamento = ConsultasEmAndamento()
+
+
+def chave_da_consulta(query) -> Optional[Tuple[str, str, str, str]]:
+    """Chave (tabela, caminho, parâmetros, Prefer) de uma leitura do PostgREST; None se não for um GET"""
+    requisicao = getattr(query, 'request', None)
+    if requisicao is None or getattr(requisicao.http_method, 'value', requisicao.http_method) != 'GET':
+        return None
+    caminho = str(requisicao.path)
+    return (caminho.rsplit('/', 1)[-1], caminho, str(requisicao.params), requisicao.headers.get('prefer', ''))
+
+
+def executar_consulta(query, prazo: Optional[float] = None):
+    """Executa uma leitura, compartilhando a ida ao banco com chamadas idênticas em andamento"""
+    chave = chave_da_consulta(query) if COALESCENCIA_ATIVA else None
+    if chave is None:
+        return query.execute()
+    return consultas_em_andamento.executar(chave, query.execute, prazo)
+
+
+def registrar_escrita(*tabelas: str):
+    """Chamado após escrever nas tabelas: leituras seguintes não aproveitam consultas iniciadas antes"""
+    for tabela in tabelas:
+        consultas_em_andamento.esquecer(tabela)
@@ -0,0 +1,121 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FuturoTimeout
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from src.config.supabase_config import tempo_limite
+
+# Pool de threads para consultas independentes ao Supabase
+MAX_CONSULTAS_PARALELAS = int(os.getenv('MAX_CONSULTAS_PARALELAS', '8'))
+PRAZO_CONSULTAS_PARALELAS = float(os.getenv('PRAZO_CONSULTAS_PARALELAS', '15'))
+
+# Erros tratados como timeout (504): prazo do grupo esgotado ou timeout da chamada HTTP ao Supabase
+ERROS_DE_TIMEOUT = (TimeoutError, httpx.TimeoutException)
+
+_executores: Dict[int, ThreadPoolExecutor] = {}
+_executores_lock = threading.Lock()
+
+
+def _apos_fork():
+    """No processo filho, recria o lock (pode ter sido copiado travado pelo fork)"""
+    global _executores_lock
+    _executores_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_apos_fork)
+
+
+def obter_executor() -> ThreadPoolExecutor:
+    """Retorna o pool de threads do worker atual (criado sob demanda)"""
+    pid = os.getpid()
+    executor = _executores.get(pid)
+    if executor is None:
+        with _executores_lock:
+            executor = _executores.get(pid)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=MAX_CONSULTAS_PARALELAS,
+                    thread_name_prefix='consultas'
+                )
+                _executores[pid] = executor
+    return executor
+
+
+class ErroConsultasParalelas(Exception):
+    """Agrega os erros das tarefas de um GrupoConsultas"""
+
+    def __init__(self, erros: Dict[str, BaseException]):
+        self.erros = erros
+        detalhes = '; '.join(f'{chave}: {erro}' for chave, erro in erros.items())
+        super().__init__(f'Falha em {len(erros)} consulta(s): {detalhes}')
+
+    @property
+    def somente_timeouts(self) -> bool:
+        return all(isinstance(erro, ERROS_DE_TIMEOUT) for erro in self.erros.values())
+
+
+class GrupoConsultas:
+    """Tarefas iniciadas juntas no pool, com prazo compartilhado e cancelamento
+
+    Cada tarefa roda com o timeout das chamadas ao Supabase limitado ao prazo
+    restante, então uma tarefa abandonada não segura a thread além do prazo.
+    """
+
+    def __init__(self, tarefas: Dict[str, Callable[[], Any]], prazo: Optional[float] = PRAZO_CONSULTAS_PARALELAS):
+        self._limite = time.monotonic() + prazo if prazo else None
+        executor = obter_executor()
+        self._futuros: Dict[str, Future] = {
+            chave: executor.submit(contextvars.copy_context().run, self._com_prazo, tarefa)
+            for chave, tarefa in tarefas.items()
+        }
+
+    def _restante(self) -> Optional[float]:
+        if self._limite is None:
+            return None
+        return max(0.0, self._limite - time.monotonic())
+
+    def _com_prazo(self, tarefa: Callable[[], Any]) -> Any:
+        restante = self._restante()
+        if restante is None:
+            return tarefa()
+        if restante <= 0:
+            raise TimeoutError('prazo esgotado antes do início da consulta')
+        with tempo_limite(restante):
+            return tarefa()
+
+    def resultado(self, chave: str) -> Any:
+        """Aguarda o resultado de uma tarefa dentro do prazo (levanta TimeoutError ao estourar)"""
+        futuro = self._futuros[chave]
+        try:
+            return futuro.result(timeout=self._restante())
+        except FuturoTimeout:
+            futuro.cancel()
+            raise TimeoutError(f'prazo esgotado aguardando {chave}')
+
+    def cancelar(self):
+        """Cancela as tarefas que ainda não começaram e abandona as que estão em execução"""
+        for futuro in self._futuros.values():
+            futuro.cancel()
+
+    def resultados(self) -> Dict[str, Any]:
+        """Aguarda todas as tarefas; levanta ErroConsultasParalelas com todos os erros encontrados"""
+        resultados, erros = {}, {}
+        for chave in self._futuros:
+            try:
+                resultados[chave] = self.resultado(chave)
+            except Exception as e:
+                erros[chave] = e
+        if erros:
+            self.cancelar()
+            raise ErroConsultasParalelas(erros)
+        return resultados
+
+
+def executar_em_paralelo(tarefas: Dict[str, Callable[[], Any]],
+                         prazo: Optional[float] = PRAZO_CONSULTAS_PARALELAS) -> Dict[str, Any]:
+    """Executa as tarefas concorrentemente e retorna os resultados pela mesma chave"""
+    return GrupoConsultas(tarefas, prazo).resultados()
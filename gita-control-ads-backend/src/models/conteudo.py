@@ -1,166 +1,295 @@
-from datetime import datetime, date
-from typing import Optional, List, Dict, Any
-from src.config.supabase_config import supabase
-
-class Conteudo:
-    def __init__(self, id: str = None, projeto_id: str = None, identificador: str = None,
-                 tipo_conteudo: str = None, alcance: int = None, engajamento: int = None,
-                 valor_gasto: float = None, cpm: float = None, seguidores_antes: int = None,
-                 seguidores_depois: int = None, custo_por_seguidor: float = None,
-                 custo_por_engajamento: float = None, thruplay: int = None,
-                 frequencia: float = None, reproducao_25_pct: int = None,
-                 reproducao_50_pct: int = None, reproducao_75_pct: int = None,
-                 reproducao_95_pct: int = None, reproducao_100_pct: int = None,
-                 data_inicio_impulsionamento: date = None, data_fim_impulsionamento: date = None,
-                 data_criacao: datetime = None, data_atualizacao: datetime = None,
-                 ativo: bool = True):
-        self.id = id
-        self.projeto_id = projeto_id
-        self.identificador = identificador
-        self.tipo_conteudo = tipo_conteudo
-        self.alcance = alcance
-        self.engajamento = engajamento
-        self.valor_gasto = valor_gasto
-        self.cpm = cpm
-        self.seguidores_antes = seguidores_antes
-        self.seguidores_depois = seguidores_depois
-        self.custo_por_seguidor = custo_por_seguidor
-        self.custo_por_engajamento = custo_por_engajamento
-        self.thruplay = thruplay
-        self.frequencia = frequencia
-        self.reproducao_25_pct = reproducao_25_pct
-        self.reproducao_50_pct = reproducao_50_pct
-        self.reproducao_75_pct = reproducao_75_pct
-        self.reproducao_95_pct = reproducao_95_pct
-        self.reproducao_100_pct = reproducao_100_pct
-        self.data_inicio_impulsionamento = data_inicio_impulsionamento
-        self.data_fim_impulsionamento = data_fim_impulsionamento
-        self.data_criacao = data_criacao
-        self.data_atualizacao = data_atualizacao
-        self.ativo = ativo
+import heapq
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from src.config.supabase_config import tabela
+from src.models.cache import cache_entidades, cache_janelas
+from src.models.coalescencia import executar_consulta, registrar_escrita
+from src.models.campos import projecao
+from src.models.concorrencia import executar_em_paralelo
+from src.models.esquema import Esquema, Registro, TEXTO, INTEIRO, DECIMAL, DATA, DATA_HORA, BOOLEANO, converter_data_hora
+from src.models.lote import criar_em_lote, violacao_unicidade, ErroConflito, TAMANHO_LOTE_INSERCAO
+from src.models.paginacao import buscar_pagina, iterar_linhas, LIMITE_PADRAO, TAMANHO_PAGINA_ITERACAO
+
+# Critério de ordenação dos melhores criativos por tipo (menor custo primeiro)
+CRITERIO_MELHORES_CRIATIVOS = {
+    'C1': 'custo_por_seguidor',
+    'C2': 'custo_por_engajamento',
+    'C3': 'custo_por_engajamento',
+    'C4': 'custo_por_engajamento'
+}
+
+class Conteudo(Registro):
+    ESQUEMA = Esquema(
+        ('id', TEXTO), ('projeto_id', TEXTO), ('identificador', TEXTO), ('tipo_conteudo', TEXTO),
+        ('alcance', INTEIRO), ('engajamento', INTEIRO), ('valor_gasto', DECIMAL), ('cpm', DECIMAL),
+        ('seguidores_antes', INTEIRO), ('seguidores_depois', INTEIRO),
+        ('custo_por_seguidor', DECIMAL), ('custo_por_engajamento', DECIMAL),
+        ('thruplay', INTEIRO), ('frequencia', DECIMAL),
+        ('reproducao_25_pct', INTEIRO), ('reproducao_50_pct', INTEIRO), ('reproducao_75_pct', INTEIRO),
+        ('reproducao_95_pct', INTEIRO), ('reproducao_100_pct', INTEIRO),
+        ('data_inicio_impulsionamento', DATA), ('data_fim_impulsionamento', DATA),
+        ('data_criacao', DATA_HORA), ('data_atualizacao', DATA_HORA), ('ativo', BOOLEANO),
+        # Custos calculados por trigger no banco
+        somente_leitura=('custo_por_seguidor', 'custo_por_engajamento')
+    )
+    __slots__ = ESQUEMA.nomes
+
+    # Colunas da tabela (usadas na projeção de campos)
+    CAMPOS = ESQUEMA.nomes
+    CAMPOS_ATUALIZAVEIS = tuple(campo for campo in ESQUEMA.editaveis if campo != 'projeto_id')
+
+    # Chave natural (índice único parcial, só entre os conteúdos ativos)
+    CHAVE = ('projeto_id', 'identificador')
+
+    # Validação das linhas na criação em lote
+    VALIDADOR_LOTE = ESQUEMA.validador(
+        obrigatorios=('projeto_id', 'identificador', 'tipo_conteudo'),
+        campo_tipo='tipo_conteudo',
+        tipos_validos=('C1', 'C2', 'C3', 'C4')
+    )
 
     @classmethod
     def criar(cls, projeto_id: str, identificador: str, tipo_conteudo: str, **kwargs) -> 'Conteudo':
-        """Cria um novo conteúdo no Supabase"""
+        """Cria um novo conteúdo no Supabase
+
+        Levanta ErroConflito se já existir um conteúdo ativo com o mesmo identificador no projeto.
+        """
         try:
             data = {
+                **cls.ESQUEMA.dados_gravacao(kwargs),
                 'projeto_id': projeto_id,
                 'identificador': identificador,
                 'tipo_conteudo': tipo_conteudo,
                 'ativo': True
             }
             
-            # Adiciona campos opcionais
-            campos_opcionais = [
-                'alcance', 'engajamento', 'valor_gasto', 'cpm', 'seguidores_antes',
-                'seguidores_depois', 'thruplay', 'frequencia', 'reproducao_25_pct',
-                'reproducao_50_pct', 'reproducao_75_pct', 'reproducao_95_pct',
-                'reproducao_100_pct', 'data_inicio_impulsionamento', 'data_fim_impulsionamento'
-            ]
-            
-            for campo in campos_opcionais:
-                if campo in kwargs and kwargs[campo] is not None:
-                    data[campo] = kwargs[campo]
-            
-            response = supabase.table('conteudos').insert(data).execute()
+            response = tabela('conteudos').insert(data).execute()
+            registrar_escrita('conteudos', 'metricas_projeto_diarias', 'esboco_quantis')
+            # Os agregados diários do projeto são atualizados por trigger
+            cache_janelas.limpar()
             
             if response.data:
                 conteudo_data = response.data[0]
+                cache_entidades.definir('conteudos', conteudo_data['id'], conteudo_data)
                 return cls._from_dict(conteudo_data)
             return None
         except Exception as e:
+            if violacao_unicidade(e):
+                raise ErroConflito(f'Já existe um conteúdo ativo com identificador "{identificador}" neste projeto')
             print(f"Erro ao criar conteúdo: {e}")
             return None
 
     @classmethod
-    def buscar_por_id(cls, conteudo_id: str) -> Optional['Conteudo']:
-        """Busca um conteúdo pelo ID"""
+    def criar_em_lote(cls, registros: List[Dict[str, Any]],
+                      tamanho_lote: int = TAMANHO_LOTE_INSERCAO) -> List[Dict[str, Any]]:
+        """Cria vários conteúdos com inserções multi-linha; retorna um resultado por registro"""
+        resultados = criar_em_lote('conteudos', cls.VALIDADOR_LOTE, registros, tamanho_lote, cls.CHAVE)
+        registrar_escrita('metricas_projeto_diarias', 'esboco_quantis')
+        cache_janelas.limpar()
+        for resultado in resultados:
+            if resultado['success']:
+                resultado['data'] = cls._from_dict(resultado['data'])
+        return resultados
+
+    @classmethod
+    def buscar_por_id(cls, conteudo_id: str, usar_cache: bool = True,
+                      campos: List[str] = None) -> Optional['Conteudo']:
+        """Busca um conteúdo pelo ID, consultando antes o cache de entidades"""
         try:
-            response = supabase.table('conteudos').select('*').eq('id', conteudo_id).eq('ativo', True).execute()
+            if usar_cache:
+                conteudo_data = cache_entidades.obter('conteudos', conteudo_id)
+                if conteudo_data is not None:
+                    return cls._from_dict(conteudo_data, campos)
+            
+            response = executar_consulta(tabela('conteudos').select(projecao(campos)).eq('id', conteudo_id).eq('ativo', True))
             
             if response.data:
-                return cls._from_dict(response.data[0])
+                if not campos:
+                    cache_entidades.definir('conteudos', conteudo_id, response.data[0])
+                return cls._from_dict(response.data[0], campos)
             return None
         except Exception as e:
             print(f"Erro ao buscar conteúdo: {e}")
             return None
 
     @classmethod
-    def listar_por_projeto(cls, projeto_id: str, tipo_conteudo: str = None) -> List['Conteudo']:
-        """Lista conteúdos por projeto, opcionalmente filtrado por tipo"""
+    def versao(cls, conteudo_id: str, usar_cache: bool = True) -> Optional[datetime]:
+        """Retorna a data_atualizacao do conteúdo (usada na ETag), sem carregar a linha inteira"""
         try:
-            query = supabase.table('conteudos').select('*').eq('projeto_id', projeto_id).eq('ativo', True)
-            
-            if tipo_conteudo:
-                query = query.eq('tipo_conteudo', tipo_conteudo)
+            if usar_cache:
+                conteudo_data = cache_entidades.obter('conteudos', conteudo_id)
+                if conteudo_data is not None:
+                    return converter_data_hora(conteudo_data.get('data_atualizacao'))
             
-            response = query.order('data_criacao', desc=True).execute()
+            response = executar_consulta(tabela('conteudos').select('id,data_atualizacao').eq('id', conteudo_id).eq('ativo', True))
             
-            conteudos = []
-            for conteudo_data in response.data:
-                conteudos.append(cls._from_dict(conteudo_data))
-            return conteudos
+            if response.data:
+                return converter_data_hora(response.data[0]['data_atualizacao'])
+            return None
+        except Exception as e:
+            print(f"Erro ao buscar versão do conteúdo: {e}")
+            return None
+
+    @classmethod
+    def _query_por_projeto(cls, projeto_id: str, tipo_conteudo: str = None, campos: List[str] = None):
+        """Monta a query dos conteúdos ativos do projeto"""
+        query = tabela('conteudos').select(projecao(campos, ('id', 'data_criacao', 'data_atualizacao'))).eq('projeto_id', projeto_id).eq('ativo', True)
+        
+        if tipo_conteudo:
+            query = query.eq('tipo_conteudo', tipo_conteudo)
+        return query
+
+    @classmethod
+    def listar_pagina(cls, projeto_id: str, tipo_conteudo: str = None, limite: int = LIMITE_PADRAO,
+                      cursor: str = None, campos: List[str] = None) -> Tuple[List['Conteudo'], Optional[str]]:
+        """Lista uma página de conteúdos do projeto e retorna o cursor da próxima página"""
+        try:
+            linhas, proximo_cursor = buscar_pagina(cls._query_por_projeto(projeto_id, tipo_conteudo, campos), limite, cursor)
+            return [cls._from_dict(conteudo_data, campos) for conteudo_data in linhas], proximo_cursor
+        except Exception as e:
+            print(f"Erro ao listar página de conteúdos: {e}")
+            return [], None
+
+    @classmethod
+    def versao_pagina(cls, projeto_id: str, tipo_conteudo: str = None, limite: int = LIMITE_PADRAO,
+                      cursor: str = None) -> Optional[Tuple[List[Tuple[str, datetime]], Optional[str]]]:
+        """Retorna (id, data_atualizacao) das linhas da página e o próximo cursor, sem montar os modelos"""
+        try:
+            linhas, proximo_cursor = buscar_pagina(cls._query_por_projeto(projeto_id, tipo_conteudo, ['data_atualizacao']), limite, cursor)
+            return [(linha['id'], converter_data_hora(linha['data_atualizacao'])) for linha in linhas], proximo_cursor
+        except Exception as e:
+            print(f"Erro ao buscar versão da página de conteudos: {e}")
+            return None
+
+    @classmethod
+    def versao_projeto(cls, projeto_id: str) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retorna (quantidade, maior data_atualizacao) dos conteúdos ativos do projeto numa consulta de uma linha"""
+        try:
+            from postgrest.types import CountMethod
+
+            response = (tabela('conteudos').select('data_atualizacao', count=CountMethod.exact)
+                        .eq('projeto_id', projeto_id).eq('ativo', True)
+                        .order('data_atualizacao', desc=True, nullsfirst=False).limit(1))
+            response = executar_consulta(response)
+            return response.count, (converter_data_hora(response.data[0]['data_atualizacao']) if response.data else None)
+        except Exception as e:
+            print(f"Erro ao buscar versão dos conteúdos do projeto: {e}")
+            return None
+
+    @classmethod
+    def iterar_por_projeto(cls, projeto_id: str, tipo_conteudo: str = None,
+                           tamanho_pagina: int = TAMANHO_PAGINA_ITERACAO,
+                           campos: List[str] = None, cursor: str = None) -> Iterator['Conteudo']:
+        """Percorre todos os conteúdos do projeto (a partir do cursor, se informado), buscando uma página por vez"""
+        for conteudo_data in iterar_linhas(lambda: cls._query_por_projeto(projeto_id, tipo_conteudo, campos), tamanho_pagina, cursor):
+            yield cls._from_dict(conteudo_data, campos)
+
+    @classmethod
+    def listar_por_projeto(cls, projeto_id: str, tipo_conteudo: str = None,
+                           campos: List[str] = None) -> List['Conteudo']:
+        """Lista conteúdos por projeto, opcionalmente filtrado por tipo"""
+        try:
+            return list(cls.iterar_por_projeto(projeto_id, tipo_conteudo, campos=campos))
         except Exception as e:
             print(f"Erro ao listar conteúdos: {e}")
             return []
 
     @classmethod
-    def listar_melhores_criativos(cls, data_inicio: date = None, data_fim: date = None) -> Dict[str, List['Conteudo']]:
-        """Lista os melhores criativos por tipo de conteúdo"""
+    def _query_melhores_criativos(cls, tipo_conteudo: str, data_inicio: date = None, data_fim: date = None,
+                                  projeto_id: str = None):
+        """Monta a query dos conteúdos ativos de um tipo, com os filtros de projeto e período"""
+        query = tabela('conteudos').select('*').eq('ativo', True).eq('tipo_conteudo', tipo_conteudo)
+        
+        if projeto_id:
+            query = query.eq('projeto_id', projeto_id)
+        if data_inicio:
+            query = query.gte('data_inicio_impulsionamento', data_inicio.isoformat())
+        if data_fim:
+            query = query.lte('data_fim_impulsionamento', data_fim.isoformat())
+        return query
+
+    @classmethod
+    def _melhores_do_tipo(cls, tipo_conteudo: str, k: int, data_inicio: date = None, data_fim: date = None,
+                          projeto_id: str = None) -> List['Conteudo']:
+        """Busca os k melhores conteúdos de um tipo com consultas ordenadas e limitadas
+
+        Custo zero ou nulo (sem gasto ou sem resultado) não conta como o mais
+        barato: esses conteúdos só completam a lista depois dos de custo positivo.
+        """
+        from postgrest.exceptions import APIError
+
+        coluna = CRITERIO_MELHORES_CRIATIVOS[tipo_conteudo]
+        criar_query = lambda: cls._query_melhores_criativos(tipo_conteudo, data_inicio, data_fim, projeto_id)
+        
         try:
-            query = supabase.table('conteudos').select('*').eq('ativo', True)
-            
-            if data_inicio:
-                query = query.gte('data_inicio_impulsionamento', data_inicio.isoformat())
-            if data_fim:
-                query = query.lte('data_fim_impulsionamento', data_fim.isoformat())
-            
-            response = query.execute()
-            
-            melhores_por_tipo = {'C1': [], 'C2': [], 'C3': [], 'C4': []}
-            
-            for conteudo_data in response.data:
-                conteudo = cls._from_dict(conteudo_data)
-                tipo = conteudo.tipo_conteudo
-                
-                if tipo in melhores_por_tipo:
-                    melhores_por_tipo[tipo].append(conteudo)
-            
-            # Ordena por performance (C1 por custo por seguidor, C2-C4 por custo por engajamento)
-            for tipo in melhores_por_tipo:
-                if tipo == 'C1':
-                    melhores_por_tipo[tipo].sort(key=lambda x: x.custo_por_seguidor or float('inf'))
-                else:
-                    melhores_por_tipo[tipo].sort(key=lambda x: x.custo_por_engajamento or float('inf'))
-                
-                # Mantém apenas os top 10
-                melhores_por_tipo[tipo] = melhores_por_tipo[tipo][:10]
-            
-            return melhores_por_tipo
+            response = executar_consulta(criar_query().gt(coluna, 0).order(coluna).order('id').limit(k))
+            linhas = response.data
+            if len(linhas) < k:
+                complemento = executar_consulta(
+                    criar_query().or_(f'{coluna}.is.null,{coluna}.lte.0').order('id').limit(k - len(linhas))
+                )
+                # Lista nova: a resposta coalescida é compartilhada com as outras requisições e não pode ser alterada
+                linhas = linhas + complemento.data
+        except APIError as e:
+            # Sem a ordenação no banco, percorre as páginas mantendo só os k melhores (heap limitado)
+            print(f"Erro na consulta ordenada de melhores criativos {tipo_conteudo}, calculando em memória: {e}")
+            linhas = heapq.nsmallest(k, iterar_linhas(criar_query), key=lambda d: d.get(coluna) or float('inf'))
+        
+        return [cls._from_dict(conteudo_data) for conteudo_data in linhas]
+
+    @classmethod
+    def listar_melhores_criativos(cls, data_inicio: date = None, data_fim: date = None, projeto_id: str = None,
+                                  k: int = 10) -> Dict[str, List['Conteudo']]:
+        """Lista os k melhores criativos por tipo de conteúdo (uma consulta por tipo, em paralelo)"""
+        try:
+            return executar_em_paralelo({
+                tipo: (lambda tipo=tipo: cls._melhores_do_tipo(tipo, k, data_inicio, data_fim, projeto_id))
+                for tipo in CRITERIO_MELHORES_CRIATIVOS
+            })
         except Exception as e:
             print(f"Erro ao buscar melhores criativos: {e}")
             return {'C1': [], 'C2': [], 'C3': [], 'C4': []}
 
+    @classmethod
+    def atualizar_por_id(cls, conteudo_id: str, **kwargs) -> Optional['Conteudo']:
+        """Atualiza o conteúdo ativo numa única requisição e retorna a linha gravada
+
+        Retorna None se não houver conteúdo ativo com o ID. Erros do Supabase são
+        propagados, para a rota distinguir "não encontrado" (404) de falha (500).
+        """
+        data = cls.ESQUEMA.dados_gravacao(kwargs, cls.CAMPOS_ATUALIZAVEIS)
+        if not data:
+            return cls.buscar_por_id(conteudo_id)
+
+        response = tabela('conteudos').update(data).eq('id', conteudo_id).eq('ativo', True).execute()
+        registrar_escrita('conteudos', 'campanhas', 'metricas_projeto_diarias', 'esboco_quantis')
+        # Os totais das campanhas associadas e os agregados diários do projeto são recalculados no banco
+        cache_entidades.limpar('campanhas')
+        cache_janelas.limpar()
+        if not response.data:
+            cache_entidades.invalidar('conteudos', conteudo_id)
+            return None
+        cache_entidades.definir('conteudos', conteudo_id, response.data[0])
+        return cls._from_dict(response.data[0])
+
+    @classmethod
+    def deletar_por_id(cls, conteudo_id: str) -> bool:
+        """Marca o conteúdo ativo como inativo numa única requisição (False se não houver conteúdo ativo)"""
+        response = tabela('conteudos').update({'ativo': False}).eq('id', conteudo_id).eq('ativo', True).execute()
+        registrar_escrita('conteudos', 'campanhas', 'metricas_projeto_diarias', 'esboco_quantis')
+        cache_entidades.invalidar('conteudos', conteudo_id)
+        cache_entidades.limpar('campanhas')
+        cache_janelas.limpar()
+        return len(response.data) > 0
+
     def atualizar(self, **kwargs) -> bool:
         """Atualiza os dados do conteúdo"""
         try:
-            data = {}
-            campos_atualizaveis = [
-                'identificador', 'tipo_conteudo', 'alcance', 'engajamento', 'valor_gasto',
-                'cpm', 'seguidores_antes', 'seguidores_depois', 'thruplay', 'frequencia',
-                'reproducao_25_pct', 'reproducao_50_pct', 'reproducao_75_pct',
-                'reproducao_95_pct', 'reproducao_100_pct', 'data_inicio_impulsionamento',
-                'data_fim_impulsionamento'
-            ]
-            
-            for campo in campos_atualizaveis:
-                if campo in kwargs and kwargs[campo] is not None:
-                    data[campo] = kwargs[campo]
-                    setattr(self, campo, kwargs[campo])
-            
-            if data:
-                response = supabase.table('conteudos').update(data).eq('id', self.id).execute()
-                return len(response.data) > 0
+            atualizado = self.atualizar_por_id(self.id, **kwargs)
+            if atualizado is None:
+                return False
+            for campo in self.CAMPOS:
+                setattr(self, campo, getattr(atualizado, campo))
             return True
         except Exception as e:
             print(f"Erro ao atualizar conteúdo: {e}")
@@ -169,71 +298,10 @@ class Conteudo:
     def deletar(self) -> bool:
         """Marca o conteúdo como inativo (soft delete)"""
         try:
-            response = supabase.table('conteudos').update({'ativo': False}).eq('id', self.id).execute()
-            if len(response.data) > 0:
+            if self.deletar_por_id(self.id):
                 self.ativo = False
                 return True
             return False
         except Exception as e:
             print(f"Erro ao deletar conteúdo: {e}")
             return False
-
-    @classmethod
-    def _from_dict(cls, data: Dict[str, Any]) -> 'Conteudo':
-        """Cria uma instância de Conteudo a partir de um dicionário"""
-        return cls(
-            id=data.get('id'),
-            projeto_id=data.get('projeto_id'),
-            identificador=data.get('identificador'),
-            tipo_conteudo=data.get('tipo_conteudo'),
-            alcance=data.get('alcance'),
-            engajamento=data.get('engajamento'),
-            valor_gasto=data.get('valor_gasto'),
-            cpm=data.get('cpm'),
-            seguidores_antes=data.get('seguidores_antes'),
-            seguidores_depois=data.get('seguidores_depois'),
-            custo_por_seguidor=data.get('custo_por_seguidor'),
-            custo_por_engajamento=data.get('custo_por_engajamento'),
-            thruplay=data.get('thruplay'),
-            frequencia=data.get('frequencia'),
-            reproducao_25_pct=data.get('reproducao_25_pct'),
-            reproducao_50_pct=data.get('reproducao_50_pct'),
-            reproducao_75_pct=data.get('reproducao_75_pct'),
-            reproducao_95_pct=data.get('reproducao_95_pct'),
-            reproducao_100_pct=data.get('reproducao_100_pct'),
-            data_inicio_impulsionamento=data.get('data_inicio_impulsionamento'),
-            data_fim_impulsionamento=data.get('data_fim_impulsionamento'),
-            data_criacao=data.get('data_criacao'),
-            data_atualizacao=data.get('data_atualizacao'),
-            ativo=data.get('ativo', True)
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Converte o conteúdo para dicionário"""
-        return {
-            'id': self.id,
-            'projeto_id': self.projeto_id,
-            'identificador': self.identificador,
-            'tipo_conteudo': self.tipo_conteudo,
-            'alcance': self.alcance,
-            'engajamento': self.engajamento,
-            'valor_gasto': self.valor_gasto,
-            'cpm': self.cpm,
-            'seguidores_antes': self.seguidores_antes,
-            'seguidores_depois': self.seguidores_depois,
-            'custo_por_seguidor': self.custo_por_seguidor,
-            'custo_por_engajamento': self.custo_por_engajamento,
-            'thruplay': self.thruplay,
-            'frequencia': self.frequencia,
-            'reproducao_25_pct': self.reproducao_25_pct,
-            'reproducao_50_pct': self.reproducao_50_pct,
-            'reproducao_75_pct': self.reproducao_75_pct,
-            'reproducao_95_pct': self.reproducao_95_pct,
-            'reproducao_100_pct': self.reproducao_100_pct,
-            'data_inicio_impulsionamento': self.data_inicio_impulsionamento.isoformat() if self.data_inicio_impulsionamento else None,
-            'data_fim_impulsionamento': self.data_fim_impulsionamento.isoformat() if self.data_fim_impulsionamento else None,
-            'data_criacao': self.data_criacao.isoformat() if self.data_criacao else None,
-            'data_atualizacao': self.data_atualizacao.isoformat() if self.data_atualizacao else None,
-            'ativo': self.ativo
-        }
-
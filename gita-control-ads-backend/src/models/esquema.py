@@ -0,0 +1,123 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.models.lote import ValidadorLinhas
+
+# Esquema de campos por tabela: dele saem os atributos dos modelos, a conversão
+# das linhas do Supabase, a serialização e os campos graváveis
+
+TEXTO = 'texto'
+INTEIRO = 'inteiro'
+DECIMAL = 'decimal'
+DATA = 'data'
+DATA_HORA = 'data_hora'
+BOOLEANO = 'booleano'
+
+# Campos mantidos pelo banco, nunca enviados nas gravações
+SOMENTE_LEITURA = ('id', 'data_criacao', 'data_atualizacao', 'ativo')
+
+
+def converter_data(valor: Any) -> Any:
+    """Converte 'YYYY-MM-DD' para date (valores que não são datas ISO ficam como vieram)"""
+    if isinstance(valor, str):
+        try:
+            return date.fromisoformat(valor[:10])
+        except ValueError:
+            return valor
+    if isinstance(valor, datetime):
+        return valor.date()
+    return valor
+
+
+def converter_data_hora(valor: Any) -> Any:
+    """Converte um timestamp ISO 8601 do PostgREST para datetime (valores inválidos ficam como vieram)"""
+    if isinstance(valor, str):
+        try:
+            return datetime.fromisoformat(valor)
+        except ValueError:
+            return valor
+    return valor
+
+
+CONVERSORES = {
+    DATA: converter_data,
+    DATA_HORA: converter_data_hora,
+}
+
+
+def iso(valor: Any) -> Any:
+    """Serializa date/datetime em ISO 8601; outros valores passam inalterados"""
+    return valor.isoformat() if isinstance(valor, date) else valor
+
+
+class Esquema:
+    """Campos (nome, tipo) de uma tabela, na ordem das colunas"""
+
+    def __init__(self, *campos: Tuple[str, str], somente_leitura: Sequence[str] = (),
+                 padroes: Dict[str, Any] = None):
+        self.nomes = tuple(nome for nome, _ in campos)
+        self.tipos = dict(campos)
+        self.padroes = {'ativo': True, **(padroes or {})}
+        somente_leitura = set(SOMENTE_LEITURA) | set(somente_leitura)
+        self.editaveis = tuple(nome for nome in self.nomes if nome not in somente_leitura)
+        # (nome, conversor ou None, padrão), usado na hidratação das linhas
+        self.hidratacao = tuple((nome, CONVERSORES.get(tipo), self.padroes.get(nome)) for nome, tipo in campos)
+
+    def editaveis_do_tipo(self, *tipos: str) -> Tuple[str, ...]:
+        return tuple(nome for nome in self.editaveis if self.tipos[nome] in tipos)
+
+    def validador(self, obrigatorios: Sequence[str], campo_tipo: str,
+                  tipos_validos: Sequence[str], recusados: Sequence[str] = ()) -> ValidadorLinhas:
+        """Validador da criação em lote com os campos editáveis do esquema (recusando as linhas com os campos de recusados)"""
+        return ValidadorLinhas(
+            obrigatorios=obrigatorios,
+            campo_tipo=campo_tipo,
+            tipos_validos=tipos_validos,
+            recusados=recusados,
+            textos=tuple(nome for nome in self.editaveis_do_tipo(TEXTO) if nome not in obrigatorios),
+            inteiros=self.editaveis_do_tipo(INTEIRO),
+            decimais=self.editaveis_do_tipo(DECIMAL),
+            datas=self.editaveis_do_tipo(DATA)
+        )
+
+    def dados_gravacao(self, valores: Dict[str, Any], campos: Sequence[str] = None) -> Dict[str, Any]:
+        """Campos editáveis informados (e não nulos), com as datas em ISO para o PostgREST"""
+        return {
+            campo: iso(valores[campo])
+            for campo in (campos or self.editaveis)
+            if valores.get(campo) is not None
+        }
+
+
+class Registro:
+    """Base dos modelos: a subclasse define ESQUEMA e __slots__ = ESQUEMA.nomes"""
+
+    __slots__ = ('_campos',)
+    ESQUEMA: Esquema
+
+    def __init__(self, **valores):
+        for nome, _, padrao in self.ESQUEMA.hidratacao:
+            setattr(self, nome, valores.get(nome, padrao))
+        self._campos = None  # campos carregados em leituras parciais (None = todos)
+
+    @classmethod
+    def _from_dict(cls, data: Dict[str, Any], campos: List[str] = None):
+        """Cria uma instância a partir de uma linha do Supabase (completa ou parcial), convertendo as datas"""
+        instancia = cls.__new__(cls)
+        obter = data.get
+        for nome, converter, padrao in cls.ESQUEMA.hidratacao:
+            valor = obter(nome, padrao)
+            setattr(instancia, nome, converter(valor) if converter is not None and valor is not None else valor)
+        instancia._campos = campos or None
+        return instancia
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o registro para dicionário (só os campos carregados, em leituras parciais)
+
+        As datas ficam como date/datetime; o provedor JSON do app as serializa em ISO 8601.
+        """
+        nomes = ('id', *self._campos) if self._campos else self.ESQUEMA.nomes
+        return {nome: getattr(self, nome) for nome in nomes}
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(id={self.id!r})'
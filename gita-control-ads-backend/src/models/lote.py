@@ -0,0 +1,253 @@
+import os
+from datetime import datetime, date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.config.supabase_config import tabela
+from src.models.coalescencia import registrar_escrita
+
+# Criação em lote: validação antecipada de todas as linhas e inserção multi-linha
+TAMANHO_LOTE_INSERCAO = int(os.getenv('TAMANHO_LOTE_INSERCAO', '500'))
+MAX_LINHAS_LOTE = int(os.getenv('MAX_LINHAS_LOTE', '5000'))
+
+
+class ErroConflito(Exception):
+    """Já existe um registro ativo com a mesma chave natural (projeto_id e identificador)"""
+
+
+class ValidadorLinhas:
+    """Valida e normaliza as linhas de uma criação em lote
+
+    Todas as linhas normalizadas têm as mesmas colunas (as ausentes vão como
+    None), como o PostgREST exige nas inserções multi-linha.
+    """
+
+    def __init__(self, obrigatorios: Sequence[str], campo_tipo: Optional[str], tipos_validos: Sequence[str],
+                 inteiros: Sequence[str] = (), decimais: Sequence[str] = (), datas: Sequence[str] = (),
+                 textos: Sequence[str] = (), marcar_ativo: bool = True, recusados: Sequence[str] = ()):
+        self.obrigatorios = tuple(obrigatorios)
+        self.campo_tipo = campo_tipo
+        self.tipos_validos = tuple(tipos_validos)
+        self.inteiros = tuple(inteiros)
+        self.decimais = tuple(decimais)
+        self.datas = tuple(datas)
+        self.textos = tuple(textos)
+        self.marcar_ativo = marcar_ativo  # False para tabelas sem a coluna ativo
+        self.recusados = tuple(recusados)  # campos calculados pelo banco: a linha que os traz é recusada
+        self.colunas = self.obrigatorios + self.textos + self.inteiros + self.decimais + self.datas
+
+    def validar(self, dados: Any, parcial: bool = False) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """Retorna (linha normalizada, []) ou (None, lista de erros)
+
+        Com parcial=True a linha leva só as colunas presentes em dados (mais as
+        obrigatórias), para que um upsert não apague as colunas omitidas.
+        """
+        if not isinstance(dados, dict):
+            return None, ['linha deve ser um objeto']
+
+        erros = []
+        colunas = self.obrigatorios + tuple(c for c in self.colunas if c in dados) if parcial else self.colunas
+        linha = {coluna: None for coluna in colunas}
+
+        for campo in self.obrigatorios:
+            valor = dados.get(campo)
+            if not isinstance(valor, str) or not valor.strip():
+                erros.append(f'{campo} é obrigatório')
+            else:
+                linha[campo] = valor
+
+        recusados = [campo for campo in self.recusados if campo in dados]
+        if recusados:
+            erros.append(f"Campos somente leitura, calculados pelo banco: {', '.join(recusados)}")
+
+        if linha.get(self.campo_tipo) is not None and linha[self.campo_tipo] not in self.tipos_validos:
+            erros.append(f"{self.campo_tipo} deve ser um de: {', '.join(self.tipos_validos)}")
+
+        for campo in self.textos:
+            if campo not in linha:
+                continue
+            valor = dados.get(campo)
+            if valor is not None and not isinstance(valor, str):
+                erros.append(f'{campo} deve ser texto')
+            else:
+                linha[campo] = valor
+
+        for campo in self.inteiros:
+            if campo not in linha:
+                continue
+            valor = dados.get(campo)
+            if valor is None:
+                continue
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)) or int(valor) != valor:
+                erros.append(f'{campo} deve ser um número inteiro')
+            else:
+                linha[campo] = int(valor)
+
+        for campo in self.decimais:
+            if campo not in linha:
+                continue
+            valor = dados.get(campo)
+            if valor is None:
+                continue
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                erros.append(f'{campo} deve ser numérico')
+            else:
+                linha[campo] = valor
+
+        for campo in self.datas:
+            if campo not in linha:
+                continue
+            valor = dados.get(campo)
+            if not valor:
+                continue
+            if isinstance(valor, date):
+                linha[campo] = valor.isoformat()
+                continue
+            try:
+                linha[campo] = datetime.strptime(valor, '%Y-%m-%d').date().isoformat()
+            except (TypeError, ValueError):
+                erros.append(f'Formato de data inválido para {campo}. Use YYYY-MM-DD')
+
+        if erros:
+            return None, erros
+
+        if self.marcar_ativo:
+            linha['ativo'] = True
+        return linha, []
+
+
+# Código do Postgres para violação de índice único (chave natural já usada por um registro ativo)
+VIOLACAO_UNICIDADE = '23505'
+
+
+def violacao_unicidade(erro: Exception) -> bool:
+    """Indica se o erro do PostgREST veio de um índice único"""
+    return getattr(erro, 'code', None) == VIOLACAO_UNICIDADE
+
+
+def _erro_conflito(campo: str, valor: Any) -> ErroConflito:
+    return ErroConflito(f'Já existe um registro ativo com {campo} "{valor}" neste projeto')
+
+
+def ids_ativos(nome_tabela: str, chave: Tuple[str, str], linhas: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[str]]:
+    """ids dos registros ativos com as chaves (projeto_id, nome) das linhas"""
+    campo_projeto, campo_nome = chave
+    response = (
+        tabela(nome_tabela).select(f'id,{campo_projeto},{campo_nome}')
+        .in_(campo_projeto, list({linha[campo_projeto] for linha in linhas}))
+        .in_(campo_nome, list({linha[campo_nome] for linha in linhas}))
+        .eq('ativo', True)
+        .execute()
+    )
+    ids: Dict[Tuple[str, str], List[str]] = {}
+    for linha in response.data:
+        ids.setdefault((linha[campo_projeto], linha[campo_nome]), []).append(linha['id'])
+    return ids
+
+
+def inserir_em_lotes(nome_tabela: str, linhas: List[Tuple[int, Dict[str, Any]]],
+                     tamanho_lote: int = TAMANHO_LOTE_INSERCAO, chave: Tuple[str, str] = None) -> Dict[int, Any]:
+    """Insere as linhas em lotes multi-linha
+
+    Recebe pares (índice, linha) e retorna, por índice, a linha criada, um
+    ErroConflito ou a mensagem de erro do lote que falhou. Um lote com erro não
+    interrompe os demais. Com chave (índice único parcial em registros ativos),
+    as linhas cuja chave já existe ativa ou se repete na chamada voltam como
+    ErroConflito sem ir ao banco; se o índice ainda assim recusar o lote (criação
+    concorrente), todas as linhas do lote voltam como ErroConflito.
+    """
+    resultados: Dict[int, Any] = {}
+    vistas = set()
+    for inicio in range(0, len(linhas), tamanho_lote):
+        lote = linhas[inicio:inicio + tamanho_lote]
+        try:
+            if chave:
+                existentes = ids_ativos(nome_tabela, chave, [linha for _, linha in lote])
+                inserir = []
+                for indice, linha in lote:
+                    valor_chave = (linha[chave[0]], linha[chave[1]])
+                    if valor_chave in existentes or valor_chave in vistas:
+                        resultados[indice] = _erro_conflito(chave[1], valor_chave[1])
+                    else:
+                        vistas.add(valor_chave)
+                        inserir.append((indice, linha))
+                lote = inserir
+                if not lote:
+                    continue
+
+            response = tabela(nome_tabela).insert([linha for _, linha in lote]).execute()
+            registrar_escrita(nome_tabela)
+            criadas = response.data or []
+            for posicao, (indice, _) in enumerate(lote):
+                resultados[indice] = criadas[posicao] if posicao < len(criadas) else 'Linha não retornada pelo banco'
+        except Exception as e:
+            print(f"Erro ao inserir lote em {nome_tabela}: {e}")
+            for indice, linha in lote:
+                if chave and violacao_unicidade(e):
+                    resultados.setdefault(indice, _erro_conflito(chave[1], linha[chave[1]]))
+                else:
+                    resultados.setdefault(indice, f'Erro ao inserir lote: {e}')
+    return resultados
+
+
+def gravar_por_chave(nome_tabela: str, linhas: List[Tuple[Any, Dict[str, Any]]],
+                     chave: Tuple[str, str]) -> Dict[Any, str]:
+    """Atualiza os registros ativos com a chave (projeto_id, nome) de cada linha e insere as chaves novas
+
+    Usado pela importação: o upsert vai pela chave primária dos registros
+    encontrados, já que o índice único da chave natural é parcial (só registros
+    ativos) e o PostgREST não aceita um índice parcial em on_conflict. Registros
+    excluídos não são reativados. Retorna as linhas não gravadas porque a chave
+    corresponde a mais de um registro ativo ({referência: mensagem}).
+    """
+    from postgrest.types import ReturnMethod
+
+    existentes = ids_ativos(nome_tabela, chave, [linha for _, linha in linhas])
+    atualizar, inserir, ambiguas = [], [], {}
+    for referencia, linha in linhas:
+        ids = existentes.get((linha[chave[0]], linha[chave[1]]), [])
+        if len(ids) > 1:
+            ambiguas[referencia] = f'{chave[1]} "{linha[chave[1]]}" corresponde a {len(ids)} registros ativos no projeto'
+        elif ids:
+            # ativo fica de fora: um registro excluído entre a busca e a gravação continua excluído
+            atualizar.append({**{c: v for c, v in linha.items() if c != 'ativo'}, 'id': ids[0]})
+        else:
+            inserir.append(linha)
+
+    if atualizar:
+        tabela(nome_tabela).upsert(atualizar, on_conflict='id', returning=ReturnMethod.minimal).execute()
+    if inserir:
+        tabela(nome_tabela).insert(inserir, returning=ReturnMethod.minimal).execute()
+    registrar_escrita(nome_tabela)
+    return ambiguas
+
+
+def criar_em_lote(nome_tabela: str, validador: ValidadorLinhas, dados: Sequence[Any],
+                  tamanho_lote: int = TAMANHO_LOTE_INSERCAO, chave: Tuple[str, str] = None) -> List[Dict[str, Any]]:
+    """Valida todas as linhas e insere as válidas em lotes; retorna um resultado por linha
+
+    Com chave, uma linha cuja chave já pertence a um registro ativo volta com
+    fase 'conflito' (registros excluídos não impedem a criação). Cada resultado é
+    {'indice', 'success': True, 'data': linha criada} ou {'indice', 'success': False,
+    'fase': 'validacao' | 'conflito' | 'insercao', 'error': mensagem}.
+    """
+    resultados: List[Optional[Dict[str, Any]]] = [None] * len(dados)
+    validas = []
+
+    for indice, item in enumerate(dados):
+        linha, erros = validador.validar(item)
+        if erros:
+            resultados[indice] = {'indice': indice, 'success': False, 'fase': 'validacao', 'error': '; '.join(erros)}
+        else:
+            validas.append((indice, linha))
+
+    gravadas = inserir_em_lotes(nome_tabela, validas, tamanho_lote, chave)
+
+    for indice, criada in gravadas.items():
+        if isinstance(criada, dict):
+            resultados[indice] = {'indice': indice, 'success': True, 'data': criada}
+        elif isinstance(criada, ErroConflito):
+            resultados[indice] = {'indice': indice, 'success': False, 'fase': 'conflito', 'error': str(criada)}
+        else:
+            resultados[indice] = {'indice': indice, 'success': False, 'fase': 'insercao', 'error': criada}
+
+    return resultados
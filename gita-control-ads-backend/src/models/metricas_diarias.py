@@ -0,0 +1,182 @@
+import os
+import uuid
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.config.supabase_config import funcao, tabela
+from src.models.cache import cache_entidades, cache_janelas
+from src.models.coalescencia import executar_consulta, registrar_escrita
+from src.models.esquema import converter_data
+from src.models.lote import ValidadorLinhas, TAMANHO_LOTE_INSERCAO
+
+# Histórico diário das métricas dos conteúdos (conteudo_metricas_diarias)
+# Cada ponto traz os valores acumulados até o dia; a tabela só recebe inserções
+# e um trigger mantém as colunas de conteudos iguais ao ponto mais recente
+
+TABELA = 'conteudo_metricas_diarias'
+FUNCAO_SERIE = 'serie_metricas_diarias'
+
+METRICAS_INTEIRAS = ('alcance', 'engajamento', 'seguidores_depois', 'thruplay', 'reproducao_25_pct',
+                     'reproducao_50_pct', 'reproducao_75_pct', 'reproducao_95_pct', 'reproducao_100_pct')
+METRICAS_DECIMAIS = ('frequencia', 'valor_gasto')
+
+# Granularidade da API -> unidade do date_trunc
+GRANULARIDADES = {'dia': 'day', 'semana': 'week', 'mes': 'month'}
+MAX_DIAS_SERIE = int(os.getenv('MAX_DIAS_SERIE', '1100'))
+TAMANHO_LOTE_IDS = 200
+
+VALIDADOR = ValidadorLinhas(
+    obrigatorios=('conteudo_id', 'dia'),
+    campo_tipo=None,
+    tipos_validos=(),
+    inteiros=METRICAS_INTEIRAS,
+    decimais=METRICAS_DECIMAIS,
+    datas=('dia',),
+    marcar_ativo=False
+)
+
+
+def _conteudos_existentes(conteudo_ids: List[str]) -> set:
+    """Filtra os conteúdos ativos entre os ids (em consultas de até TAMANHO_LOTE_IDS ids)"""
+    existentes = set()
+    for inicio in range(0, len(conteudo_ids), TAMANHO_LOTE_IDS):
+        lote = conteudo_ids[inicio:inicio + TAMANHO_LOTE_IDS]
+        response = tabela('conteudos').select('id').in_('id', lote).eq('ativo', True).execute()
+        existentes.update(linha['id'] for linha in response.data)
+    return existentes
+
+
+def registrar_pontos(pontos: Sequence[Any], tamanho_lote: int = TAMANHO_LOTE_INSERCAO) -> List[Dict[str, Any]]:
+    """Valida e grava pontos diários em lotes; retorna a situação de cada ponto, na ordem recebida
+
+    Situações: registrado, ja_registrado (o dia já existe e não é reescrito, o
+    que torna o reenvio seguro), nao_encontrado (conteúdo inexistente ou
+    inativo), invalido (com os erros de validação) e erro (falha no lote).
+    """
+    resultados: List[Optional[Dict[str, Any]]] = [None] * len(pontos)
+    validos: Dict[tuple, int] = {}
+    linhas: Dict[int, Dict[str, Any]] = {}
+
+    for indice, ponto in enumerate(pontos):
+        linha, erros = VALIDADOR.validar(ponto)
+        if not erros:
+            try:
+                linha['conteudo_id'] = str(uuid.UUID(linha['conteudo_id']))
+            except ValueError:
+                erros = ['conteudo_id deve ser um UUID']
+        if erros:
+            resultados[indice] = {'indice': indice, 'situacao': 'invalido', 'error': '; '.join(erros)}
+            continue
+        chave = (linha['conteudo_id'], linha['dia'])
+        if chave in validos:
+            # Mesmo dia repetido na requisição: vale o primeiro
+            resultados[indice] = {'indice': indice, 'conteudo_id': chave[0], 'dia': chave[1], 'situacao': 'ja_registrado'}
+            continue
+        validos[chave] = indice
+        linhas[indice] = linha
+
+    if not linhas:
+        return resultados
+
+    try:
+        existentes = _conteudos_existentes(list({linha['conteudo_id'] for linha in linhas.values()}))
+    except Exception as e:
+        print(f"Erro ao verificar conteúdos das métricas diárias: {e}")
+        for indice, linha in linhas.items():
+            resultados[indice] = {'indice': indice, 'conteudo_id': linha['conteudo_id'], 'dia': linha['dia'],
+                                  'situacao': 'erro', 'error': f'Erro ao verificar conteúdos: {e}'}
+        return resultados
+
+    gravar = []
+    for indice, linha in linhas.items():
+        if linha['conteudo_id'] in existentes:
+            gravar.append((indice, linha))
+        else:
+            resultados[indice] = {'indice': indice, 'conteudo_id': linha['conteudo_id'], 'dia': linha['dia'],
+                                  'situacao': 'nao_encontrado'}
+
+    afetados = set()
+    for inicio in range(0, len(gravar), tamanho_lote):
+        lote = gravar[inicio:inicio + tamanho_lote]
+        try:
+            # ON CONFLICT DO NOTHING: só as linhas novas voltam na resposta
+            response = tabela(TABELA).upsert(
+                [linha for _, linha in lote], on_conflict='conteudo_id,dia', ignore_duplicates=True
+            ).execute()
+            inseridos = {(linha['conteudo_id'], converter_data(linha['dia']).isoformat()) for linha in response.data}
+            for indice, linha in lote:
+                chave = (linha['conteudo_id'], linha['dia'])
+                resultados[indice] = {'indice': indice, 'conteudo_id': chave[0], 'dia': chave[1],
+                                      'situacao': 'registrado' if chave in inseridos else 'ja_registrado'}
+            afetados.update(conteudo_id for conteudo_id, _ in inseridos)
+        except Exception as e:
+            print(f"Erro ao gravar lote de métricas diárias: {e}")
+            for indice, linha in lote:
+                resultados[indice] = {'indice': indice, 'conteudo_id': linha['conteudo_id'], 'dia': linha['dia'],
+                                      'situacao': 'erro', 'error': f'Erro ao gravar lote: {e}'}
+
+    if afetados:
+        # O trigger do histórico atualiza conteudos, que por sua vez recalcula os totais das campanhas
+        registrar_escrita(TABELA, FUNCAO_SERIE, 'conteudos', 'campanhas', 'metricas_projeto_diarias', 'esboco_quantis')
+        for conteudo_id in afetados:
+            cache_entidades.invalidar('conteudos', conteudo_id)
+        cache_entidades.limpar('campanhas')
+        cache_janelas.limpar()
+    return resultados
+
+
+def validar_intervalo(inicio: date, fim: date, granularidade: str):
+    """Levanta ValueError se o intervalo ou a granularidade da série forem inválidos"""
+    if granularidade not in GRANULARIDADES:
+        raise ValueError(f"granularidade deve ser uma de: {', '.join(GRANULARIDADES)}")
+    if inicio > fim:
+        raise ValueError('inicio deve ser anterior ou igual a fim')
+    if (fim - inicio).days + 1 > MAX_DIAS_SERIE:
+        raise ValueError(f'O intervalo pode ter no máximo {MAX_DIAS_SERIE} dias')
+
+
+def intervalo_padrao(fim: date = None, dias: int = 30) -> Tuple[date, date]:
+    """(inicio, fim) dos dias que terminam em fim (padrão: hoje)"""
+    fim = fim or date.today()
+    return fim - timedelta(days=dias - 1), fim
+
+
+def _uuid(valor: str, nome: str) -> str:
+    """Normaliza o id para o parâmetro uuid da função; levanta ValueError se não for um UUID"""
+    try:
+        return str(uuid.UUID(valor))
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError(f'{nome} deve ser um UUID')
+
+
+def serie(inicio: date, fim: date, granularidade: str = 'dia', conteudo_id: str = None,
+          projeto_id: str = None) -> Optional[List[Dict[str, Any]]]:
+    """Série das métricas de um conteúdo (ou do projeto, somando os conteúdos ativos) por período
+
+    Cada período traz o início (periodo), o último dia considerado (fim) e os
+    valores acumulados até esse dia; a agregação é feita no banco pela função
+    serie_metricas_diarias, usando a chave primária do histórico. Levanta
+    ValueError se o id informado não for um UUID.
+    """
+    if conteudo_id:
+        parametros = {'p_conteudo_id': _uuid(conteudo_id, 'conteudo_id')}
+    elif projeto_id:
+        parametros = {'p_projeto_id': _uuid(projeto_id, 'projeto_id')}
+    else:
+        return []
+
+    try:
+        parametros.update({
+            'p_inicio': inicio.isoformat(),
+            'p_fim': fim.isoformat(),
+            'p_granularidade': GRANULARIDADES[granularidade]
+        })
+
+        response = executar_consulta(funcao(FUNCAO_SERIE, parametros))
+        return [
+            {**linha, 'periodo': converter_data(linha['periodo']), 'fim': converter_data(linha['fim'])}
+            for linha in response.data
+        ]
+    except Exception as e:
+        print(f"Erro ao buscar série de métricas diárias: {e}")
+        return None
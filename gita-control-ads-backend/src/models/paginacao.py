@@ -0,0 +1,69 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
+
+from src.models.coalescencia import executar_consulta
+
+# Paginação por cursor (keyset) na ordem (data_criacao desc, id desc)
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+TAMANHO_PAGINA_ITERACAO = 500
+
+
+def codificar_cursor(linha: Dict[str, Any]) -> str:
+    """Gera o cursor opaco que aponta para depois da linha informada"""
+    chave = json.dumps([linha['data_criacao'], linha['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(chave.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> Tuple[str, str]:
+    """Extrai (data_criacao, id) do cursor; levanta ValueError se for inválido"""
+    try:
+        preenchimento = '=' * (-len(cursor) % 4)
+        data_criacao, linha_id = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+    except Exception:
+        raise ValueError('cursor inválido')
+
+    # Os dois valores vão direto no filtro do PostgREST, então só passam um timestamp ISO e um UUID
+    try:
+        datetime.fromisoformat(data_criacao)
+        uuid.UUID(linha_id)
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError('cursor inválido')
+    return data_criacao, linha_id
+
+
+def buscar_pagina(query, limite: int, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Executa a query retornando uma página de linhas e o cursor da próxima página"""
+    if cursor:
+        data_criacao, linha_id = decodificar_cursor(cursor)
+        query = query.or_(
+            f'data_criacao.lt."{data_criacao}",'
+            f'and(data_criacao.eq."{data_criacao}",id.lt.{linha_id})'
+        )
+
+    # Busca uma linha a mais para saber se existe próxima página
+    response = executar_consulta(query.order('data_criacao', desc=True).order('id', desc=True).limit(limite + 1))
+
+    linhas = response.data
+    proximo_cursor = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo_cursor = codificar_cursor(linhas[-1])
+    return linhas, proximo_cursor
+
+
+def iterar_linhas(criar_query: Callable[[], Any], tamanho_pagina: int = TAMANHO_PAGINA_ITERACAO,
+                  cursor: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Percorre todas as linhas da query (a partir do cursor, se informado), página a página
+
+    criar_query deve retornar uma query nova a cada chamada, pois os builders
+    do PostgREST acumulam filtros.
+    """
+    while True:
+        linhas, cursor = buscar_pagina(criar_query(), tamanho_pagina, cursor)
+        yield from linhas
+        if not cursor:
+            break
@@ -1,18 +1,20 @@
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from src.config.supabase_config import supabase
+from typing import Optional, List, Tuple
+from src.config.supabase_config import tabela
+from src.models.cache import cache_entidades
+from src.models.coalescencia import executar_consulta, registrar_escrita
+from src.models.campos import projecao
+from src.models.esquema import Esquema, Registro, TEXTO, DECIMAL, DATA_HORA, BOOLEANO, converter_data_hora
 
-class Projeto:
-    def __init__(self, id: str = None, nome: str = None, descricao: str = None, 
-                 projecao_gasto_mensal: float = None, data_criacao: datetime = None,
-                 data_atualizacao: datetime = None, ativo: bool = True):
-        self.id = id
-        self.nome = nome
-        self.descricao = descricao
-        self.projecao_gasto_mensal = projecao_gasto_mensal
-        self.data_criacao = data_criacao
-        self.data_atualizacao = data_atualizacao
-        self.ativo = ativo
+class Projeto(Registro):
+    ESQUEMA = Esquema(
+        ('id', TEXTO), ('nome', TEXTO), ('descricao', TEXTO), ('projecao_gasto_mensal', DECIMAL),
+        ('data_criacao', DATA_HORA), ('data_atualizacao', DATA_HORA), ('ativo', BOOLEANO)
+    )
+    __slots__ = ESQUEMA.nomes
+
+    # Colunas da tabela (usadas na projeção de campos)
+    CAMPOS = ESQUEMA.nomes
 
     @classmethod
     def criar(cls, nome: str, descricao: str = None, projecao_gasto_mensal: float = None) -> 'Projeto':
@@ -25,85 +27,128 @@ class Projeto:
                 'ativo': True
             }
             
-            response = supabase.table('projetos').insert(data).execute()
+            response = tabela('projetos').insert(data).execute()
+            registrar_escrita('projetos')
             
             if response.data:
                 projeto_data = response.data[0]
-                return cls(
-                    id=projeto_data['id'],
-                    nome=projeto_data['nome'],
-                    descricao=projeto_data['descricao'],
-                    projecao_gasto_mensal=projeto_data['projecao_gasto_mensal'],
-                    data_criacao=projeto_data['data_criacao'],
-                    data_atualizacao=projeto_data['data_atualizacao'],
-                    ativo=projeto_data['ativo']
-                )
+                cache_entidades.definir('projetos', projeto_data['id'], projeto_data)
+                return cls._from_dict(projeto_data)
             return None
         except Exception as e:
             print(f"Erro ao criar projeto: {e}")
             return None
 
     @classmethod
-    def buscar_por_id(cls, projeto_id: str) -> Optional['Projeto']:
-        """Busca um projeto pelo ID"""
+    def buscar_por_id(cls, projeto_id: str, usar_cache: bool = True,
+                      campos: List[str] = None) -> Optional['Projeto']:
+        """Busca um projeto pelo ID, consultando antes o cache de entidades"""
+        try:
+            return cls.carregar(projeto_id, usar_cache, campos)
+        except Exception as e:
+            print(f"Erro ao buscar projeto: {e}")
+            return None
+
+    @classmethod
+    def carregar(cls, projeto_id: str, usar_cache: bool = True,
+                 campos: List[str] = None) -> Optional['Projeto']:
+        """Como buscar_por_id, mas as falhas da consulta (timeout, erro da API) são levantadas"""
+        if usar_cache:
+            projeto_data = cache_entidades.obter('projetos', projeto_id)
+            if projeto_data is not None:
+                return cls._from_dict(projeto_data, campos)
+        
+        response = executar_consulta(tabela('projetos').select(projecao(campos)).eq('id', projeto_id).eq('ativo', True))
+        
+        if response.data:
+            projeto_data = response.data[0]
+            if not campos:
+                cache_entidades.definir('projetos', projeto_id, projeto_data)
+            return cls._from_dict(projeto_data, campos)
+        return None
+
+    @classmethod
+    def versao(cls, projeto_id: str, usar_cache: bool = True) -> Optional[datetime]:
+        """Retorna a data_atualizacao do projeto (usada na ETag), sem carregar a linha inteira"""
         try:
-            response = supabase.table('projetos').select('*').eq('id', projeto_id).eq('ativo', True).execute()
+            if usar_cache:
+                projeto_data = cache_entidades.obter('projetos', projeto_id)
+                if projeto_data is not None:
+                    return converter_data_hora(projeto_data.get('data_atualizacao'))
+            
+            response = executar_consulta(tabela('projetos').select('id,data_atualizacao').eq('id', projeto_id).eq('ativo', True))
             
             if response.data:
-                projeto_data = response.data[0]
-                return cls(
-                    id=projeto_data['id'],
-                    nome=projeto_data['nome'],
-                    descricao=projeto_data['descricao'],
-                    projecao_gasto_mensal=projeto_data['projecao_gasto_mensal'],
-                    data_criacao=projeto_data['data_criacao'],
-                    data_atualizacao=projeto_data['data_atualizacao'],
-                    ativo=projeto_data['ativo']
-                )
+                return converter_data_hora(response.data[0]['data_atualizacao'])
             return None
         except Exception as e:
-            print(f"Erro ao buscar projeto: {e}")
+            print(f"Erro ao buscar versão do projeto: {e}")
             return None
 
     @classmethod
-    def listar_todos(cls) -> List['Projeto']:
-        """Lista todos os projetos ativos"""
+    def listar_todos(cls, campos: List[str] = None) -> List['Projeto']:
+        """Lista todos os projetos ativos, opcionalmente só com os campos informados"""
         try:
-            response = supabase.table('projetos').select('*').eq('ativo', True).order('data_criacao', desc=True).execute()
+            response = executar_consulta(tabela('projetos').select(projecao(campos)).eq('ativo', True).order('data_criacao', desc=True))
             
             projetos = []
             for projeto_data in response.data:
-                projetos.append(cls(
-                    id=projeto_data['id'],
-                    nome=projeto_data['nome'],
-                    descricao=projeto_data['descricao'],
-                    projecao_gasto_mensal=projeto_data['projecao_gasto_mensal'],
-                    data_criacao=projeto_data['data_criacao'],
-                    data_atualizacao=projeto_data['data_atualizacao'],
-                    ativo=projeto_data['ativo']
-                ))
+                projetos.append(cls._from_dict(projeto_data, campos))
             return projetos
         except Exception as e:
             print(f"Erro ao listar projetos: {e}")
             return []
 
+    @classmethod
+    def versao_lista(cls) -> Optional[List[Tuple[str, datetime]]]:
+        """Retorna (id, data_atualizacao) dos projetos ativos, na ordem da listagem"""
+        try:
+            response = executar_consulta(tabela('projetos').select('id,data_atualizacao').eq('ativo', True).order('data_criacao', desc=True))
+            return [(linha['id'], converter_data_hora(linha['data_atualizacao'])) for linha in response.data]
+        except Exception as e:
+            print(f"Erro ao buscar versão dos projetos: {e}")
+            return None
+
+    @classmethod
+    def atualizar_por_id(cls, projeto_id: str, nome: str = None, descricao: str = None,
+                         projecao_gasto_mensal: float = None) -> Optional['Projeto']:
+        """Atualiza o projeto ativo numa única requisição e retorna a linha gravada
+
+        Retorna None se não houver projeto ativo com o ID. Erros do Supabase são
+        propagados, para a rota distinguir "não encontrado" (404) de falha (500).
+        """
+        data = cls.ESQUEMA.dados_gravacao({
+            'nome': nome,
+            'descricao': descricao,
+            'projecao_gasto_mensal': projecao_gasto_mensal
+        })
+        if not data:
+            return cls.buscar_por_id(projeto_id)
+
+        response = tabela('projetos').update(data).eq('id', projeto_id).eq('ativo', True).execute()
+        registrar_escrita('projetos')
+        if not response.data:
+            cache_entidades.invalidar('projetos', projeto_id)
+            return None
+        cache_entidades.definir('projetos', projeto_id, response.data[0])
+        return cls._from_dict(response.data[0])
+
+    @classmethod
+    def deletar_por_id(cls, projeto_id: str) -> bool:
+        """Marca o projeto ativo como inativo numa única requisição (False se não houver projeto ativo)"""
+        response = tabela('projetos').update({'ativo': False}).eq('id', projeto_id).eq('ativo', True).execute()
+        registrar_escrita('projetos')
+        cache_entidades.invalidar('projetos', projeto_id)
+        return len(response.data) > 0
+
     def atualizar(self, nome: str = None, descricao: str = None, projecao_gasto_mensal: float = None) -> bool:
         """Atualiza os dados do projeto"""
         try:
-            data = {}
-            if nome is not None:
-                data['nome'] = nome
-                self.nome = nome
-            if descricao is not None:
-                data['descricao'] = descricao
-                self.descricao = descricao
-            if projecao_gasto_mensal is not None:
-                data['projecao_gasto_mensal'] = projecao_gasto_mensal
-                self.projecao_gasto_mensal = projecao_gasto_mensal
-            
-            if data:
-                response = supabase.table('projetos').update(data).eq('id', self.id).execute()
-                return len(response.data) > 0
+            atualizado = self.atualizar_por_id(self.id, nome, descricao, projecao_gasto_mensal)
+            if atualizado is None:
+                return False
+            for campo in self.CAMPOS:
+                setattr(self, campo, getattr(atualizado, campo))
             return True
         except Exception as e:
             print(f"Erro ao atualizar projeto: {e}")
@@ -112,24 +157,10 @@ class Projeto:
     def deletar(self) -> bool:
         """Marca o projeto como inativo (soft delete)"""
         try:
-            response = supabase.table('projetos').update({'ativo': False}).eq('id', self.id).execute()
-            if len(response.data) > 0:
+            if self.deletar_por_id(self.id):
                 self.ativo = False
                 return True
             return False
         except Exception as e:
             print(f"Erro ao deletar projeto: {e}")
             return False
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Converte o projeto para dicionário"""
-        return {
-            'id': self.id,
-            'nome': self.nome,
-            'descricao': self.descricao,
-            'projecao_gasto_mensal': self.projecao_gasto_mensal,
-            'data_criacao': self.data_criacao.isoformat() if self.data_criacao else None,
-            'data_atualizacao': self.data_atualizacao.isoformat() if self.data_atualizacao else None,
-            'ativo': self.ativo
-        }
-
@@ -0,0 +1,48 @@
+import uuid
+from typing import Any, Dict
+
+from src.config.supabase_config import tabela
+from src.models.coalescencia import executar_consulta, registrar_escrita
+
+# Parâmetros das regras de sugestão ajustados por projeto (regras_projeto)
+# Cada linha guarda {parametro: valor} de uma regra; as regras sem linha usam os padrões
+
+TABELA = 'regras_projeto'
+
+
+def projeto_uuid(projeto_id: str) -> str:
+    """Normaliza o id do projeto; levanta ValueError se não for um UUID"""
+    try:
+        return str(uuid.UUID(projeto_id))
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError('projeto_id deve ser um UUID')
+
+
+def buscar_parametros(projeto_id: str) -> Dict[str, Dict[str, Any]]:
+    """Parâmetros gravados para o projeto ({regra_id: {parametro: valor}})
+
+    Levanta ValueError se o id não for um UUID; erros do Supabase são propagados,
+    para que as sugestões não saiam silenciosamente com os limites padrão.
+    """
+    response = executar_consulta(
+        tabela(TABELA).select('regra_id,parametros').eq('projeto_id', projeto_uuid(projeto_id))
+    )
+    return {linha['regra_id']: dict(linha['parametros'] or {}) for linha in response.data}
+
+
+def salvar_parametros(projeto_id: str, regra_id: str, parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Grava (substituindo) os parâmetros de uma regra no projeto e retorna a linha gravada"""
+    response = tabela(TABELA).upsert({
+        'projeto_id': projeto_uuid(projeto_id),
+        'regra_id': regra_id,
+        'parametros': parametros
+    }, on_conflict='projeto_id,regra_id').execute()
+    registrar_escrita(TABELA)
+    return response.data[0]
+
+
+def remover_parametros(projeto_id: str, regra_id: str) -> bool:
+    """Volta a regra aos parâmetros padrão no projeto (False se não havia parâmetros gravados)"""
+    response = tabela(TABELA).delete().eq('projeto_id', projeto_uuid(projeto_id)).eq('regra_id', regra_id).execute()
+    registrar_escrita(TABELA)
+    return len(response.data) > 0
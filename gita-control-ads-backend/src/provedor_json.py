@@ -0,0 +1,85 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, time
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serialização JSON das respostas: orjson quando instalado, json da biblioteca padrão como alternativa
+
+
+def _padrao(valor: Any) -> Any:
+    """Tipos sem representação JSON nativa (mesmo resultado com orjson ou com a biblioteca padrão)"""
+    if isinstance(valor, (date, time)):
+        return valor.isoformat()
+    if isinstance(valor, decimal.Decimal):
+        return float(valor)
+    if isinstance(valor, uuid.UUID):
+        return str(valor)
+    if dataclasses.is_dataclass(valor) and not isinstance(valor, type):
+        return dataclasses.asdict(valor)
+    if hasattr(valor, 'tolist'):
+        # Arrays e escalares do NumPy
+        return valor.tolist()
+    if hasattr(valor, '__html__'):
+        return str(valor.__html__())
+    raise TypeError(f'Objeto do tipo {type(valor).__name__} não é serializável em JSON')
+
+
+class ProvedorJSON(DefaultJSONProvider):
+    """Provedor JSON do app com datas em ISO 8601, Decimal como número e UUID como texto
+
+    Usa orjson quando disponível; sem ele (ou para argumentos que o orjson não
+    suporta, como cls), recorre ao json da biblioteca padrão com a mesma saída.
+    """
+
+    default = staticmethod(_padrao)
+    ensure_ascii = False
+    sort_keys = False
+
+    @property
+    def rapido(self) -> bool:
+        return orjson is not None
+
+    def _opcoes_orjson(self, indentar: bool = False) -> int:
+        opcoes = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            opcoes |= orjson.OPT_SORT_KEYS
+        if indentar:
+            opcoes |= orjson.OPT_INDENT_2
+        return opcoes
+
+    def dumps_bytes(self, obj: Any, indentar: bool = False) -> bytes:
+        """Serializa direto para bytes UTF-8 (sem a decodificação para str)"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=_padrao, option=self._opcoes_orjson(indentar))
+            except TypeError:
+                # Ex.: inteiros acima de 64 bits; a biblioteca padrão aceita
+                pass
+        argumentos = {'indent': 2} if indentar else {'separators': (',', ':')}
+        return json.dumps(obj, default=_padrao, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, **argumentos).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self.dumps_bytes(obj, indentar) + b'\n', mimetype=self.mimetype)
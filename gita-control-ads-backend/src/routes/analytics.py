@@ -3,9 +3,31 @@ from datetime import datetime, date
 from src.models.conteudo import Conteudo
 from src.models.campanha import Campanha
 from src.models.projeto import Projeto
+from src.routes.comum import usar_cache, parametros_janela, com_etag, resposta_se_nao_modificado
+from src.models.concorrencia import GrupoConsultas, ErroConsultasParalelas, ERROS_DE_TIMEOUT, executar_em_paralelo
+from src.analytics.colunar import Colunas, preenchidos, soma, media_min_max
+from src.analytics.funil import calcular_funil, colunas_lidas, CAMPOS_CONTEUDO, CAMPOS_CAMPANHA
+from src.analytics.janelas import metricas_janela
+from src.analytics.quantis import esboco_agregado
+from src.analytics.regras import montar_motor, listar_regras, validar_parametros
+from src.models import regras_projeto
 
 analytics_bp = Blueprint('analytics', __name__)
 
+# Colunas lidas por cada análise (evita trafegar as linhas completas)
+CAMPOS_SUGESTOES_CONTEUDO = [
+    'identificador', 'tipo_conteudo', 'custo_por_seguidor', 'custo_por_engajamento', 'cpm',
+    'reproducao_25_pct', 'reproducao_100_pct'
+]
+CAMPOS_SUGESTOES_CAMPANHA = [
+    'nome', 'frequencia_media', 'custo_por_engajamento', 'thruplay_total', 'alcance_total'
+]
+CAMPOS_METRICAS_CONTEUDO = [
+    'valor_gasto', 'engajamento', 'seguidores_antes', 'seguidores_depois',
+    'custo_por_seguidor', 'custo_por_engajamento'
+]
+CAMPOS_METRICAS_CAMPANHA = ['valor_gasto_total', 'engajamento_total', 'alcance_total']
+
 @analytics_bp.route('/analytics/sugestoes', methods=['POST'])
 def gerar_sugestoes():
     """Gera sugestões de melhorias baseadas nas métricas fornecidas"""
@@ -20,18 +42,33 @@ def gerar_sugestoes():
         
         projeto_id = data.get('projeto_id')
         tipo_analise = data.get('tipo_analise', 'geral')  # 'geral', 'conteudo', 'campanha'
+        parametros_regras = data.get('parametros_regras') or {}  # {regra_id: {parametro: valor}}
+        
+        if not isinstance(parametros_regras, dict) or not all(isinstance(v, dict) for v in parametros_regras.values()):
+            return jsonify({
+                'success': False,
+                'error': 'parametros_regras deve ser um objeto {regra_id: {parametro: valor}}'
+            }), 400
         
+        try:
+            # Parâmetros gravados do projeto, com os da requisição por cima
+            motor = montar_motor(projeto_id, parametros_regras)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         sugestoes = []
         
         if tipo_analise == 'geral' or tipo_analise == 'conteudo':
             # Análise de conteúdos
-            conteudos = Conteudo.listar_por_projeto(projeto_id) if projeto_id else []
-            sugestoes.extend(_analisar_conteudos(conteudos))
+            conteudos = Conteudo.listar_por_projeto(projeto_id, campos=CAMPOS_SUGESTOES_CONTEUDO) if projeto_id else []
+            sugestoes.extend(_analisar_conteudos(conteudos, motor))
         
         if tipo_analise == 'geral' or tipo_analise == 'campanha':
             # Análise de campanhas
-            campanhas = Campanha.listar_por_projeto(projeto_id) if projeto_id else []
-            sugestoes.extend(_analisar_campanhas(campanhas))
+            campanhas = Campanha.listar_por_projeto(projeto_id, campos=CAMPOS_SUGESTOES_CAMPANHA) if projeto_id else []
+            sugestoes.extend(_analisar_campanhas(campanhas, motor))
         
         return jsonify({
             'success': True,
@@ -48,187 +85,283 @@ def gerar_sugestoes():
             'error': str(e)
         }), 500
 
-def _analisar_conteudos(conteudos):
-    """Analisa conteúdos e gera sugestões específicas"""
-    sugestoes = []
-    
-    if not conteudos:
-        return sugestoes
-    
-    # Separar por tipo
-    conteudos_c1 = [c for c in conteudos if c.tipo_conteudo == 'C1']
-    conteudos_c2_c4 = [c for c in conteudos if c.tipo_conteudo in ['C2', 'C3', 'C4']]
-    
-    # Análise C1 (Custo por Seguidor)
-    if conteudos_c1:
-        custos_seguidor = [c.custo_por_seguidor for c in conteudos_c1 if c.custo_por_seguidor]
-        
-        if custos_seguidor:
-            custo_medio = sum(custos_seguidor) / len(custos_seguidor)
-            custo_alto = [c for c in conteudos_c1 if c.custo_por_seguidor and c.custo_por_seguidor > custo_medio * 1.5]
-            
-            if custo_alto:
-                sugestoes.append({
-                    'tipo': 'otimizacao',
-                    'categoria': 'C1 - Custo por Seguidor',
-                    'prioridade': 'alta',
-                    'titulo': 'Conteúdos C1 com custo por seguidor elevado',
-                    'descricao': f'Identificamos {len(custo_alto)} conteúdo(s) C1 com custo por seguidor acima da média ({custo_medio:.2f}). Considere revisar o targeting, criativo ou orçamento.',
-                    'conteudos_afetados': [c.identificador for c in custo_alto],
-                    'acao_recomendada': 'Revisar targeting, testar novos criativos ou ajustar orçamento diário'
-                })
-            
-            # Identificar melhores performers
-            melhor_custo = min(custos_seguidor)
-            melhores = [c for c in conteudos_c1 if c.custo_por_seguidor == melhor_custo]
-            
-            if melhores:
-                sugestoes.append({
-                    'tipo': 'oportunidade',
-                    'categoria': 'C1 - Melhores Práticas',
-                    'prioridade': 'media',
-                    'titulo': 'Replicar estratégia dos melhores conteúdos C1',
-                    'descricao': f'O conteúdo "{melhores[0].identificador}" tem o melhor custo por seguidor (R$ {melhor_custo:.2f}). Considere replicar elementos deste criativo.',
-                    'conteudos_afetados': [c.identificador for c in melhores],
-                    'acao_recomendada': 'Analisar elementos visuais, copy e targeting dos melhores performers'
-                })
-    
-    # Análise C2-C4 (Custo por Engajamento)
-    if conteudos_c2_c4:
-        custos_engajamento = [c.custo_por_engajamento for c in conteudos_c2_c4 if c.custo_por_engajamento]
-        
-        if custos_engajamento:
-            custo_medio_eng = sum(custos_engajamento) / len(custos_engajamento)
-            custo_alto_eng = [c for c in conteudos_c2_c4 if c.custo_por_engajamento and c.custo_por_engajamento > custo_medio_eng * 1.3]
-            
-            if custo_alto_eng:
-                sugestoes.append({
-                    'tipo': 'otimizacao',
-                    'categoria': 'C2-C4 - Custo por Engajamento',
-                    'prioridade': 'alta',
-                    'titulo': 'Conteúdos de nutrição com custo por engajamento elevado',
-                    'descricao': f'Identificamos {len(custo_alto_eng)} conteúdo(s) de nutrição com custo por engajamento acima da média (R$ {custo_medio_eng:.2f}).',
-                    'conteudos_afetados': [c.identificador for c in custo_alto_eng],
-                    'acao_recomendada': 'Revisar relevância do conteúdo para a audiência e testar novos formatos'
-                })
-    
-    # Análise de reprodução de vídeo (C2-C4)
-    conteudos_video = [c for c in conteudos_c2_c4 if c.reproducao_25_pct and c.reproducao_100_pct]
-    
-    if conteudos_video:
-        for conteudo in conteudos_video:
-            if conteudo.reproducao_25_pct > 0:
-                taxa_retencao = (conteudo.reproducao_100_pct / conteudo.reproducao_25_pct) * 100
-                
-                if taxa_retencao < 30:  # Baixa retenção
-                    sugestoes.append({
-                        'tipo': 'otimizacao',
-                        'categoria': 'Retenção de Vídeo',
-                        'prioridade': 'media',
-                        'titulo': f'Baixa retenção no vídeo "{conteudo.identificador}"',
-                        'descricao': f'Taxa de retenção de apenas {taxa_retencao:.1f}%. Muitos usuários não assistem até o final.',
-                        'conteudos_afetados': [conteudo.identificador],
-                        'acao_recomendada': 'Revisar hook inicial, ritmo do vídeo e call-to-action'
-                    })
-    
-    return sugestoes
+def _analisar_conteudos(conteudos, motor):
+    """Analisa conteúdos e gera sugestões específicas (regras do alvo 'conteudo')"""
+    return motor.avaliar('conteudo', conteudos)
 
-def _analisar_campanhas(campanhas):
-    """Analisa campanhas e gera sugestões específicas"""
-    sugestoes = []
-    
-    if not campanhas:
-        return sugestoes
-    
-    # Análise de frequência
-    campanhas_alta_freq = [c for c in campanhas if c.frequencia_media and c.frequencia_media > 3.0]
-    
-    if campanhas_alta_freq:
-        sugestoes.append({
-            'tipo': 'alerta',
-            'categoria': 'Frequência de Exibição',
-            'prioridade': 'alta',
-            'titulo': 'Campanhas com frequência muito alta',
-            'descricao': f'{len(campanhas_alta_freq)} campanha(s) com frequência acima de 3.0. Risco de fadiga da audiência.',
-            'conteudos_afetados': [c.nome for c in campanhas_alta_freq],
-            'acao_recomendada': 'Expandir audiência ou pausar temporariamente para evitar saturação'
-        })
-    
-    # Análise de custo por engajamento
-    custos_eng_campanhas = [c.custo_por_engajamento for c in campanhas if c.custo_por_engajamento]
-    
-    if custos_eng_campanhas:
-        custo_medio = sum(custos_eng_campanhas) / len(custos_eng_campanhas)
-        campanhas_caras = [c for c in campanhas if c.custo_por_engajamento and c.custo_por_engajamento > custo_medio * 1.5]
-        
-        if campanhas_caras:
-            sugestoes.append({
-                'tipo': 'otimizacao',
-                'categoria': 'Eficiência de Campanha',
-                'prioridade': 'media',
-                'titulo': 'Campanhas com baixa eficiência de engajamento',
-                'descricao': f'{len(campanhas_caras)} campanha(s) com custo por engajamento acima da média (R$ {custo_medio:.2f}).',
-                'conteudos_afetados': [c.nome for c in campanhas_caras],
-                'acao_recomendada': 'Revisar segmentação de audiência e otimizar criativos'
+def _analisar_campanhas(campanhas, motor):
+    """Analisa campanhas e gera sugestões específicas (regras do alvo 'campanha')"""
+    return motor.avaliar('campanha', campanhas)
+
+@analytics_bp.route('/analytics/regras', methods=['GET'])
+def listar_regras_sugestoes():
+    """Lista as regras de sugestão com os parâmetros padrão (ajustáveis por parametros_regras em /analytics/sugestoes)"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': [regra.to_dict() for regra in listar_regras()]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/analytics/regras/<projeto_id>', methods=['GET'])
+def listar_regras_projeto(projeto_id):
+    """Lista as regras de sugestão com os parâmetros gravados do projeto e os efetivos (padrão + projeto)"""
+    try:
+        try:
+            gravados = regras_projeto.buscar_parametros(projeto_id)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if not Projeto.carregar(projeto_id, usar_cache=usar_cache()):
+            return jsonify({
+                'success': False,
+                'error': 'Projeto não encontrado'
+            }), 404
+        
+        regras = []
+        for regra in listar_regras():
+            parametros_projeto = gravados.get(regra.id, {})
+            regras.append({
+                **regra.to_dict(),
+                'parametros_projeto': parametros_projeto,
+                'parametros_efetivos': {'ativa': True, **regra.parametros, **parametros_projeto}
             })
-    
-    # Análise de ThruPlay
-    campanhas_thruplay = [c for c in campanhas if c.thruplay_total and c.alcance_total]
-    
-    if campanhas_thruplay:
-        for campanha in campanhas_thruplay:
-            taxa_thruplay = (campanha.thruplay_total / campanha.alcance_total) * 100
-            
-            if taxa_thruplay < 15:  # Baixa taxa de ThruPlay
-                sugestoes.append({
-                    'tipo': 'otimizacao',
-                    'categoria': 'Engajamento de Vídeo',
-                    'prioridade': 'media',
-                    'titulo': f'Baixa taxa de ThruPlay na campanha "{campanha.nome}"',
-                    'descricao': f'Taxa de ThruPlay de apenas {taxa_thruplay:.1f}%. O conteúdo pode não estar capturando atenção.',
-                    'conteudos_afetados': [campanha.nome],
-                    'acao_recomendada': 'Testar novos hooks, formatos de vídeo ou ajustar duração'
-                })
-    
-    return sugestoes
+        
+        return jsonify({
+            'success': True,
+            'data': regras
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/analytics/regras/<projeto_id>/<regra_id>', methods=['PUT'])
+def parametrizar_regra_projeto(projeto_id, regra_id):
+    """Grava os parâmetros de uma regra no projeto ({parametro: valor}, substituindo os anteriores)"""
+    try:
+        if regra_id not in {regra.id for regra in listar_regras()}:
+            return jsonify({
+                'success': False,
+                'error': 'Regra não encontrada'
+            }), 404
+        
+        try:
+            projeto_id = regras_projeto.projeto_uuid(projeto_id)
+            parametros = validar_parametros(regra_id, request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if not Projeto.carregar(projeto_id, usar_cache=usar_cache()):
+            return jsonify({
+                'success': False,
+                'error': 'Projeto não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': regras_projeto.salvar_parametros(projeto_id, regra_id, parametros)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/analytics/regras/<projeto_id>/<regra_id>', methods=['DELETE'])
+def remover_parametros_regra_projeto(projeto_id, regra_id):
+    """Volta a regra aos parâmetros padrão no projeto"""
+    try:
+        try:
+            removidos = regras_projeto.remover_parametros(projeto_id, regra_id)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if not removidos:
+            return jsonify({
+                'success': False,
+                'error': 'O projeto não tem parâmetros gravados para esta regra'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'message': 'Regra voltou aos parâmetros padrão'
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/analytics/quantis', methods=['GET'])
+def obter_quantis():
+    """Mediana, p90, quartis e limite de outlier de uma métrica (custo_por_seguidor, custo_por_engajamento
+    ou cpm), juntando os esboços dos projetos informados (projeto_id=a,b) ou de todos os projetos ativos"""
+    try:
+        metrica = request.args.get('metrica', '')
+        tipos = [tipo for tipo in request.args.get('tipo', '').split(',') if tipo]
+        projeto_ids = [projeto_id for projeto_id in request.args.get('projeto_id', '').split(',') if projeto_id]
+        
+        try:
+            esboco = esboco_agregado(metrica, tipos, projeto_ids)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        dados = {
+            'metrica': metrica,
+            'tipos': tipos or None,
+            'projeto_ids': projeto_ids or None,
+            **esboco.resumo()
+        }
+        if request.args.get('esboco') in ('1', 'true'):
+            dados['esboco'] = esboco.to_dict()
+        
+        return jsonify({
+            'success': True,
+            'data': dados
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
 @analytics_bp.route('/analytics/metricas-projeto/<projeto_id>', methods=['GET'])
 def obter_metricas_projeto(projeto_id):
     """Obtém métricas consolidadas de um projeto"""
     try:
-        projeto = Projeto.buscar_por_id(projeto_id)
+        cache = usar_cache()
+        nao_modificado = resposta_se_nao_modificado(lambda: _versao_metricas(projeto_id, cache))
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        # Projeto, conteúdos e campanhas são buscados em paralelo, com prazo compartilhado
+        consultas = GrupoConsultas({
+            'projeto': lambda: Projeto.carregar(projeto_id, usar_cache=cache),
+            'conteudos': lambda: list(Conteudo.iterar_por_projeto(
+                projeto_id, campos=['tipo_conteudo', *CAMPOS_METRICAS_CONTEUDO])),
+            'campanhas': lambda: list(Campanha.iterar_por_projeto(
+                projeto_id, campos=['tipo_campanha', *CAMPOS_METRICAS_CAMPANHA]))
+        })
+        
+        try:
+            projeto = consultas.resultado('projeto')
+        except Exception:
+            consultas.cancelar()
+            raise
         
         if not projeto:
+            consultas.cancelar()
             return jsonify({
                 'success': False,
                 'error': 'Projeto não encontrado'
             }), 404
         
-        # Buscar conteúdos e campanhas
-        conteudos = Conteudo.listar_por_projeto(projeto_id)
-        campanhas = Campanha.listar_por_projeto(projeto_id)
+        try:
+            resultados = consultas.resultados()
+        except ErroConsultasParalelas as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 504 if e.somente_timeouts else 500
+        
+        conteudos = resultados['conteudos']
+        campanhas = resultados['campanhas']
+        
+        # Representação colunar para os cálculos vetorizados
+        colunas_conteudos = Colunas(conteudos, CAMPOS_METRICAS_CONTEUDO, 'tipo_conteudo')
+        colunas_campanhas = Colunas(campanhas, CAMPOS_METRICAS_CAMPANHA, 'tipo_campanha')
         
         # Calcular métricas consolidadas
         metricas = {
             'projeto': projeto.to_dict(),
             'resumo': {
-                'total_conteudos': len(conteudos),
-                'total_campanhas': len(campanhas),
-                'conteudos_por_tipo': {
-                    'C1': len([c for c in conteudos if c.tipo_conteudo == 'C1']),
-                    'C2': len([c for c in conteudos if c.tipo_conteudo == 'C2']),
-                    'C3': len([c for c in conteudos if c.tipo_conteudo == 'C3']),
-                    'C4': len([c for c in conteudos if c.tipo_conteudo == 'C4'])
-                }
+                'total_conteudos': colunas_conteudos.tamanho,
+                'total_campanhas': colunas_campanhas.tamanho,
+                'conteudos_por_tipo': colunas_conteudos.contagem_por_tipo(['C1', 'C2', 'C3', 'C4'])
             },
-            'metricas_c1': _calcular_metricas_c1(conteudos),
-            'metricas_c2_c4': _calcular_metricas_c2_c4(conteudos),
-            'metricas_campanhas': _calcular_metricas_campanhas(campanhas)
+            'metricas_c1': _calcular_metricas_c1(colunas_conteudos),
+            'metricas_c2_c4': _calcular_metricas_c2_c4(colunas_conteudos),
+            'metricas_campanhas': _calcular_metricas_campanhas(colunas_campanhas)
         }
         
-        return jsonify({
+        versao = [projeto.data_atualizacao, _versao_registros(conteudos), _versao_registros(campanhas)]
+        return com_etag(jsonify({
             'success': True,
             'data': metricas
+        }), versao), 200
+        
+    except ERROS_DE_TIMEOUT as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 504
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/analytics/metricas-projeto/<projeto_id>/janela', methods=['GET'])
+def obter_metricas_projeto_janela(projeto_id):
+    """Obtém as métricas do projeto entre data_inicio e data_fim (padrão: últimos 30 dias) a partir dos agregados diários"""
+    try:
+        try:
+            data_inicio, data_fim = parametros_janela()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        cache = usar_cache()
+        try:
+            resultados = executar_em_paralelo({
+                'projeto': lambda: Projeto.carregar(projeto_id, usar_cache=cache),
+                'metricas': lambda: metricas_janela(projeto_id, data_inicio, data_fim, usar_cache=cache)
+            })
+        except ErroConsultasParalelas as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 504 if e.somente_timeouts else 500
+        
+        if not resultados['projeto']:
+            return jsonify({
+                'success': False,
+                'error': 'Projeto não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'projeto_id': projeto_id,
+                'data_inicio': data_inicio,
+                'data_fim': data_fim,
+                **resultados['metricas']
+            }
         }), 200
         
     except Exception as e:
@@ -237,68 +370,123 @@ def obter_metricas_projeto(projeto_id):
             'error': str(e)
         }), 500
 
-def _calcular_metricas_c1(conteudos):
+@analytics_bp.route('/analytics/funil-retencao/<projeto_id>', methods=['GET'])
+def obter_funil_retencao(projeto_id):
+    """Funil de retenção de vídeo (25% → 100% e ThruPlay/alcance) de todos os conteúdos e campanhas do projeto"""
+    try:
+        cache = usar_cache()
+        nao_modificado = resposta_se_nao_modificado(lambda: _versao_metricas(projeto_id, cache))
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        try:
+            resultados = executar_em_paralelo({
+                'projeto': lambda: Projeto.carregar(projeto_id, usar_cache=cache),
+                'conteudos': lambda: list(Conteudo.iterar_por_projeto(
+                    projeto_id, campos=colunas_lidas(CAMPOS_CONTEUDO))),
+                'campanhas': lambda: list(Campanha.iterar_por_projeto(
+                    projeto_id, campos=colunas_lidas(CAMPOS_CAMPANHA)))
+            })
+        except ErroConsultasParalelas as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 504 if e.somente_timeouts else 500
+        
+        projeto = resultados['projeto']
+        if not projeto:
+            return jsonify({
+                'success': False,
+                'error': 'Projeto não encontrado'
+            }), 404
+        
+        conteudos = resultados['conteudos']
+        campanhas = resultados['campanhas']
+        
+        versao = [projeto.data_atualizacao, _versao_registros(conteudos), _versao_registros(campanhas)]
+        return com_etag(jsonify({
+            'success': True,
+            'data': {
+                'projeto_id': projeto_id,
+                'conteudos': calcular_funil(conteudos, CAMPOS_CONTEUDO),
+                'campanhas': calcular_funil(campanhas, CAMPOS_CAMPANHA)
+            }
+        }), versao), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _versao_metricas(projeto_id, usar_cache=True):
+    """Versão dos dados das métricas sem buscar as linhas: data_atualizacao do projeto e
+    (quantidade, maior data_atualizacao) de conteúdos e campanhas"""
+    try:
+        versoes = executar_em_paralelo({
+            'projeto': lambda: Projeto.versao(projeto_id, usar_cache=usar_cache),
+            'conteudos': lambda: Conteudo.versao_projeto(projeto_id),
+            'campanhas': lambda: Campanha.versao_projeto(projeto_id)
+        })
+    except ErroConsultasParalelas:
+        return None
+    
+    if any(versao is None for versao in versoes.values()):
+        return None
+    return [versoes['projeto'], versoes['conteudos'], versoes['campanhas']]
+
+def _versao_registros(registros):
+    """(quantidade, maior data_atualizacao) dos registros carregados, no mesmo formato de versao_projeto"""
+    return len(registros), max((r.data_atualizacao for r in registros if r.data_atualizacao), default=None)
+
+def _calcular_metricas_c1(colunas):
     """Calcula métricas específicas para conteúdos C1"""
-    conteudos_c1 = [c for c in conteudos if c.tipo_conteudo == 'C1']
+    c1 = colunas.mascara_tipo('C1')
     
-    if not conteudos_c1:
+    if not c1.any():
         return None
     
-    total_gasto = sum([c.valor_gasto for c in conteudos_c1 if c.valor_gasto]) or 0
-    total_seguidores_ganhos = sum([
-        (c.seguidores_depois - c.seguidores_antes) 
-        for c in conteudos_c1 
-        if c.seguidores_antes and c.seguidores_depois
-    ]) or 0
+    antes = colunas.coluna('seguidores_antes', c1)
+    depois = colunas.coluna('seguidores_depois', c1)
+    com_seguidores = preenchidos(antes) & preenchidos(depois)
     
-    custos_seguidor = [c.custo_por_seguidor for c in conteudos_c1 if c.custo_por_seguidor]
+    custo_medio, melhor_custo, pior_custo = media_min_max(colunas.coluna('custo_por_seguidor', c1))
     
     return {
-        'total_gasto': total_gasto,
-        'total_seguidores_ganhos': total_seguidores_ganhos,
-        'custo_por_seguidor_medio': sum(custos_seguidor) / len(custos_seguidor) if custos_seguidor else 0,
-        'melhor_custo_por_seguidor': min(custos_seguidor) if custos_seguidor else 0,
-        'pior_custo_por_seguidor': max(custos_seguidor) if custos_seguidor else 0
+        'total_gasto': soma(colunas.coluna('valor_gasto', c1)),
+        'total_seguidores_ganhos': int(soma(depois[com_seguidores] - antes[com_seguidores])),
+        'custo_por_seguidor_medio': custo_medio,
+        'melhor_custo_por_seguidor': melhor_custo,
+        'pior_custo_por_seguidor': pior_custo
     }
 
-def _calcular_metricas_c2_c4(conteudos):
+def _calcular_metricas_c2_c4(colunas):
     """Calcula métricas específicas para conteúdos C2-C4"""
-    conteudos_c2_c4 = [c for c in conteudos if c.tipo_conteudo in ['C2', 'C3', 'C4']]
+    c2_c4 = colunas.mascara_tipo('C2', 'C3', 'C4')
     
-    if not conteudos_c2_c4:
+    if not c2_c4.any():
         return None
     
-    total_gasto = sum([c.valor_gasto for c in conteudos_c2_c4 if c.valor_gasto]) or 0
-    total_engajamento = sum([c.engajamento for c in conteudos_c2_c4 if c.engajamento]) or 0
-    
-    custos_engajamento = [c.custo_por_engajamento for c in conteudos_c2_c4 if c.custo_por_engajamento]
+    custo_medio, melhor_custo, pior_custo = media_min_max(colunas.coluna('custo_por_engajamento', c2_c4))
     
     return {
-        'total_gasto': total_gasto,
-        'total_engajamento': total_engajamento,
-        'custo_por_engajamento_medio': sum(custos_engajamento) / len(custos_engajamento) if custos_engajamento else 0,
-        'melhor_custo_por_engajamento': min(custos_engajamento) if custos_engajamento else 0,
-        'pior_custo_por_engajamento': max(custos_engajamento) if custos_engajamento else 0
+        'total_gasto': soma(colunas.coluna('valor_gasto', c2_c4)),
+        'total_engajamento': int(soma(colunas.coluna('engajamento', c2_c4))),
+        'custo_por_engajamento_medio': custo_medio,
+        'melhor_custo_por_engajamento': melhor_custo,
+        'pior_custo_por_engajamento': pior_custo
     }
 
-def _calcular_metricas_campanhas(campanhas):
+def _calcular_metricas_campanhas(colunas):
     """Calcula métricas específicas para campanhas"""
-    if not campanhas:
+    if not colunas.tamanho:
         return None
     
-    total_gasto = sum([c.valor_gasto_total for c in campanhas if c.valor_gasto_total]) or 0
-    total_engajamento = sum([c.engajamento_total for c in campanhas if c.engajamento_total]) or 0
-    total_alcance = sum([c.alcance_total for c in campanhas if c.alcance_total]) or 0
-    
     return {
-        'total_campanhas': len(campanhas),
-        'total_gasto': total_gasto,
-        'total_engajamento': total_engajamento,
-        'total_alcance': total_alcance,
-        'campanhas_por_tipo': {
-            'C2': len([c for c in campanhas if c.tipo_campanha == 'C2']),
-            'C3': len([c for c in campanhas if c.tipo_campanha == 'C3']),
-            'C4': len([c for c in campanhas if c.tipo_campanha == 'C4'])
-        }
+        'total_campanhas': colunas.tamanho,
+        'total_gasto': soma(colunas.coluna('valor_gasto_total')),
+        'total_engajamento': int(soma(colunas.coluna('engajamento_total'))),
+        'total_alcance': int(soma(colunas.coluna('alcance_total'))),
+        'campanhas_por_tipo': colunas.contagem_por_tipo(['C2', 'C3', 'C4'])
     }
 
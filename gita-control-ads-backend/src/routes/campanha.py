@@ -1,12 +1,15 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime, date
-from src.models.campanha import Campanha
+from src.models.campanha import Campanha, SITUACOES_ASSOCIACAO_OK, TOTAIS_CALCULADOS
+from src.models.lote import MAX_LINHAS_LOTE
+from src.routes.comum import (usar_cache, parametros_paginacao, parametro_campos, registros_lote, resposta_lote,
+                              modo_stream, resposta_ndjson, com_etag, resposta_se_nao_modificado)
 
 campanha_bp = Blueprint('campanha', __name__)
 
 @campanha_bp.route('/campanhas', methods=['GET'])
 def listar_campanhas():
-    """Lista campanhas por projeto e tipo"""
+    """Lista campanhas por projeto e tipo, paginadas por cursor (limit/cursor) ou em NDJSON (stream)"""
     try:
         projeto_id = request.args.get('projeto_id')
         tipo_campanha = request.args.get('tipo_campanha')
@@ -17,11 +20,39 @@ def listar_campanhas():
                 'error': 'projeto_id é obrigatório'
             }), 400
         
-        campanhas = Campanha.listar_por_projeto(projeto_id, tipo_campanha)
-        return jsonify({
+        try:
+            limite, cursor = parametros_paginacao()
+            campos = parametro_campos(Campanha.CAMPOS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # NDJSON ou JSON conforme o Accept: os caches compartilhados precisam separar as duas representações
+        if modo_stream():
+            resposta = resposta_ndjson(
+                campanha.to_dict() for campanha in Campanha.iterar_por_projeto(projeto_id, tipo_campanha, campos=campos, cursor=cursor)
+            )
+            resposta.vary.add('Accept')
+            return resposta
+        
+        nao_modificado = resposta_se_nao_modificado(
+            lambda: Campanha.versao_pagina(projeto_id, tipo_campanha, limite, cursor)
+        )
+        if nao_modificado is not None:
+            nao_modificado.vary.add('Accept')
+            return nao_modificado
+        
+        campanhas, proximo_cursor = Campanha.listar_pagina(projeto_id, tipo_campanha, limite, cursor, campos)
+        versao = ([(campanha.id, campanha.data_atualizacao) for campanha in campanhas], proximo_cursor)
+        resposta = com_etag(jsonify({
             'success': True,
-            'data': [campanha.to_dict() for campanha in campanhas]
-        }), 200
+            'data': [campanha.to_dict() for campanha in campanhas],
+            'next_cursor': proximo_cursor
+        }), versao)
+        resposta.vary.add('Accept')
+        return resposta, 200
         
     except Exception as e:
         return jsonify({
@@ -29,6 +60,16 @@ def listar_campanhas():
             'error': str(e)
         }), 500
 
+def _erro_totais_calculados(data):
+    """Resposta 400 se o corpo trouxer totais calculados pelo banco (None se não trouxer)"""
+    recusados = [campo for campo in TOTAIS_CALCULADOS if campo in (data or {})]
+    if not recusados:
+        return None
+    return jsonify({
+        'success': False,
+        'error': f"Campos somente leitura, calculados a partir dos conteúdos associados: {', '.join(recusados)}"
+    }), 400
+
 @campanha_bp.route('/campanhas', methods=['POST'])
 def criar_campanha():
     """Cria uma nova campanha"""
@@ -41,15 +82,12 @@ def criar_campanha():
                 'error': 'projeto_id, nome e tipo_campanha são obrigatórios'
             }), 400
         
-        # Prepara dados opcionais
+        # Os totais (engajamento, alcance, gasto, reproduções...) vêm dos conteúdos associados
+        erro_totais = _erro_totais_calculados(data)
+        if erro_totais:
+            return erro_totais
+        
         kwargs = {}
-        for campo in ['engajamento_total', 'custo_por_engajamento', 'alcance_total',
-                     'thruplay_total', 'frequencia_media', 'valor_gasto_total',
-                     'reproducao_25_pct_total', 'reproducao_50_pct_total',
-                     'reproducao_75_pct_total', 'reproducao_95_pct_total',
-                     'reproducao_100_pct_total']:
-            if campo in data and data[campo] is not None:
-                kwargs[campo] = data[campo]
         
         # Converte datas
         for campo_data in ['data_inicio', 'data_fim']:
@@ -87,17 +125,51 @@ def criar_campanha():
             'error': str(e)
         }), 500
 
+@campanha_bp.route('/campanhas/bulk', methods=['POST'])
+def criar_campanhas_em_lote():
+    """Cria várias campanhas de uma vez (lista ou {"campanhas": [...]}), com resultado por registro"""
+    try:
+        try:
+            registros = registros_lote('campanhas')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        corpo, status = resposta_lote(Campanha.criar_em_lote(registros))
+        return jsonify(corpo), status
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @campanha_bp.route('/campanhas/<campanha_id>', methods=['GET'])
 def buscar_campanha(campanha_id):
     """Busca uma campanha pelo ID"""
     try:
-        campanha = Campanha.buscar_por_id(campanha_id)
+        try:
+            campos = parametro_campos(Campanha.CAMPOS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        cache = usar_cache()
+        nao_modificado = resposta_se_nao_modificado(lambda: Campanha.versao(campanha_id, usar_cache=cache))
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        campanha = Campanha.buscar_por_id(campanha_id, usar_cache=cache, campos=campos)
         
         if campanha:
-            return jsonify({
+            return com_etag(jsonify({
                 'success': True,
                 'data': campanha.to_dict()
-            }), 200
+            }), campanha.data_atualizacao), 200
         else:
             return jsonify({
                 'success': False,
@@ -115,21 +187,14 @@ def atualizar_campanha(campanha_id):
     """Atualiza uma campanha"""
     try:
         data = request.get_json()
-        campanha = Campanha.buscar_por_id(campanha_id)
         
-        if not campanha:
-            return jsonify({
-                'success': False,
-                'error': 'Campanha não encontrada'
-            }), 404
+        erro_totais = _erro_totais_calculados(data)
+        if erro_totais:
+            return erro_totais
         
         # Prepara dados para atualização
         kwargs = {}
-        for campo in ['nome', 'tipo_campanha', 'objetivo', 'engajamento_total',
-                     'custo_por_engajamento', 'alcance_total', 'thruplay_total',
-                     'frequencia_media', 'valor_gasto_total', 'reproducao_25_pct_total',
-                     'reproducao_50_pct_total', 'reproducao_75_pct_total',
-                     'reproducao_95_pct_total', 'reproducao_100_pct_total']:
+        for campo in ['nome', 'tipo_campanha', 'objetivo']:
             if campo in data:
                 kwargs[campo] = data[campo]
         
@@ -144,9 +209,10 @@ def atualizar_campanha(campanha_id):
                         'error': f'Formato de data inválido para {campo_data}. Use YYYY-MM-DD'
                     }), 400
         
-        sucesso = campanha.atualizar(**kwargs)
+        # Grava e recebe a linha atualizada numa única requisição (só se estiver ativa)
+        campanha = Campanha.atualizar_por_id(campanha_id, **kwargs)
         
-        if sucesso:
+        if campanha:
             return jsonify({
                 'success': True,
                 'data': campanha.to_dict()
@@ -154,8 +220,8 @@ def atualizar_campanha(campanha_id):
         else:
             return jsonify({
                 'success': False,
-                'error': 'Erro ao atualizar campanha'
-            }), 500
+                'error': 'Campanha não encontrada'
+            }), 404
             
     except Exception as e:
         return jsonify({
@@ -167,17 +233,8 @@ def atualizar_campanha(campanha_id):
 def deletar_campanha(campanha_id):
     """Deleta uma campanha (soft delete)"""
     try:
-        campanha = Campanha.buscar_por_id(campanha_id)
-        
-        if not campanha:
-            return jsonify({
-                'success': False,
-                'error': 'Campanha não encontrada'
-            }), 404
-        
-        sucesso = campanha.deletar()
-        
-        if sucesso:
+        # Filtra por id e ativo=true na própria escrita: sem linha afetada, não existe
+        if Campanha.deletar_por_id(campanha_id):
             return jsonify({
                 'success': True,
                 'message': 'Campanha deletada com sucesso'
@@ -185,8 +242,8 @@ def deletar_campanha(campanha_id):
         else:
             return jsonify({
                 'success': False,
-                'error': 'Erro ao deletar campanha'
-            }), 500
+                'error': 'Campanha não encontrada'
+            }), 404
             
     except Exception as e:
         return jsonify({
@@ -198,7 +255,7 @@ def deletar_campanha(campanha_id):
 def listar_conteudos_campanha(campanha_id):
     """Lista conteúdos associados à campanha"""
     try:
-        campanha = Campanha.buscar_por_id(campanha_id)
+        campanha = Campanha.buscar_por_id(campanha_id, usar_cache=usar_cache())
         
         if not campanha:
             return jsonify({
@@ -219,16 +276,58 @@ def listar_conteudos_campanha(campanha_id):
             'error': str(e)
         }), 500
 
+def _resposta_associacoes(resultados):
+    """Monta a resposta das operações em lote de associação (207 se algum id falhou)"""
+    falhas = [resultado for resultado in resultados if resultado['situacao'] not in SITUACOES_ASSOCIACAO_OK]
+    return jsonify({
+        'success': not falhas,
+        'data': {
+            'total': len(resultados),
+            'falhas': len(falhas),
+            'resultados': resultados
+        }
+    }), 207 if falhas else 200
+
+def _operacao_em_lote(campanha_id, operacao):
+    """Lê a lista conteudo_ids do corpo, carrega a campanha e aplica a operação em lote"""
+    data = request.get_json(silent=True)
+    conteudo_ids = data.get('conteudo_ids') if isinstance(data, dict) else data
+    
+    if not isinstance(conteudo_ids, list) or not all(isinstance(i, str) for i in conteudo_ids):
+        return jsonify({
+            'success': False,
+            'error': 'conteudo_ids deve ser uma lista de ids'
+        }), 400
+    
+    if len(conteudo_ids) > MAX_LINHAS_LOTE:
+        return jsonify({
+            'success': False,
+            'error': f'Máximo de {MAX_LINHAS_LOTE} ids por requisição'
+        }), 400
+    
+    campanha = Campanha.buscar_por_id(campanha_id)
+    
+    if not campanha:
+        return jsonify({
+            'success': False,
+            'error': 'Campanha não encontrada'
+        }), 404
+    
+    return _resposta_associacoes(operacao(campanha, conteudo_ids))
+
 @campanha_bp.route('/campanhas/<campanha_id>/conteudos', methods=['POST'])
 def associar_conteudo_campanha(campanha_id):
-    """Associa um conteúdo à campanha"""
+    """Associa conteúdos à campanha ({"conteudo_ids": [...]} ou, para um só, {"conteudo_id": ...})"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        
+        if isinstance(data, list) or (isinstance(data, dict) and 'conteudo_ids' in data):
+            return _operacao_em_lote(campanha_id, Campanha.associar_conteudos)
         
         if not data or 'conteudo_id' not in data:
             return jsonify({
                 'success': False,
-                'error': 'conteudo_id é obrigatório'
+                'error': 'conteudo_id ou conteudo_ids é obrigatório'
             }), 400
         
         campanha = Campanha.buscar_por_id(campanha_id)
@@ -258,6 +357,28 @@ def associar_conteudo_campanha(campanha_id):
             'error': str(e)
         }), 500
 
+@campanha_bp.route('/campanhas/<campanha_id>/conteudos', methods=['PUT'])
+def substituir_conteudos_campanha(campanha_id):
+    """Substitui o conjunto de conteúdos da campanha pela lista informada ({"conteudo_ids": [...]})"""
+    try:
+        return _operacao_em_lote(campanha_id, Campanha.substituir_conteudos)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@campanha_bp.route('/campanhas/<campanha_id>/conteudos', methods=['DELETE'])
+def desassociar_conteudos_campanha(campanha_id):
+    """Remove da campanha os conteúdos informados ({"conteudo_ids": [...]})"""
+    try:
+        return _operacao_em_lote(campanha_id, Campanha.desassociar_conteudos)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @campanha_bp.route('/campanhas/<campanha_id>/conteudos/<conteudo_id>', methods=['DELETE'])
 def desassociar_conteudo_campanha(campanha_id, conteudo_id):
     """Remove a associação de um conteúdo da campanha"""
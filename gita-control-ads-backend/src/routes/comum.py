@@ -0,0 +1,203 @@
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from flask import Response, current_app, request, stream_with_context
+from src.models.campos import validar_campos
+from src.models.lote import MAX_LINHAS_LOTE
+from src.models.metricas_diarias import intervalo_padrao, validar_intervalo
+from src.models.paginacao import decodificar_cursor, LIMITE_PADRAO, LIMITE_MAXIMO
+
+# Funções auxiliares compartilhadas pelos blueprints
+
+MIMETYPE_NDJSON = 'application/x-ndjson'
+
+
+def usar_cache() -> bool:
+    """Indica se a requisição atual aceita respostas do cache de entidades
+
+    O cache é ignorado com ?cache=0 ou com o cabeçalho Cache-Control: no-cache.
+    """
+    if request.args.get('cache', '').lower() in ('0', 'false', 'nao', 'não'):
+        return False
+    return 'no-cache' not in request.headers.get('Cache-Control', '').lower()
+
+
+def parametros_paginacao() -> Tuple[int, Optional[str]]:
+    """Lê os parâmetros limit e cursor da query string
+
+    Levanta ValueError com a mensagem de erro se algum deles for inválido.
+    """
+    limite_str = request.args.get('limit')
+    if limite_str is None:
+        limite = LIMITE_PADRAO
+    else:
+        try:
+            limite = int(limite_str)
+        except ValueError:
+            raise ValueError('limit deve ser um número inteiro')
+        if limite < 1 or limite > LIMITE_MAXIMO:
+            raise ValueError(f'limit deve estar entre 1 e {LIMITE_MAXIMO}')
+
+    cursor = request.args.get('cursor') or None
+    if cursor:
+        decodificar_cursor(cursor)
+    return limite, cursor
+
+
+def parametro_campos(permitidos: Sequence[str]) -> Optional[List[str]]:
+    """Lê o parâmetro fields (lista separada por vírgulas) da query string
+
+    Retorna None quando não informado; levanta ValueError para campos desconhecidos.
+    """
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return validar_campos(fields.split(','), permitidos) or None
+
+
+
+def _intervalo_datas(nome_inicio: str, nome_fim: str) -> Tuple[date, date]:
+    """Lê o intervalo de datas (YYYY-MM-DD) da query string; sem inicio, cobre os 30 dias até fim (padrão: hoje)"""
+    try:
+        fim = datetime.strptime(request.args[nome_fim], '%Y-%m-%d').date() if request.args.get(nome_fim) else None
+        inicio, fim = intervalo_padrao(fim)
+        if request.args.get(nome_inicio):
+            inicio = datetime.strptime(request.args[nome_inicio], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'Formato de data inválido para {nome_inicio}/{nome_fim}. Use YYYY-MM-DD')
+    return inicio, fim
+
+
+def parametros_serie() -> Tuple[date, date, str]:
+    """Lê inicio, fim (YYYY-MM-DD) e granularidade (dia, semana ou mes) da query string
+
+    Sem inicio, a série cobre os 30 dias até fim (padrão: hoje). Levanta ValueError com a
+    mensagem de erro se algum parâmetro for inválido.
+    """
+    inicio, fim = _intervalo_datas('inicio', 'fim')
+    granularidade = request.args.get('granularidade', 'dia')
+    validar_intervalo(inicio, fim, granularidade)
+    return inicio, fim, granularidade
+
+
+def parametros_janela() -> Tuple[date, date]:
+    """Lê a janela data_inicio/data_fim (YYYY-MM-DD) da query string; padrão: os últimos 30 dias
+
+    Levanta ValueError com a mensagem de erro se a janela for inválida.
+    """
+    inicio, fim = _intervalo_datas('data_inicio', 'data_fim')
+    validar_intervalo(inicio, fim, 'dia')
+    return inicio, fim
+
+
+def registros_lote(chave: str) -> List[Any]:
+    """Lê os registros de uma criação em lote do corpo JSON
+
+    Aceita uma lista ou um objeto com a lista na chave informada; levanta
+    ValueError se o corpo for inválido ou exceder MAX_LINHAS_LOTE.
+    """
+    data = request.get_json(silent=True)
+    registros = data.get(chave) if isinstance(data, dict) else data
+    if not isinstance(registros, list) or not registros:
+        raise ValueError(f'Envie uma lista de registros (ou um objeto com a chave {chave})')
+    if len(registros) > MAX_LINHAS_LOTE:
+        raise ValueError(f'Máximo de {MAX_LINHAS_LOTE} registros por requisição')
+    return registros
+
+
+def resposta_lote(resultados: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+    """Monta o corpo e o status da resposta de uma criação em lote
+
+    201 quando todos foram criados, 207 quando parte falhou; quando nenhum foi
+    criado, 500 se alguma inserção falhou, 409 se houve conflito de chave e
+    400 se só houve erros de validação.
+    """
+    criados = sum(1 for resultado in resultados if resultado['success'])
+    corpo = {
+        'success': criados == len(resultados),
+        'data': {
+            'total': len(resultados),
+            'criados': criados,
+            'erros': len(resultados) - criados,
+            'resultados': [
+                {**resultado, 'data': resultado['data'].to_dict()} if resultado['success'] else resultado
+                for resultado in resultados
+            ]
+        }
+    }
+    if criados == len(resultados):
+        return corpo, 201
+    if criados:
+        return corpo, 207
+    fases = {resultado['fase'] for resultado in resultados}
+    if 'insercao' in fases:
+        return corpo, 500
+    return corpo, 409 if 'conflito' in fases else 400
+
+
+def modo_stream() -> bool:
+    """Indica se o cliente pediu a resposta em NDJSON (?stream=1 ou Accept: application/x-ndjson)"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'sim'):
+        return True
+    return any(mimetype == MIMETYPE_NDJSON and qualidade > 0 for mimetype, qualidade in request.accept_mimetypes)
+
+
+def resposta_ndjson(itens: Iterable[Dict[str, Any]]) -> Response:
+    """Resposta em streaming com um objeto JSON por linha, serializado à medida que é enviado
+
+    O primeiro item é buscado antes de responder, para que uma falha logo na
+    primeira página ainda vire um erro HTTP; falhas posteriores são enviadas
+    como uma última linha {"success": false, "error": ...}.
+    """
+    itens = iter(itens)
+    primeiro = next(itens, None)
+
+    def gerar():
+        if primeiro is None:
+            return
+        yield current_app.json.dumps(primeiro) + '\n'
+        try:
+            for item in itens:
+                yield current_app.json.dumps(item) + '\n'
+        except Exception as e:
+            print(f"Erro ao gerar resposta em streaming: {e}")
+            yield current_app.json.dumps({'success': False, 'error': str(e)}) + '\n'
+
+    return Response(stream_with_context(gerar()), mimetype=MIMETYPE_NDJSON)
+
+
+def etag_da_requisicao(versao: Any) -> str:
+    """ETag forte da resposta: hash do caminho, dos parâmetros da query string e da versão dos dados"""
+    parametros = sorted((chave, valor) for chave, valor in request.args.items(multi=True) if chave != 'cache')
+    conteudo = json.dumps([request.path, parametros, versao], default=str, separators=(',', ':'))
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def com_etag(resposta: Response, versao: Any) -> Response:
+    """Define o cabeçalho ETag da resposta a partir da versão dos dados"""
+    resposta.set_etag(etag_da_requisicao(versao))
+    return resposta
+
+
+def resposta_se_nao_modificado(obter_versao: Callable[[], Any]) -> Optional[Response]:
+    """Responde 304 se o If-None-Match corresponder à versão atual dos dados
+
+    obter_versao só é chamada quando há If-None-Match e deve ser uma sonda
+    barata (ex.: id e data_atualizacao), sem montar os modelos; se retornar
+    None, a requisição segue o caminho normal.
+    """
+    if not request.if_none_match:
+        return None
+
+    versao = obter_versao()
+    if versao is None:
+        return None
+
+    etag = etag_da_requisicao(versao)
+    if not request.if_none_match.contains_weak(etag):
+        return None
+
+    resposta = Response(status=304)
+    resposta.set_etag(etag)
+    return resposta
@@ -1,12 +1,16 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime, date
+from src.models import metricas_diarias
 from src.models.conteudo import Conteudo
+from src.models.lote import ErroConflito
+from src.routes.comum import (usar_cache, parametros_paginacao, parametro_campos, parametros_serie, registros_lote,
+                              resposta_lote, modo_stream, resposta_ndjson, com_etag, resposta_se_nao_modificado)
 
 conteudo_bp = Blueprint('conteudo', __name__)
 
 @conteudo_bp.route('/conteudos', methods=['GET'])
 def listar_conteudos():
-    """Lista conteúdos por projeto e tipo"""
+    """Lista conteúdos por projeto e tipo, paginados por cursor (limit/cursor) ou em NDJSON (stream)"""
     try:
         projeto_id = request.args.get('projeto_id')
         tipo_conteudo = request.args.get('tipo_conteudo')
@@ -17,11 +21,39 @@ def listar_conteudos():
                 'error': 'projeto_id é obrigatório'
             }), 400
         
-        conteudos = Conteudo.listar_por_projeto(projeto_id, tipo_conteudo)
-        return jsonify({
+        try:
+            limite, cursor = parametros_paginacao()
+            campos = parametro_campos(Conteudo.CAMPOS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # NDJSON ou JSON conforme o Accept: os caches compartilhados precisam separar as duas representações
+        if modo_stream():
+            resposta = resposta_ndjson(
+                conteudo.to_dict() for conteudo in Conteudo.iterar_por_projeto(projeto_id, tipo_conteudo, campos=campos, cursor=cursor)
+            )
+            resposta.vary.add('Accept')
+            return resposta
+        
+        nao_modificado = resposta_se_nao_modificado(
+            lambda: Conteudo.versao_pagina(projeto_id, tipo_conteudo, limite, cursor)
+        )
+        if nao_modificado is not None:
+            nao_modificado.vary.add('Accept')
+            return nao_modificado
+        
+        conteudos, proximo_cursor = Conteudo.listar_pagina(projeto_id, tipo_conteudo, limite, cursor, campos)
+        versao = ([(conteudo.id, conteudo.data_atualizacao) for conteudo in conteudos], proximo_cursor)
+        resposta = com_etag(jsonify({
             'success': True,
-            'data': [conteudo.to_dict() for conteudo in conteudos]
-        }), 200
+            'data': [conteudo.to_dict() for conteudo in conteudos],
+            'next_cursor': proximo_cursor
+        }), versao)
+        resposta.vary.add('Accept')
+        return resposta, 200
         
     except Exception as e:
         return jsonify({
@@ -61,12 +93,18 @@ def criar_conteudo():
                         'error': f'Formato de data inválido para {campo_data}. Use YYYY-MM-DD'
                     }), 400
         
-        conteudo = Conteudo.criar(
-            projeto_id=data['projeto_id'],
-            identificador=data['identificador'],
-            tipo_conteudo=data['tipo_conteudo'],
-            **kwargs
-        )
+        try:
+            conteudo = Conteudo.criar(
+                projeto_id=data['projeto_id'],
+                identificador=data['identificador'],
+                tipo_conteudo=data['tipo_conteudo'],
+                **kwargs
+            )
+        except ErroConflito as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 409
         
         if conteudo:
             return jsonify({
@@ -85,17 +123,51 @@ def criar_conteudo():
             'error': str(e)
         }), 500
 
+@conteudo_bp.route('/conteudos/bulk', methods=['POST'])
+def criar_conteudos_em_lote():
+    """Cria vários conteúdos de uma vez (lista ou {"conteudos": [...]}), com resultado por registro"""
+    try:
+        try:
+            registros = registros_lote('conteudos')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        corpo, status = resposta_lote(Conteudo.criar_em_lote(registros))
+        return jsonify(corpo), status
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @conteudo_bp.route('/conteudos/<conteudo_id>', methods=['GET'])
 def buscar_conteudo(conteudo_id):
     """Busca um conteúdo pelo ID"""
     try:
-        conteudo = Conteudo.buscar_por_id(conteudo_id)
+        try:
+            campos = parametro_campos(Conteudo.CAMPOS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        cache = usar_cache()
+        nao_modificado = resposta_se_nao_modificado(lambda: Conteudo.versao(conteudo_id, usar_cache=cache))
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        conteudo = Conteudo.buscar_por_id(conteudo_id, usar_cache=cache, campos=campos)
         
         if conteudo:
-            return jsonify({
+            return com_etag(jsonify({
                 'success': True,
                 'data': conteudo.to_dict()
-            }), 200
+            }), conteudo.data_atualizacao), 200
         else:
             return jsonify({
                 'success': False,
@@ -113,13 +185,6 @@ def atualizar_conteudo(conteudo_id):
     """Atualiza um conteúdo"""
     try:
         data = request.get_json()
-        conteudo = Conteudo.buscar_por_id(conteudo_id)
-        
-        if not conteudo:
-            return jsonify({
-                'success': False,
-                'error': 'Conteúdo não encontrado'
-            }), 404
         
         # Prepara dados para atualização
         kwargs = {}
@@ -141,9 +206,10 @@ def atualizar_conteudo(conteudo_id):
                         'error': f'Formato de data inválido para {campo_data}. Use YYYY-MM-DD'
                     }), 400
         
-        sucesso = conteudo.atualizar(**kwargs)
+        # Grava e recebe a linha atualizada numa única requisição (só se estiver ativo)
+        conteudo = Conteudo.atualizar_por_id(conteudo_id, **kwargs)
         
-        if sucesso:
+        if conteudo:
             return jsonify({
                 'success': True,
                 'data': conteudo.to_dict()
@@ -151,8 +217,8 @@ def atualizar_conteudo(conteudo_id):
         else:
             return jsonify({
                 'success': False,
-                'error': 'Erro ao atualizar conteúdo'
-            }), 500
+                'error': 'Conteúdo não encontrado'
+            }), 404
             
     except Exception as e:
         return jsonify({
@@ -164,17 +230,8 @@ def atualizar_conteudo(conteudo_id):
 def deletar_conteudo(conteudo_id):
     """Deleta um conteúdo (soft delete)"""
     try:
-        conteudo = Conteudo.buscar_por_id(conteudo_id)
-        
-        if not conteudo:
-            return jsonify({
-                'success': False,
-                'error': 'Conteúdo não encontrado'
-            }), 404
-        
-        sucesso = conteudo.deletar()
-        
-        if sucesso:
+        # Filtra por id e ativo=true na própria escrita: sem linha afetada, não existe
+        if Conteudo.deletar_por_id(conteudo_id):
             return jsonify({
                 'success': True,
                 'message': 'Conteúdo deletado com sucesso'
@@ -182,8 +239,8 @@ def deletar_conteudo(conteudo_id):
         else:
             return jsonify({
                 'success': False,
-                'error': 'Erro ao deletar conteúdo'
-            }), 500
+                'error': 'Conteúdo não encontrado'
+            }), 404
             
     except Exception as e:
         return jsonify({
@@ -193,7 +250,7 @@ def deletar_conteudo(conteudo_id):
 
 @conteudo_bp.route('/conteudos/melhores-criativos', methods=['GET'])
 def listar_melhores_criativos():
-    """Lista os melhores criativos por tipo"""
+    """Lista os melhores criativos por tipo (filtros opcionais: projeto_id, k, data_inicio, data_fim)"""
     try:
         data_inicio_str = request.args.get('data_inicio')
         data_fim_str = request.args.get('data_fim')
@@ -219,7 +276,23 @@ def listar_melhores_criativos():
                     'error': 'Formato de data_fim inválido. Use YYYY-MM-DD'
                 }), 400
         
-        melhores = Conteudo.listar_melhores_criativos(data_inicio, data_fim)
+        projeto_id = request.args.get('projeto_id')
+        
+        try:
+            k = int(request.args.get('k', 10))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'k deve ser um número inteiro'
+            }), 400
+        
+        if k < 1 or k > 100:
+            return jsonify({
+                'success': False,
+                'error': 'k deve estar entre 1 e 100'
+            }), 400
+        
+        melhores = Conteudo.listar_melhores_criativos(data_inicio, data_fim, projeto_id, k)
         
         # Converte para dicionário
         resultado = {}
@@ -237,3 +310,72 @@ def listar_melhores_criativos():
             'error': str(e)
         }), 500
 
+
+@conteudo_bp.route('/conteudos/metricas-diarias', methods=['POST'])
+def registrar_metricas_diarias():
+    """Registra pontos diários de métricas (lista ou {"pontos": [...]}), com a situação de cada ponto"""
+    try:
+        try:
+            pontos = registros_lote('pontos')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        resultados = metricas_diarias.registrar_pontos(pontos)
+        falhas = [resultado for resultado in resultados if resultado['situacao'] not in ('registrado', 'ja_registrado')]
+        registrados = sum(1 for resultado in resultados if resultado['situacao'] == 'registrado')
+        
+        return jsonify({
+            'success': not falhas,
+            'data': {
+                'total': len(resultados),
+                'registrados': registrados,
+                'falhas': len(falhas),
+                'resultados': resultados
+            }
+        }), 207 if falhas else 201
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@conteudo_bp.route('/conteudos/<conteudo_id>/metricas-diarias', methods=['GET'])
+def obter_metricas_diarias_conteudo(conteudo_id):
+    """Série das métricas do conteúdo (inicio, fim, granularidade = dia, semana ou mes)"""
+    try:
+        try:
+            inicio, fim, granularidade = parametros_serie()
+            pontos = metricas_diarias.serie(inicio, fim, granularidade, conteudo_id=conteudo_id)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if pontos is None:
+            return jsonify({
+                'success': False,
+                'error': 'Erro ao buscar métricas diárias'
+            }), 500
+        
+        # Série vazia: só então confere se o conteúdo existe
+        if not pontos and not Conteudo.buscar_por_id(conteudo_id, usar_cache=usar_cache()):
+            return jsonify({
+                'success': False,
+                'error': 'Conteúdo não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': pontos
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify
+from src.config.supabase_config import estatisticas_pool
+from src.models.cache import cache_entidades, cache_janelas
+from src.models.coalescencia import consultas_em_andamento
+
+diagnostico_bp = Blueprint('diagnostico', __name__)
+
+@diagnostico_bp.route('/diagnostico', methods=['GET'])
+def obter_diagnostico():
+    """Retorna os contadores internos do worker (pool de conexões, cache e coalescência de leituras)"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': {
+                'pool': estatisticas_pool(),
+                'cache_entidades': cache_entidades.to_dict(),
+                'cache_janelas': cache_janelas.to_dict(),
+                'coalescencia': consultas_em_andamento.to_dict()
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,84 @@
+import json
+from flask import Blueprint, request, jsonify
+from src.importacao.pipeline import iniciar_importacao, buscar_progresso
+from src.models.projeto import Projeto
+
+importacao_bp = Blueprint('importacao', __name__)
+
+@importacao_bp.route('/importacoes', methods=['POST'])
+def criar_importacao():
+    """Recebe um relatório CSV/XLSX (multipart: arquivo, projeto_id, destino, tipo, mapeamento) e inicia a importação"""
+    try:
+        arquivo = request.files.get('arquivo')
+        projeto_id = request.form.get('projeto_id')
+        destino = request.form.get('destino', 'conteudos')
+        tipo = request.form.get('tipo') or None
+
+        if not arquivo or not projeto_id:
+            return jsonify({
+                'success': False,
+                'error': 'arquivo e projeto_id são obrigatórios'
+            }), 400
+
+        personalizado = None
+        if request.form.get('mapeamento'):
+            try:
+                personalizado = json.loads(request.form['mapeamento'])
+            except ValueError:
+                personalizado = None
+            if not isinstance(personalizado, dict) or not all(isinstance(v, str) for v in personalizado.values()):
+                return jsonify({
+                    'success': False,
+                    'error': 'mapeamento deve ser um objeto JSON {coluna: campo}'
+                }), 400
+
+        if not Projeto.buscar_por_id(projeto_id):
+            return jsonify({
+                'success': False,
+                'error': 'Projeto não encontrado'
+            }), 404
+
+        try:
+            progresso = iniciar_importacao(arquivo, destino, projeto_id, tipo, personalizado)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'data': progresso.to_dict()
+        }), 202
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@importacao_bp.route('/importacoes/<importacao_id>', methods=['GET'])
+def buscar_importacao(importacao_id):
+    """Retorna o progresso de uma importação (de qualquer worker)"""
+    try:
+        try:
+            progresso = buscar_progresso(importacao_id)
+        except ValueError:
+            progresso = None
+
+        if progresso:
+            return jsonify({
+                'success': True,
+                'data': progresso
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Importação não encontrada'
+            }), 404
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
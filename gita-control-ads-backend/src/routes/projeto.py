@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
+from src.models import metricas_diarias
 from src.models.projeto import Projeto
+from src.routes.comum import usar_cache, parametro_campos, parametros_serie, com_etag, resposta_se_nao_modificado
 
 projeto_bp = Blueprint('projeto', __name__)
 
@@ -7,11 +9,24 @@ projeto_bp = Blueprint('projeto', __name__)
 def listar_projetos():
     """Lista todos os projetos"""
     try:
-        projetos = Projeto.listar_todos()
-        return jsonify({
+        try:
+            campos = parametro_campos(Projeto.CAMPOS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        nao_modificado = resposta_se_nao_modificado(Projeto.versao_lista)
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        projetos = Projeto.listar_todos(campos)
+        versao = [(projeto.id, projeto.data_atualizacao) for projeto in projetos]
+        return com_etag(jsonify({
             'success': True,
             'data': [projeto.to_dict() for projeto in projetos]
-        }), 200
+        }), versao), 200
     except Exception as e:
         return jsonify({
             'success': False,
@@ -57,13 +72,26 @@ def criar_projeto():
 def buscar_projeto(projeto_id):
     """Busca um projeto pelo ID"""
     try:
-        projeto = Projeto.buscar_por_id(projeto_id)
+        try:
+            campos = parametro_campos(Projeto.CAMPOS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        cache = usar_cache()
+        nao_modificado = resposta_se_nao_modificado(lambda: Projeto.versao(projeto_id, usar_cache=cache))
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        projeto = Projeto.buscar_por_id(projeto_id, usar_cache=cache, campos=campos)
         
         if projeto:
-            return jsonify({
+            return com_etag(jsonify({
                 'success': True,
                 'data': projeto.to_dict()
-            }), 200
+            }), projeto.data_atualizacao), 200
         else:
             return jsonify({
                 'success': False,
@@ -81,21 +109,16 @@ def atualizar_projeto(projeto_id):
     """Atualiza um projeto"""
     try:
         data = request.get_json()
-        projeto = Projeto.buscar_por_id(projeto_id)
         
-        if not projeto:
-            return jsonify({
-                'success': False,
-                'error': 'Projeto não encontrado'
-            }), 404
-        
-        sucesso = projeto.atualizar(
+        # Grava e recebe a linha atualizada numa única requisição (só se estiver ativo)
+        projeto = Projeto.atualizar_por_id(
+            projeto_id,
             nome=data.get('nome'),
             descricao=data.get('descricao'),
             projecao_gasto_mensal=data.get('projecao_gasto_mensal')
         )
         
-        if sucesso:
+        if projeto:
             return jsonify({
                 'success': True,
                 'data': projeto.to_dict()
@@ -103,8 +126,8 @@ def atualizar_projeto(projeto_id):
         else:
             return jsonify({
                 'success': False,
-                'error': 'Erro ao atualizar projeto'
-            }), 500
+                'error': 'Projeto não encontrado'
+            }), 404
             
     except Exception as e:
         return jsonify({
@@ -116,17 +139,8 @@ def atualizar_projeto(projeto_id):
 def deletar_projeto(projeto_id):
     """Deleta um projeto (soft delete)"""
     try:
-        projeto = Projeto.buscar_por_id(projeto_id)
-        
-        if not projeto:
-            return jsonify({
-                'success': False,
-                'error': 'Projeto não encontrado'
-            }), 404
-        
-        sucesso = projeto.deletar()
-        
-        if sucesso:
+        # Filtra por id e ativo=true na própria escrita: sem linha afetada, não existe
+        if Projeto.deletar_por_id(projeto_id):
             return jsonify({
                 'success': True,
                 'message': 'Projeto deletado com sucesso'
@@ -134,8 +148,8 @@ def deletar_projeto(projeto_id):
         else:
             return jsonify({
                 'success': False,
-                'error': 'Erro ao deletar projeto'
-            }), 500
+                'error': 'Projeto não encontrado'
+            }), 404
             
     except Exception as e:
         return jsonify({
@@ -143,3 +157,40 @@ def deletar_projeto(projeto_id):
             'error': str(e)
         }), 500
 
+
+@projeto_bp.route('/projetos/<projeto_id>/metricas-diarias', methods=['GET'])
+def obter_metricas_diarias_projeto(projeto_id):
+    """Série das métricas somadas dos conteúdos ativos do projeto (inicio, fim, granularidade = dia, semana ou mes)"""
+    try:
+        try:
+            inicio, fim, granularidade = parametros_serie()
+            pontos = metricas_diarias.serie(inicio, fim, granularidade, projeto_id=projeto_id)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if pontos is None:
+            return jsonify({
+                'success': False,
+                'error': 'Erro ao buscar métricas diárias'
+            }), 500
+        
+        # Série vazia: só então confere se o projeto existe
+        if not pontos and not Projeto.buscar_por_id(projeto_id, usar_cache=usar_cache()):
+            return jsonify({
+                'success': False,
+                'error': 'Projeto não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': pontos
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
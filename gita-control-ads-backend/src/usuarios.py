@@ -0,0 +1,62 @@
+import os
+import threading
+from typing import Any, Callable, Iterable
+
+from flask import Flask
+
+# Rotas de usuários (SQLite via Flask-SQLAlchemy) num app separado, criado só na
+# primeira requisição a /api/users: o SQLAlchemy fica fora do boot dos workers
+
+PREFIXO_USUARIOS = '/api/users'
+URI_BANCO = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+
+
+def criar_app_usuarios() -> Flask:
+    """Cria o app das rotas de usuários com o banco SQLite configurado"""
+    from flask_cors import CORS
+    from src.compressao import configurar_compressao
+    from src.models.user import db
+    from src.provedor_json import ProvedorJSON
+    from src.routes.user import user_bp
+
+    app = Flask(__name__)
+    app.json = ProvedorJSON(app)
+    CORS(app)
+    app.register_blueprint(user_bp, url_prefix='/api')
+    configurar_compressao(app)
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = URI_BANCO
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def criar_tabelas():
+    """Cria as tabelas do banco SQLite (passo explícito de implantação, não roda no import)"""
+    from src.models.user import db
+
+    with criar_app_usuarios().app_context():
+        db.create_all()
+
+
+class DespachoUsuarios:
+    """Middleware WSGI que envia /api/users ao app de usuários, criado sob demanda (uma vez por worker)"""
+
+    def __init__(self, app_principal: Callable, fabrica: Callable[[], Flask] = criar_app_usuarios):
+        self.app_principal = app_principal
+        self._fabrica = fabrica
+        self._app = None
+        self._lock = threading.Lock()
+
+    def _app_usuarios(self) -> Flask:
+        if self._app is None:
+            with self._lock:
+                if self._app is None:
+                    self._app = self._fabrica()
+        return self._app
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[Any]:
+        caminho = environ.get('PATH_INFO', '')
+        if caminho == PREFIXO_USUARIOS or caminho.startswith(PREFIXO_USUARIOS + '/'):
+            return self._app_usuarios()(environ, start_response)
+        return self.app_principal(environ, start_response)